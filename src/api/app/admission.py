@@ -0,0 +1,343 @@
+"""Module with the admission control shedding load before the API saturates."""
+
+import asyncio
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Endpoints whose requests go through a concurrency limiter
+LIMITED_PATHS = (
+    "/v1/prediction",
+    "/v1/prediction/proba",
+    "/v1/batch_prediction",
+    "/v1/batch_prediction/proba",
+    "/v1/batch_prediction/columnar",
+    "/v1/batch_prediction/binary",
+    "/v1/batch_prediction/stream",
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is refused to protect the requests being served.
+
+    Args:
+        status_code (int): HTTP status of the rejection.
+        detail (str): Reason of the rejection.
+        retry_after (int, optional): Seconds the client should wait before
+            retrying, None when retrying cannot succeed.
+    """
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = None):
+        """Initialize the exception.
+
+        Args:
+            status_code (int): HTTP status of the rejection.
+            detail (str): Reason of the rejection.
+            retry_after (int, optional): Seconds to wait before retrying.
+        """
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+    def to_response(self) -> JSONResponse:
+        """Build the response answering the rejected request.
+
+        Returns:
+            JSONResponse: The error, with a `Retry-After` header when retrying
+                later can succeed.
+        """
+        headers = {}
+        if self.retry_after is not None:
+            headers["Retry-After"] = str(self.retry_after)
+        return JSONResponse(
+            {"detail": self.detail}, status_code=self.status_code, headers=headers
+        )
+
+
+class ConcurrencyLimiter:
+    """Bound the requests of an endpoint running at once and waiting to run.
+
+    Requests over `max_concurrency` wait in a bounded queue. A request finding
+    the queue full is refused at once with a 429, and a request still waiting
+    after `queue_timeout` seconds is refused with a 503. It only runs on the
+    event loop, so the counters need no lock.
+
+    Args:
+        max_concurrency (int): Maximum requests running at once.
+        max_queue_size (int): Maximum requests waiting for a slot.
+        queue_timeout (float): Maximum seconds a request waits for a slot.
+        retry_after (int): Seconds sent in the `Retry-After` header.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue_size: int,
+        queue_timeout: float,
+        retry_after: int,
+    ) -> None:
+        """Initialize the limiter without running requests.
+
+        Args:
+            max_concurrency (int): Maximum requests running at once.
+            max_queue_size (int): Maximum requests waiting for a slot.
+            queue_timeout (float): Maximum seconds a request waits for a slot.
+            retry_after (int): Seconds sent in the `Retry-After` header.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = Counter()
+        self._waiters = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        """int: Number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if every slot is taken.
+
+        Raises:
+            AdmissionRejected: If the queue is full or no slot is released
+                within `queue_timeout` seconds.
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue_size:
+            self.rejected["queue_full"] += 1
+            raise AdmissionRejected(
+                429, "Too many pending requests.", retry_after=self.retry_after
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # The slot is handed over by `release`, `in_flight` stays the same
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.rejected["queue_timeout"] += 1
+            raise AdmissionRejected(
+                503, "Timed out waiting for capacity.", retry_after=self.retry_after
+            )
+        except asyncio.CancelledError:
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Give the slot to the first waiting request, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        """Private method to remove a request that stopped waiting.
+
+        Args:
+            waiter (asyncio.Future): Future of the request.
+        """
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class RowBudget:
+    """Bound the rows of batch predictions being scored at once.
+
+    Batches run in the threadpool, so the budget is protected by a lock.
+
+    Args:
+        max_rows (int): Maximum rows in flight.
+        retry_after (int): Seconds sent in the `Retry-After` header.
+    """
+
+    def __init__(self, max_rows: int, retry_after: int) -> None:
+        """Initialize an unused budget.
+
+        Args:
+            max_rows (int): Maximum rows in flight.
+            retry_after (int): Seconds sent in the `Retry-After` header.
+        """
+        self.max_rows = max_rows
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def reserve(self, rows: int):
+        """Hold `rows` of the budget while the batch is scored.
+
+        Args:
+            rows (int): Rows of the batch.
+
+        Raises:
+            AdmissionRejected: With a 413 if the batch alone exceeds the budget,
+                or a 429 if the rows in flight leave no room for it.
+        """
+        if rows > self.max_rows:
+            raise AdmissionRejected(
+                413, f"Batches are limited to {self.max_rows} rows."
+            )
+
+        with self._lock:
+            if self.in_flight + rows > self.max_rows:
+                self.rejected += 1
+                raise AdmissionRejected(
+                    429, "Too many rows in flight.", retry_after=self.retry_after
+                )
+            self.in_flight += rows
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= rows
+
+
+class AdmissionController:
+    """Concurrency limiters of the prediction endpoints and the row budget.
+
+    A limiter is created up front for every path of `LIMITED_PATHS`, the
+    requests of any other path are not limited, so unknown paths cannot grow
+    the limiters.
+
+    Args:
+        max_concurrency (int): Default maximum requests running at once per
+            endpoint.
+        max_queue_size (int): Default maximum requests waiting per endpoint.
+        queue_timeout (float): Maximum seconds a request waits for a slot.
+        retry_after (int): Seconds sent in the `Retry-After` header.
+        max_rows_in_flight (int): Maximum rows of batch predictions in flight.
+        limits (dict, optional): Concurrency and queue size by path, replacing
+            the defaults for those endpoints.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue_size: int,
+        queue_timeout: float,
+        retry_after: int,
+        max_rows_in_flight: int,
+        limits: dict = None,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            max_concurrency (int): Default maximum requests running at once.
+            max_queue_size (int): Default maximum requests waiting.
+            queue_timeout (float): Maximum seconds a request waits for a slot.
+            retry_after (int): Seconds sent in the `Retry-After` header.
+            max_rows_in_flight (int): Maximum rows of batch predictions in flight.
+            limits (dict, optional): Concurrency and queue size by path.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.limits = limits or {}
+        self.rows = RowBudget(max_rows_in_flight, retry_after)
+        self.limiters = {
+            path: ConcurrencyLimiter(
+                *self.limits.get(path, (max_concurrency, max_queue_size)),
+                queue_timeout,
+                retry_after,
+            )
+            for path in LIMITED_PATHS
+        }
+
+    def limiter(self, path: str) -> ConcurrencyLimiter:
+        """Return the limiter of an endpoint.
+
+        Args:
+            path (str): Path of the request.
+
+        Returns:
+            ConcurrencyLimiter: The limiter, or None if the path is not limited.
+        """
+        return self.limiters.get(path)
+
+
+class AdmissionMiddleware:
+    """Refuse the prediction requests exceeding the limits of their endpoint.
+
+    The limits are applied before the request reaches the threadpool, so an
+    overloaded endpoint answers quickly instead of queueing without bound.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+        controller (AdmissionController): The limits of every endpoint.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+            controller (AdmissionController): The limits of every endpoint.
+        """
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a request if its endpoint has capacity for it.
+
+        Args:
+            scope (Scope): The ASGI connection scope.
+            receive (Receive): The ASGI receive channel.
+            send (Send): The ASGI send channel.
+        """
+        limiter = (
+            self.controller.limiter(scope["path"]) if scope["type"] == "http" else None
+        )
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except AdmissionRejected as rejection:
+            await rejection.to_response()(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+def parse_limits(limits: str) -> dict:
+    """Parse per-endpoint limits such as `/v1/batch_prediction=4:8`.
+
+    Args:
+        limits (str): Comma-separated `path=concurrency:queue_size` entries.
+
+    Returns:
+        dict: Maximum concurrency and queue size by path.
+
+    Raises:
+        ValueError: If an entry is not formatted as expected.
+    """
+    parsed = {}
+    for limit in limits.split(","):
+        if not limit.strip():
+            continue
+        path, _, values = limit.partition("=")
+        max_concurrency, _, max_queue_size = values.partition(":")
+        parsed[path.strip()] = (int(max_concurrency), int(max_queue_size or 0))
+    return parsed
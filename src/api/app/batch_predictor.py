@@ -1,30 +1,165 @@
 """Module with a class to handle batch predictions for Titanic data."""
 
-from src.api.app.models import BatchPredictionRequest
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pandas import DataFrame
+
+from src.api.app.metrics import BATCH_SIZE, StageTimer
+from src.api.app.models import BatchPredictionRequest, PredictionRequest
+from src.api.app.prediction_cache import PredictionCache
 from src.api.app.predictor import Predictor
+from src.db.db_manager.postgre_sql_manager import PostgreSQLManager
+from src.db.log_writer import BackgroundLogWriter
+from src.utils.serving_functions import preprocess_features
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
 
 
 class BatchPredictor(Predictor):
     """A predictor class to handle batch predictions by extending the base Predictor class."""
 
-    def __init__(self):
-        """Initialize the BatchPredictor by inheriting from the base Predictor class."""
-        super().__init__()
+    def __init__(
+        self,
+        model: "Pipeline" = None,
+        db_manager: PostgreSQLManager = None,
+        log_writer: BackgroundLogWriter = None,
+        model_version: str = None,
+        cache: PredictionCache = None,
+        model_path: str = None,
+    ):
+        """Initialize the BatchPredictor by inheriting from the base Predictor class.
+
+        Args:
+            model (Pipeline, optional): An already loaded model to reuse.
+            db_manager (PostgreSQLManager, optional): A database manager to reuse.
+            log_writer (BackgroundLogWriter, optional): Writer used to log the
+                predictions off the request path.
+            model_version (str, optional): Version of the provided model.
+            cache (PredictionCache, optional): Cache of predictions by feature vector.
+            model_path (str, optional): Path of the model file to load instead of
+                `MODEL_PATH`.
+        """
+        super().__init__(
+            model=model,
+            db_manager=db_manager,
+            log_writer=log_writer,
+            model_version=model_version,
+            cache=cache,
+            model_path=model_path,
+        )
 
     def batch_predictor(self, request: BatchPredictionRequest) -> list[int]:
         """Generate survival predictions for a batch of Titanic passengers.
 
+        The whole batch is transformed into one DataFrame, preprocessed and
+        predicted in a single call, and logged to the database in one bulk write.
+        Only the rows missing from the prediction cache go through the model.
+
         Args:
             request (BatchPredictionRequest): Request object containing batch data.
 
         Returns:
             list[int]: List of survival predictions for each passenger in the batch.
         """
-        predictions = []
-        for item in request.batch_data:
-            predictions.append(self.get_prediction(item))
+        return self.predict_many(request.batch_data)
+
+    def predict_many(self, requests: list[PredictionRequest]) -> list[int]:
+        """Generate survival predictions for a list of passengers in one model call.
+
+        Args:
+            requests (list[PredictionRequest]): Passengers to predict.
+
+        Returns:
+            list[int]: The survival prediction of each passenger.
+        """
+        if not requests:
+            return []
+
+        timer = StageTimer(self.shadow)
+        df_request = self._transform_batch_to_dataframe(requests)
+        timer.lap("transform")
+        return self.predict_frame(df_request)
+
+    def predict_frame(self, df_request: DataFrame) -> list[int]:
+        """Generate survival predictions for the passengers of a raw DataFrame.
+
+        Args:
+            df_request (DataFrame): Passengers with the request columns.
+
+        Returns:
+            list[int]: The survival prediction of each passenger.
+        """
+        if df_request.empty:
+            return []
+
+        timer = StageTimer(self.shadow)
+        BATCH_SIZE.observe(len(df_request), (timer.shadow,))
+        preprocessed_data = preprocess_features(df_request)
+        timer.lap("preprocess")
+
+        predictions = self._predict(preprocessed_data)
+        timer.lap("predict")
+        self.log_to_db(data_input=df_request, prediction=predictions)
+        timer.lap("log")
+
+        return np.maximum(predictions, 0).tolist()
+
+    def predict_proba_many(
+        self, requests: list[PredictionRequest], threshold: float = None
+    ) -> tuple[list[float], list[int]]:
+        """Generate survival probabilities for a list of passengers in one model call.
+
+        Args:
+            requests (list[PredictionRequest]): Passengers to predict.
+            threshold (float, optional): Minimum survival probability to predict
+                survival. When not provided the most probable class is predicted.
+
+        Returns:
+            tuple[list[float], list[int]]: The survival probability and the
+                predicted outcome of each passenger.
+        """
+        if not requests:
+            return [], []
+
+        timer = StageTimer(self.shadow)
+        df_request = self._transform_batch_to_dataframe(requests)
+        timer.lap("transform")
+        return self.predict_proba_frame(df_request, threshold)
+
+    def predict_proba_frame(
+        self, df_request: DataFrame, threshold: float = None
+    ) -> tuple[list[float], list[int]]:
+        """Generate survival probabilities for the passengers of a raw DataFrame.
+
+        The whole batch goes through a single `predict_proba` call and the
+        threshold is applied to all the probabilities at once.
+
+        Args:
+            df_request (DataFrame): Passengers with the request columns.
+            threshold (float, optional): Minimum survival probability to predict
+                survival. When not provided the most probable class is predicted.
+
+        Returns:
+            tuple[list[float], list[int]]: The survival probability and the
+                predicted outcome of each passenger.
+        """
+        if df_request.empty:
+            return [], []
+
+        timer = StageTimer(self.shadow)
+        BATCH_SIZE.observe(len(df_request), (timer.shadow,))
+        preprocessed_data = preprocess_features(df_request)
+        timer.lap("preprocess")
+        probabilities, predictions = self._predict_survival(
+            preprocessed_data, threshold
+        )
+        timer.lap("predict")
+        self.log_to_db(data_input=df_request, prediction=predictions)
+        timer.lap("log")
 
-        return predictions
+        return probabilities, predictions
 
     def __call__(self, *args, **kwds) -> list[int]:
         """Allow the BatchPredictor instance to be called directly for batch predictions.
@@ -0,0 +1,148 @@
+"""Module to decode and encode batches in binary columnar formats."""
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from src.api.app.features import conform_request_frame
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+NPY_MEDIA_TYPE = "application/x-npy"
+
+# Alternative names of the media types, mapped to the canonical one
+MEDIA_TYPE_ALIASES = {
+    "application/vnd.apache.arrow.stream": ARROW_MEDIA_TYPE,
+    "application/x-arrow": ARROW_MEDIA_TYPE,
+    "application/vnd.apache.parquet": PARQUET_MEDIA_TYPE,
+    "application/x-parquet": PARQUET_MEDIA_TYPE,
+    "application/x-npy": NPY_MEDIA_TYPE,
+    "application/npy": NPY_MEDIA_TYPE,
+}
+
+
+def resolve_media_type(content_type: str) -> str:
+    """Return the canonical binary media type of a Content-Type or Accept value.
+
+    Args:
+        content_type (str): Value of the header.
+
+    Returns:
+        str: One of the supported media types, or None if it is not supported.
+    """
+    content_type = content_type.split(";")[0].strip().lower()
+    return MEDIA_TYPE_ALIASES.get(content_type)
+
+
+def read_frame(content: bytes, media_type: str) -> pd.DataFrame:
+    """Decode a batch of passengers.
+
+    Arrow and Parquet are read through pyarrow, which converts the numeric
+    columns without nulls to NumPy without copying. NPY payloads must be a
+    structured array whose field names are the request columns, with empty
+    strings for the missing text values.
+
+    Args:
+        content (bytes): The encoded batch.
+        media_type (str): Canonical media type of the batch.
+
+    Returns:
+        pd.DataFrame: The passengers with the `REQUEST_COLUMNS`.
+
+    Raises:
+        ValueError: If the content cannot be decoded.
+    """
+    if media_type == NPY_MEDIA_TYPE:
+        array = np.load(BytesIO(content), allow_pickle=False)
+        if array.dtype.names is None:
+            raise ValueError("The NPY batch must be a structured array.")
+        frame = pd.DataFrame(
+            {
+                name: (
+                    _decode_strings(array[name])
+                    if array[name].dtype.kind in "SU"
+                    else array[name]
+                )
+                for name in array.dtype.names
+            }
+        )
+    else:
+        frame = _read_table(content, media_type).to_pandas()
+
+    return conform_request_frame(frame)
+
+
+def write_frame(frame: pd.DataFrame, media_type: str) -> bytes:
+    """Encode a DataFrame in a binary format.
+
+    Args:
+        frame (pd.DataFrame): Columns to encode.
+        media_type (str): Canonical media type of the result.
+
+    Returns:
+        bytes: The encoded DataFrame.
+    """
+    buffer = BytesIO()
+    if media_type == NPY_MEDIA_TYPE:
+        # Text columns are stored as fixed-width unicode, missing values as ""
+        arrays = [
+            (
+                frame[name].fillna("").astype(str).to_numpy(dtype=str)
+                if frame[name].dtype.kind == "O"
+                else frame[name].to_numpy()
+            )
+            for name in frame.columns
+        ]
+        records = np.rec.fromarrays(arrays, names=list(frame.columns))
+        np.save(buffer, records.view(np.ndarray), allow_pickle=False)
+        return buffer.getvalue()
+
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if media_type == PARQUET_MEDIA_TYPE:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, buffer)
+    else:
+        with pa.ipc.new_stream(buffer, table.schema) as writer:
+            writer.write_table(table)
+    return buffer.getvalue()
+
+
+def _read_table(content: bytes, media_type: str):
+    """Private function to read an Arrow IPC stream or a Parquet file.
+
+    Args:
+        content (bytes): The encoded batch.
+        media_type (str): Canonical media type of the batch.
+
+    Returns:
+        pyarrow.Table: The decoded table.
+    """
+    import pyarrow as pa
+
+    if media_type == PARQUET_MEDIA_TYPE:
+        import pyarrow.parquet as pq
+
+        return pq.read_table(pa.BufferReader(content))
+
+    with pa.ipc.open_stream(content) as reader:
+        return reader.read_all()
+
+
+def _decode_strings(values: np.ndarray) -> np.ndarray:
+    """Private function to convert a fixed-width text column to Python strings.
+
+    Args:
+        values (np.ndarray): Column with the `S` or `U` dtype.
+
+    Returns:
+        np.ndarray: Object array with the strings, None for the empty ones.
+    """
+    if values.dtype.kind == "S":
+        values = np.char.decode(values, "utf-8")
+    values = values.astype(object)
+    values[values == ""] = None
+    return values
@@ -0,0 +1,119 @@
+"""Module to build model inputs from requests, mostly without going through pandas."""
+
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from src.api.app.models import CATEGORIES, check_categories
+
+# Columns of a passenger, as in `data/api-test.csv` and `PredictionRequest`
+REQUEST_COLUMNS = [
+    "PassengerId",
+    "Pclass",
+    "Name",
+    "Sex",
+    "Age",
+    "SibSp",
+    "Parch",
+    "Ticket",
+    "Fare",
+    "Cabin",
+    "Embarked",
+]
+NUMERIC_COLUMNS = ["PassengerId", "Pclass", "Age", "SibSp", "Parch", "Fare"]
+
+# Columns returned by `preprocess_features` for a PredictionRequest, in order
+FEATURE_COLUMNS = [
+    "Pclass",
+    "Sex",
+    "Age",
+    "SibSp",
+    "Parch",
+    "Fare",
+    "Embarked",
+    "FamilySize",
+    "IsAlone",
+]
+
+
+def request_record(request: BaseModel) -> dict:
+    """Convert a request into a plain dictionary with the enum values resolved.
+
+    Args:
+        request (BaseModel): Input data in Pydantic model format.
+
+    Returns:
+        dict: The request fields, as they are logged to the database.
+    """
+    return {
+        key: value.value if isinstance(value, Enum) else value
+        for key, value in request.dict().items()
+    }
+
+
+def build_features(record: dict) -> tuple:
+    """Build the preprocessed feature vector of a single passenger.
+
+    Mirrors `preprocess_features`: the identifier columns are dropped and
+    FamilySize and IsAlone are derived from SibSp and Parch.
+
+    Args:
+        record (dict): Passenger data as returned by `request_record`.
+
+    Returns:
+        tuple: Feature values ordered like `FEATURE_COLUMNS`.
+    """
+    family_size = record["SibSp"] + record["Parch"]
+    return (
+        record["Pclass"],
+        record["Sex"],
+        record["Age"],
+        record["SibSp"],
+        record["Parch"],
+        record["Fare"],
+        record["Embarked"],
+        family_size,
+        1 if family_size == 0 else 0,
+    )
+
+
+def features_to_array(features: list, columns: list) -> np.ndarray:
+    """Stack feature vectors into a 2D array with the requested column order.
+
+    Args:
+        features (list): Feature vectors ordered like `FEATURE_COLUMNS`.
+        columns (list): Names of the columns of the resulting array.
+
+    Returns:
+        np.ndarray: Object array with one row per feature vector.
+    """
+    indexes = [FEATURE_COLUMNS.index(column) for column in columns]
+    array = np.empty((len(features), len(indexes)), dtype=object)
+    for row, feature in enumerate(features):
+        array[row] = [feature[index] for index in indexes]
+    return array
+
+
+def conform_request_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Align a DataFrame of passengers decoded from an upload with the request columns.
+
+    Missing columns are filled with nulls and the numeric columns are parsed,
+    leaving invalid or empty values as NaN for the model imputers.
+
+    Args:
+        frame (pd.DataFrame): Passengers with any subset of `REQUEST_COLUMNS`.
+
+    Returns:
+        pd.DataFrame: The passengers with the `REQUEST_COLUMNS`.
+
+    Raises:
+        ValueError: If a categorical column holds an unknown value.
+    """
+    frame = frame.reindex(columns=REQUEST_COLUMNS)
+    check_categories({column: frame[column] for column in CATEGORIES})
+    for column in NUMERIC_COLUMNS:
+        if frame[column].dtype.kind not in "iuf":
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    return frame
@@ -0,0 +1,354 @@
+"""Module with the latency and load metrics exported in the Prometheus format."""
+
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+from src.api.app.tracing import current_trace
+
+# Upper bounds in seconds of the stage latency buckets
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+# Upper bounds of the batch size buckets, in rows
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Distribution of observed values split in cumulative buckets.
+
+    Observing a value only takes a lock and increments two counters, the
+    buckets are accumulated when the histogram is rendered.
+
+    Args:
+        name (str): Name of the metric.
+        documentation (str): Description shown in the `HELP` line.
+        buckets (tuple): Sorted upper bounds of the buckets, `+Inf` is added.
+        label_names (tuple, optional): Names of the labels of every series.
+    """
+
+    def __init__(
+        self, name: str, documentation: str, buckets: tuple, label_names: tuple = ()
+    ) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            name (str): Name of the metric.
+            documentation (str): Description shown in the `HELP` line.
+            buckets (tuple): Sorted upper bounds of the buckets.
+            label_names (tuple, optional): Names of the labels of every series.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        """Record a value.
+
+        Args:
+            value (float): The observed value.
+            labels (tuple, optional): Label values, ordered like `label_names`.
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def snapshot(self) -> dict:
+        """Copy the counts of every series.
+
+        Returns:
+            dict: Per-bucket counts and sum of the values, by label values.
+        """
+        with self._lock:
+            return {
+                labels: (list(counts), total)
+                for labels, (counts, total) in self._series.items()
+            }
+
+    def reset(self) -> None:
+        """Forget every observation."""
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        """Render the histogram in the Prometheus text format.
+
+        Returns:
+            list[str]: Lines of the exposition.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for labels, (counts, total) in sorted(self.snapshot().items()):
+            pairs = list(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{self.name}_bucket{_labels(pairs + [('le', le)])} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(pairs)} {total}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {cumulative}")
+        return lines
+
+
+class StageTimer:
+    """Record the time spent in consecutive stages of a prediction.
+
+    Each call to `lap` records the seconds elapsed since the previous lap, or
+    since the timer was created, under the name of the stage that just ended.
+    The duration is also added to the trace of the request being served.
+
+    Args:
+        shadow (bool, optional): Whether the prediction is made by a shadow
+            model. Defaults to False.
+
+    Attributes:
+        shadow (str): Value of the `shadow` label of the recorded metrics.
+    """
+
+    __slots__ = ("shadow", "_trace", "_last")
+
+    def __init__(self, shadow: bool = False) -> None:
+        """Start timing the first stage.
+
+        Args:
+            shadow (bool, optional): Whether the prediction is made by a shadow
+                model.
+        """
+        self.shadow = "true" if shadow else "false"
+        self._trace = current_trace()
+        self._last = perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Record the duration of a stage and start timing the next one.
+
+        Args:
+            stage (str): Name of the stage that just ended.
+        """
+        now = perf_counter()
+        STAGE_SECONDS.observe(now - self._last, (stage, self.shadow))
+        if self._trace is not None:
+            self._trace.add(stage, now - self._last)
+        self._last = now
+
+
+STAGE_SECONDS = Histogram(
+    "titanic_prediction_stage_seconds",
+    "Seconds spent in each stage of a prediction.",
+    LATENCY_BUCKETS,
+    ("stage", "shadow"),
+)
+
+BATCH_SIZE = Histogram(
+    "titanic_prediction_batch_size",
+    "Rows scored together by a batch predictor.",
+    BATCH_SIZE_BUCKETS,
+    ("shadow",),
+)
+
+
+def render_metrics(registry, admission=None) -> str:
+    """Render the histograms and the state of the served models.
+
+    Args:
+        registry (PredictorRegistry): Registry holding the served predictors.
+        admission (AdmissionController, optional): Limits of the requests in
+            flight, whose load and rejections are exported when given.
+
+    Returns:
+        str: The metrics in the Prometheus text format.
+    """
+    lines = STAGE_SECONDS.render() + BATCH_SIZE.render()
+    if admission is not None:
+        lines += _admission_lines(admission)
+    if not registry.is_loaded:
+        return "\n".join(lines) + "\n"
+
+    cache_stats = [
+        (variant.model_version, variant.predictor.cache.stats)
+        for variant in registry.router.variants
+        if variant.predictor.cache is not None
+    ]
+    for key, kind, documentation in (
+        ("hits", "counter", "Predictions served from the cache."),
+        ("misses", "counter", "Rows looked up and missing from the cache."),
+        ("size", "gauge", "Predictions stored in the cache."),
+    ):
+        name = f"titanic_prediction_cache_{key}"
+        if kind == "counter":
+            name += "_total"
+        lines += _sample_lines(
+            name,
+            kind,
+            documentation,
+            [
+                ([("model_version", version)], stats[key])
+                for version, stats in cache_stats
+            ],
+        )
+
+    log_writer = registry.log_writer
+    if log_writer is not None:
+        lines += _sample_lines(
+            "titanic_log_writer_queue_depth",
+            "gauge",
+            "Prediction logs waiting to be uploaded.",
+            [([], log_writer.queue_depth)],
+        )
+        lines += _sample_lines(
+            "titanic_log_writer_dropped_rows_total",
+            "counter",
+            "Logged rows dropped because the queue was full.",
+            [([], log_writer.dropped_rows)],
+        )
+
+    micro_batchers = registry.micro_batchers
+    if micro_batchers:
+        lines += _sample_lines(
+            "titanic_micro_batcher_queue_depth",
+            "gauge",
+            "Single predictions waiting for the next micro-batch, per model.",
+            [
+                (
+                    [("model_version", micro_batcher.batch_predictor.model_version)],
+                    micro_batcher.queue_depth,
+                )
+                for micro_batcher in micro_batchers
+            ],
+        )
+
+    shadow_scorer = registry.shadow_scorer
+    if shadow_scorer is not None:
+        lines += _sample_lines(
+            "titanic_shadow_scorer_queue_depth",
+            "gauge",
+            "Inputs waiting to be scored by the shadow models.",
+            [([], shadow_scorer.queue_depth)],
+        )
+        lines += _sample_lines(
+            "titanic_shadow_scorer_dropped_inputs_total",
+            "counter",
+            "Inputs not scored by the shadow models because the queue was full.",
+            [([], shadow_scorer.dropped_inputs)],
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def _admission_lines(admission) -> list:
+    """Private function to render the load and rejections of the admission control.
+
+    Args:
+        admission (AdmissionController): Limits of the requests in flight.
+
+    Returns:
+        list[str]: Lines of the exposition.
+    """
+    limiters = sorted(admission.limiters.items())
+    lines = _sample_lines(
+        "titanic_admission_in_flight",
+        "gauge",
+        "Requests running per endpoint.",
+        [([("path", path)], limiter.in_flight) for path, limiter in limiters],
+    )
+    lines += _sample_lines(
+        "titanic_admission_queue_depth",
+        "gauge",
+        "Requests waiting for a slot per endpoint.",
+        [([("path", path)], limiter.queue_depth) for path, limiter in limiters],
+    )
+    lines += _sample_lines(
+        "titanic_admission_rejected_total",
+        "counter",
+        "Requests refused per endpoint and reason.",
+        [
+            ([("path", path), ("reason", reason)], limiter.rejected[reason])
+            for path, limiter in limiters
+            for reason in ("queue_full", "queue_timeout")
+        ],
+    )
+    lines += _sample_lines(
+        "titanic_admission_rows_rejected_total",
+        "counter",
+        "Batches refused because of the rows in flight.",
+        [([], admission.rows.rejected)],
+    )
+    lines += _sample_lines(
+        "titanic_admission_rows_in_flight",
+        "gauge",
+        "Rows of batch predictions being scored.",
+        [([], admission.rows.in_flight)],
+    )
+    return lines
+
+
+def _sample_lines(name: str, kind: str, documentation: str, samples: list) -> list:
+    """Private function to render a counter or a gauge.
+
+    Args:
+        name (str): Name of the metric.
+        kind (str): Prometheus type of the metric.
+        documentation (str): Description shown in the `HELP` line.
+        samples (list): Pairs of label pairs and value.
+
+    Returns:
+        list[str]: Lines of the exposition.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for pairs, value in samples:
+        lines.append(f"{name}{_labels(pairs)} {value}")
+    return lines
+
+
+def _labels(pairs: list) -> str:
+    """Private function to format label pairs as `{name="value",...}`.
+
+    Args:
+        pairs (list): Pairs of label name and value.
+
+    Returns:
+        str: The formatted labels, empty when there is none.
+    """
+    if not pairs:
+        return ""
+    formatted = (f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + ",".join(formatted) + "}"
+
+
+def _escape(value) -> str:
+    """Private function to escape a label value.
+
+    Args:
+        value: The label value.
+
+    Returns:
+        str: The value with backslashes, quotes and newlines escaped.
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
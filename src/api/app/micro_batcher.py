@@ -0,0 +1,205 @@
+"""Module with a dispatcher that groups concurrent single predictions."""
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from src.api.app.batch_predictor import BatchPredictor
+from src.api.app.models import PredictionRequest
+from src.api.app.tracing import RequestTrace, current_trace, reset_trace, set_trace
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """Collect concurrent single requests and score them with one model call.
+
+    A worker thread takes the first waiting request, keeps collecting requests
+    for up to `window` seconds or until `max_batch_size` are gathered, predicts
+    them together and resolves the result of every caller separately. A caller
+    gives up after `window + score_timeout` seconds, so a stalled worker cannot
+    hold the request threads forever.
+
+    Args:
+        batch_predictor (BatchPredictor): Predictor used to score each batch.
+        window (float, optional): Maximum seconds to wait for more requests.
+            Defaults to 0.002.
+        max_batch_size (int, optional): Maximum requests scored together.
+            Defaults to 64.
+        max_queue_size (int, optional): Maximum requests waiting to be scored.
+            Defaults to 1024.
+        score_timeout (float, optional): Maximum seconds a request waits for
+            its batch to be scored, on top of the window. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        batch_predictor: BatchPredictor,
+        window: float = 0.002,
+        max_batch_size: int = 64,
+        max_queue_size: int = 1024,
+        score_timeout: float = 1.0,
+    ) -> None:
+        """Initialize the dispatcher without starting the worker thread.
+
+        Args:
+            batch_predictor (BatchPredictor): Predictor used to score each batch.
+            window (float, optional): Maximum seconds to wait for more requests.
+            max_batch_size (int, optional): Maximum requests scored together.
+            max_queue_size (int, optional): Maximum requests waiting to be scored.
+            score_timeout (float, optional): Maximum seconds to score the batch.
+        """
+        self.batch_predictor = batch_predictor
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.score_timeout = score_timeout
+        self.batch_sizes = Counter()
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+
+    @property
+    def queue_depth(self) -> int:
+        """int: Number of requests waiting to be scored."""
+        return self._queue.qsize()
+
+    @property
+    def is_running(self) -> bool:
+        """bool: Whether the worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the worker thread if it is not running yet."""
+        if self.is_running:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """Score the requests already collected and stop the worker thread.
+
+        Requests still queued after the worker stops are failed.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for the worker.
+        """
+        if not self.is_running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("The dispatcher was stopped."))
+
+    def submit(self, request: PredictionRequest) -> Future:
+        """Queue a request to be scored in the next batch.
+
+        Args:
+            request (PredictionRequest): Passenger to predict.
+
+        Returns:
+            Future: Future resolved with the prediction of the request.
+
+        Raises:
+            queue.Full: If `max_queue_size` requests are already waiting.
+        """
+        future = Future()
+        self._queue.put_nowait((request, future, current_trace()))
+        return future
+
+    def __call__(self, request: PredictionRequest) -> int:
+        """Score a request in the next batch and wait for its prediction.
+
+        Args:
+            request (PredictionRequest): Passenger to predict.
+
+        Returns:
+            int: The survival prediction of the passenger.
+
+        Raises:
+            queue.Full: If `max_queue_size` requests are already waiting.
+            TimeoutError: If the prediction is not ready within `window +
+                score_timeout` seconds.
+        """
+        future = self.submit(request)
+        try:
+            return future.result(self.window + self.score_timeout)
+        except TimeoutError:
+            # Not scored if the worker has not taken it yet
+            future.cancel()
+            raise
+
+    def _run(self) -> None:
+        """Worker loop collecting requests and scoring them in batches."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._process(batch)
+            if stopping:
+                return
+
+    def _process(self, batch: list) -> None:
+        """Score a batch and resolve the future of every request.
+
+        The batch is traced with the ID of every request, and its stage
+        durations are added to the trace of each request before it is resolved.
+
+        Args:
+            batch (list): Triples of request, future and trace of the caller.
+        """
+        # Requests whose caller timed out are dropped, the others can no
+        # longer be cancelled
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.batch_sizes[len(batch)] += 1
+        batch_trace = RequestTrace(
+            [trace.request_id if trace is not None else None for _, _, trace in batch]
+        )
+        token = set_trace(batch_trace)
+        try:
+            predictions = self.batch_predictor.predict_many(
+                [request for request, _, _ in batch]
+            )
+        except Exception as e:
+            logger.error(f"Error scoring a batch of {len(batch)} requests: {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        finally:
+            reset_trace(token)
+
+        for (_, future, trace), prediction in zip(batch, predictions):
+            if trace is not None:
+                trace.timings.update(batch_trace.timings)
+            future.set_result(prediction)
@@ -0,0 +1,132 @@
+"""Module with the weighted routing of requests between served models."""
+
+import random
+
+from src.api.app.batch_predictor import BatchPredictor
+from src.api.app.predictor import Predictor
+
+
+class ModelVariant:
+    """A model served by the API with its predictors and routing weight.
+
+    Args:
+        model_path (str): Path of the model file.
+        weight (float): Relative share of the requests routed to the model.
+        predictor (Predictor): Predictor of single requests.
+        batch_predictor (BatchPredictor): Predictor of batches sharing the model.
+
+    Attributes:
+        micro_batcher (MicroBatcher): Dispatcher grouping the single predictions
+            routed to the model, None if micro-batching is disabled.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        weight: float,
+        predictor: Predictor,
+        batch_predictor: BatchPredictor,
+    ) -> None:
+        """Initialize the variant.
+
+        Args:
+            model_path (str): Path of the model file.
+            weight (float): Relative share of the requests routed to the model.
+            predictor (Predictor): Predictor of single requests.
+            batch_predictor (BatchPredictor): Predictor of batches.
+        """
+        self.model_path = model_path
+        self.weight = weight
+        self.predictor = predictor
+        self.batch_predictor = batch_predictor
+        self.micro_batcher = None
+
+    @property
+    def model_version(self) -> str:
+        """str: Version of the model of the variant."""
+        return self.predictor.model_version
+
+
+class ModelRouter:
+    """Pick the model variant serving each request, in proportion to the weights.
+
+    A router is never modified: swapping a variant builds a new router, so a
+    request always sees a consistent set of variants.
+
+    Args:
+        variants (list[ModelVariant]): Served variants, the first one is the
+            primary variant used where a single model is needed.
+    """
+
+    def __init__(self, variants: list[ModelVariant]) -> None:
+        """Initialize the router.
+
+        Args:
+            variants (list[ModelVariant]): Served variants, primary first.
+
+        Raises:
+            ValueError: If there is no variant, a weight is negative or every
+                weight is zero.
+        """
+        if not variants:
+            raise ValueError("At least one model variant is required.")
+        if any(variant.weight < 0 for variant in variants):
+            raise ValueError("The routing weights must be non-negative.")
+        if sum(variant.weight for variant in variants) <= 0:
+            raise ValueError("At least one routing weight must be positive.")
+
+        self.variants = variants
+        self._weights = [variant.weight for variant in variants]
+        self._random = random.Random()
+
+    @property
+    def primary(self) -> ModelVariant:
+        """ModelVariant: The first variant."""
+        return self.variants[0]
+
+    def choose(self) -> ModelVariant:
+        """Pick a variant at random, in proportion to the weights.
+
+        Returns:
+            ModelVariant: The variant serving the request.
+        """
+        if len(self.variants) == 1:
+            return self.variants[0]
+        return self._random.choices(self.variants, weights=self._weights)[0]
+
+    def replace(self, old: ModelVariant, new: ModelVariant) -> "ModelRouter":
+        """Build a router where a variant is replaced by another one.
+
+        Args:
+            old (ModelVariant): Variant to replace.
+            new (ModelVariant): Variant taking its place and weight.
+
+        Returns:
+            ModelRouter: The new router.
+        """
+        return ModelRouter(
+            [new if variant is old else variant for variant in self.variants]
+        )
+
+
+def parse_routes(routes: str, default_path: str) -> list[tuple[str, float]]:
+    """Parse a list of weighted model paths such as `a.pkl=0.9,b.pkl=0.1`.
+
+    Args:
+        routes (str): Comma-separated `path=weight` entries. The weight defaults
+            to 1 when omitted.
+        default_path (str): Path served alone when `routes` is empty.
+
+    Returns:
+        list[tuple[str, float]]: Path and weight of every route.
+
+    Raises:
+        ValueError: If a weight is not a number.
+    """
+    parsed = []
+    for route in routes.split(","):
+        if not route.strip():
+            continue
+        path, _, weight = route.partition("=")
+        parsed.append((path.strip(), float(weight) if weight.strip() else 1.0))
+    return parsed or [(default_path, 1.0)]
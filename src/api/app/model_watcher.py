@@ -0,0 +1,102 @@
+"""Module with a background watcher reloading the model when its file changes."""
+
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ModelWatcher:
+    """Poll the model file and reload the predictors when it changes.
+
+    The modification time and size of the file are checked every `interval`
+    seconds. When they change `reload` is called from the watcher thread, so the
+    new model is loaded and warmed up without blocking any request. A failed
+    reload, e.g. because the file is still being written, is retried on the
+    next check.
+
+    Args:
+        reload (Callable[[], bool]): Function loading the model file and swapping
+            it in, usually `PredictorRegistry.reload`.
+        model_path (str): Path of the model file to watch.
+        interval (float, optional): Seconds between two checks. Defaults to 5.0.
+    """
+
+    def __init__(self, reload, model_path: str, interval: float = 5.0) -> None:
+        """Initialize the watcher without starting its thread.
+
+        Args:
+            reload (Callable[[], bool]): Function loading and swapping the model.
+            model_path (str): Path of the model file to watch.
+            interval (float, optional): Seconds between two checks.
+        """
+        self.reload = reload
+        self.model_path = model_path
+        self.interval = interval
+        self._signature = self._file_signature()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        """bool: Whether the watcher thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the watcher thread if it is not running yet."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="model-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop the watcher thread.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for the thread.
+        """
+        if not self.is_running:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def check(self) -> bool:
+        """Reload the model if the file changed since the last successful check.
+
+        Returns:
+            bool: Whether a different model was swapped in.
+        """
+        signature = self._file_signature()
+        if signature is None or signature == self._signature:
+            return False
+
+        try:
+            reloaded = self.reload()
+        except Exception as e:
+            logger.error(f"Error reloading the model from {self.model_path}: {e}")
+            return False
+
+        self._signature = signature
+        return reloaded
+
+    def _run(self) -> None:
+        """Worker loop checking the file every `interval` seconds."""
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def _file_signature(self) -> tuple:
+        """Private method to read the modification time and size of the file.
+
+        Returns:
+            tuple: The modification time and size, or None if the file is missing.
+        """
+        try:
+            stat = os.stat(self.model_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -2,7 +2,9 @@
 
 from enum import Enum
 
-from pydantic import BaseModel
+import numpy as np
+from pandas import DataFrame, notna
+from pydantic import BaseModel, model_validator
 
 
 class Sex(Enum):
@@ -20,6 +22,30 @@ class Embarked(Enum):
     Q = "Q"
 
 
+# Enumerations of the values accepted in the categorical columns
+CATEGORIES = {"Sex": Sex, "Embarked": Embarked}
+
+
+def check_categories(columns: dict) -> None:
+    """Check that the categorical columns only hold known values or nulls.
+
+    Args:
+        columns (dict): Values of some of the `CATEGORIES` columns, by name.
+
+    Raises:
+        ValueError: If a column holds a value missing from its enumeration.
+    """
+    for column, values in columns.items():
+        values = np.asarray(values, dtype=object)
+        allowed = [member.value for member in CATEGORIES[column]]
+        unknown = ~np.isin(values, allowed) & notna(values)
+        if unknown.any():
+            raise ValueError(
+                f"Unknown values {sorted(set(values[unknown]), key=str)} in column "
+                f"{column}, expected one of {allowed}."
+            )
+
+
 class PredictionRequest(BaseModel):
     """Data model for an individual prediction request.
 
@@ -60,14 +86,75 @@ class BatchPredictionRequest(BaseModel):
     batch_data: list[PredictionRequest]
 
 
+class ColumnarBatchPredictionRequest(BaseModel):
+    """Data model for a batch prediction request given column by column.
+
+    Every attribute holds the values of one `PredictionRequest` field for all
+    the passengers, so the batch is validated per column instead of building
+    one model per passenger.
+
+    Attributes:
+        PassengerId (list[float]): The unique IDs of the passengers.
+        Pclass (list[int]): The passenger classes (1, 2, or 3).
+        Name (list[str]): The names of the passengers.
+        Sex (list[str]): The sexes of the passengers, values of `Sex`.
+        Age (list[int]): The ages of the passengers.
+        SibSp (list[int]): Numbers of siblings/spouses aboard the Titanic.
+        Parch (list[int]): Numbers of parents/children aboard the Titanic.
+        Ticket (list[str]): The ticket numbers.
+        Fare (list[float]): The fares paid by the passengers.
+        Cabin (list[str]): The cabins assigned to the passengers.
+        Embarked (list[str]): The embarkation ports, values of `Embarked`.
+    """
+
+    PassengerId: list[float]
+    Pclass: list[int]
+    Name: list[str]
+    Sex: list[str]
+    Age: list[int]
+    SibSp: list[int]
+    Parch: list[int]
+    Ticket: list[str]
+    Fare: list[float]
+    Cabin: list[str]
+    Embarked: list[str]
+
+    @model_validator(mode="after")
+    def check_columns(self) -> "ColumnarBatchPredictionRequest":
+        """Check that the columns have the same length and valid categories.
+
+        Returns:
+            ColumnarBatchPredictionRequest: The validated request.
+
+        Raises:
+            ValueError: If the column lengths differ or a category is unknown.
+        """
+        lengths = {len(values) for values in self.__dict__.values()}
+        if len(lengths) > 1:
+            raise ValueError("All the columns must have the same length.")
+
+        check_categories({column: getattr(self, column) for column in CATEGORIES})
+        return self
+
+    def to_dataframe(self) -> DataFrame:
+        """Convert the batch into a DataFrame with one row per passenger.
+
+        Returns:
+            DataFrame: The batch with the `PredictionRequest` columns.
+        """
+        return DataFrame(self.__dict__)
+
+
 class PredictionResponse(BaseModel):
     """Data model for a prediction response.
 
     Attributes:
         Survived (int): Predicted survival outcome (1 if survived, 0 if not).
+        ModelVersion (str): Version of the model that made the prediction.
     """
 
     Survived: int
+    ModelVersion: str | None = None
 
 
 class BatchPredictionResponse(BaseModel):
@@ -75,6 +162,49 @@ class BatchPredictionResponse(BaseModel):
 
     Attributes:
         Survived (list[int]): List of predicted survival outcomes for each passenger in the batch.
+        ModelVersion (str): Version of the model that made the predictions.
     """
 
     Survived: list[int]
+    ModelVersion: str | None = None
+
+
+class ProbabilityResponse(BaseModel):
+    """Data model for a survival probability response.
+
+    Attributes:
+        SurvivalProbability (float): Predicted probability of survival.
+        Survived (int): Predicted survival outcome (1 if survived, 0 if not).
+        ModelVersion (str): Version of the model that made the prediction.
+    """
+
+    SurvivalProbability: float
+    Survived: int
+    ModelVersion: str | None = None
+
+
+class BatchProbabilityResponse(BaseModel):
+    """Data model for a batch survival probability response.
+
+    Attributes:
+        SurvivalProbability (list[float]): Predicted probability of survival for
+            each passenger in the batch.
+        Survived (list[int]): Predicted survival outcome for each passenger.
+        ModelVersion (str): Version of the model that made the predictions.
+    """
+
+    SurvivalProbability: list[float]
+    Survived: list[int]
+    ModelVersion: str | None = None
+
+
+class ModelReloadResponse(BaseModel):
+    """Data model for a model reload response.
+
+    Attributes:
+        Reloaded (bool): Whether a different model was swapped in.
+        ModelVersion (str): Version of the model served after the reload.
+    """
+
+    Reloaded: bool
+    ModelVersion: str | None = None
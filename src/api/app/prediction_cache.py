@@ -0,0 +1,109 @@
+"""Module with an in-process cache of model predictions."""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """LRU cache of predictions keyed by the preprocessed feature vector.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    evicted once `max_size` entries are stored. Entries are keyed by the model
+    version as well, so the versions served side by side during a reload keep
+    their own predictions, and those of a replaced version age out.
+    Missing values (NaN) are stored as None in the keys, since NaN never equals
+    itself and rows with missing values would otherwise never be found.
+
+    Args:
+        max_size (int, optional): Maximum number of cached predictions.
+            Defaults to 10000.
+        ttl (float, optional): Seconds an entry stays valid. Defaults to 3600.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 3600) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size (int, optional): Maximum number of cached predictions.
+            ttl (float, optional): Seconds an entry stays valid.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached predictions."""
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict:
+        """dict: Hits, misses and size of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def get_many(self, model_version: str, keys: list) -> list:
+        """Look up the cached predictions of several feature vectors.
+
+        Args:
+            model_version (str): Version of the model making the predictions.
+            keys (list): Hashable feature vectors.
+
+        Returns:
+            list: The cached prediction of each key, or None when it is missing.
+        """
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            for key in map(_cache_key, keys):
+                key = (model_version, key)
+                entry = self._entries.get(key)
+                if entry is None or entry[1] <= now:
+                    if entry is not None:
+                        del self._entries[key]
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results.append(entry[0])
+        return results
+
+    def set_many(self, model_version: str, keys: list, values: list) -> None:
+        """Store the predictions of several feature vectors.
+
+        Args:
+            model_version (str): Version of the model that made the predictions.
+            keys (list): Hashable feature vectors.
+            values (list): Prediction of each key.
+        """
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in zip(map(_cache_key, keys), values):
+                key = (model_version, key)
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Remove every cached prediction."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _cache_key(key: tuple) -> tuple:
+    """Private function to replace the NaN values of a feature vector by None.
+
+    Args:
+        key (tuple): Feature vector.
+
+    Returns:
+        tuple: The same vector, or a copy with None instead of every NaN.
+    """
+    # NaN is the only value different from itself
+    if all(value == value for value in key):
+        return key
+    return tuple(None if value != value else value for value in key)
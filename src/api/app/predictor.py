@@ -1,26 +1,100 @@
 """Module with class predictor."""
 
+import hashlib
+import logging
 import os
 from io import BytesIO
+from typing import TYPE_CHECKING
 
+import numpy as np
 from joblib import load
 from pandas import DataFrame
 from pydantic import BaseModel
-from sklearn.pipeline import Pipeline
 
+from src.api.app.features import (
+    build_features,
+    features_to_array,
+    request_record,
+)
+from src.api.app.metrics import StageTimer
+from src.api.app.prediction_cache import PredictionCache
+from src.api.app.tracing import LOGGED_STAGES, current_trace
 from src.db.db_manager.postgre_sql_manager import PostgreSQLManager
-from src.utils.data_functions import preprocess_features
+from src.db.log_writer import BackgroundLogWriter
+from src.serving_configs import ServingConfigs
+from src.utils.serving_functions import preprocess_features
 
 from .models import PredictionRequest
 
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+# Synthetic passenger used to run the model before it serves requests
+WARM_UP_PASSENGER = {
+    "PassengerId": 0,
+    "Pclass": 3,
+    "Name": "Warm Up",
+    "Sex": "male",
+    "Age": 30,
+    "SibSp": 0,
+    "Parch": 0,
+    "Ticket": "0",
+    "Fare": 8.05,
+    "Cabin": "",
+    "Embarked": "S",
+}
+
+
+def get_model_path() -> str:
+    """Return the path of the served model file, taken from `MODEL_PATH`.
+
+    Returns:
+        str: Path of the model file.
+    """
+    return os.environ.get("MODEL_PATH", "models/best_model.pkl")
+
 
 class Predictor:
     """Class responsible for making predictions with the model."""
 
-    def __init__(self):
-        """Initialize the Predictor class by loading the model."""
-        self.model = self.get_model()
-        self.db_manager = PostgreSQLManager()
+    def __init__(
+        self,
+        model: "Pipeline" = None,
+        db_manager: PostgreSQLManager = None,
+        log_writer: BackgroundLogWriter = None,
+        model_version: str = None,
+        cache: PredictionCache = None,
+        model_path: str = None,
+    ):
+        """Initialize the Predictor class by loading the model.
+
+        Args:
+            model (Pipeline, optional): An already loaded model to reuse. When not
+                provided the model is loaded from `MODEL_PATH`.
+            db_manager (PostgreSQLManager, optional): A database manager to reuse.
+                When not provided a new one is created.
+            log_writer (BackgroundLogWriter, optional): Writer used to log the
+                predictions off the request path. When not provided predictions
+                are uploaded synchronously.
+            model_version (str, optional): Version of the provided model. When the
+                model is loaded from `MODEL_PATH` the content hash is used.
+            cache (PredictionCache, optional): Cache of predictions by feature
+                vector. When not provided every row goes through the model.
+            model_path (str, optional): Path of the model file to load instead of
+                `MODEL_PATH`.
+        """
+        self.model_path = model_path or get_model_path()
+        self.model_version = model_version
+        self.model = model if model is not None else self.get_model()
+        self.db_manager = db_manager if db_manager is not None else PostgreSQLManager()
+        self.log_writer = log_writer
+        self.cache = cache
+        # Set by the registry: whether the predictions are only logged, and the
+        # scorer receiving a copy of every scored input
+        self.shadow = False
+        self.shadow_scorer = None
 
     def get_prediction(self, request: PredictionRequest) -> float:
         """Generate a survival prediction for a Titanic passenger.
@@ -31,27 +105,207 @@ class Predictor:
         Returns:
             float: The predicted survival probability, constrained to be non-negative.
         """
+        timer = StageTimer(self.shadow)
+        if self.accepts_arrays:
+            # Build the feature vector straight from the request, without pandas
+            record = request_record(request)
+            timer.lap("transform")
+            features = [build_features(record)]
+            timer.lap("preprocess")
+            prediction = self._predict_features(features)[0]
+            timer.lap("predict")
+            self.log_to_db(data_input=[record], prediction=prediction)
+            timer.lap("log")
+            return max(prediction, 0)
+
         # Transform request into DataFrame and preprocess features
         df_request = self._transform_to_dataframe(request)
+        timer.lap("transform")
         preprocessed_data = preprocess_features(df_request)
+        timer.lap("preprocess")
 
         # Make prediction and log it with input data to the database
-        prediction = self.model.predict(preprocessed_data)[0]
+        prediction = self._predict(preprocessed_data)[0]
+        timer.lap("predict")
         self.log_to_db(data_input=df_request, prediction=prediction)
+        timer.lap("log")
 
         return max(prediction, 0)
 
-    def get_model(self) -> Pipeline:
+    def get_probability(
+        self, request: PredictionRequest, threshold: float = None
+    ) -> tuple[float, int]:
+        """Generate the survival probability of a Titanic passenger.
+
+        Args:
+            request (PredictionRequest): A Pydantic model with passenger information.
+            threshold (float, optional): Minimum survival probability to predict
+                survival. When not provided the most probable class is predicted.
+
+        Returns:
+            tuple[float, int]: The survival probability and the predicted outcome.
+        """
+        timer = StageTimer(self.shadow)
+        if self.accepts_arrays:
+            record = request_record(request)
+            data_input = [record]
+            timer.lap("transform")
+            model_input = features_to_array(
+                [build_features(record)], self.model.input_columns
+            )
+        else:
+            data_input = self._transform_to_dataframe(request)
+            timer.lap("transform")
+            model_input = preprocess_features(data_input)
+        timer.lap("preprocess")
+
+        probabilities, predictions = self._predict_survival(model_input, threshold)
+        timer.lap("predict")
+        self.log_to_db(data_input=data_input, prediction=predictions)
+        timer.lap("log")
+
+        return probabilities[0], predictions[0]
+
+    def get_model(self) -> "Pipeline":
         """Load a machine learning model serialized as a joblib file, expected to be a scikit-learn Pipeline.
 
+        The hash of the file content is stored as the model version. When
+        `COMPILE_MODEL` is enabled the pipeline is replaced by an equivalent
+        NumPy-only scorer, keeping the pipeline if it cannot be compiled.
+
         Returns:
             Pipeline: The loaded machine learning model.
         """
-        model_path = os.environ.get("MODEL_PATH", "models/best_model.pkl")
-        with open(model_path, "rb") as model_file:
-            model = load(BytesIO(model_file.read()))
+        with open(self.model_path, "rb") as model_file:
+            content = model_file.read()
+        self.model_version = hashlib.sha256(content).hexdigest()[:12]
+        model = load(BytesIO(content))
+
+        # scikit-learn is already imported by unpickling the model
+        from sklearn.pipeline import Pipeline
+
+        from src.ml_pipelines.compiled_scorer import compile_pipeline
+
+        if ServingConfigs.compile_model and isinstance(model, Pipeline):
+            try:
+                model = compile_pipeline(model)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Serving the pipeline without compiling it: {e}")
         return model
 
+    def warm_up(self, rounds: int = 1) -> None:
+        """Run the model on synthetic passengers without logging or caching them.
+
+        Both the array input of single predictions and the DataFrame input of
+        batches are scored, so the first real requests of either path do not pay
+        for the lazy imports and first-call allocations.
+
+        Args:
+            rounds (int, optional): Number of times each input is scored.
+                Defaults to 1.
+        """
+        request = PredictionRequest(**WARM_UP_PASSENGER)
+        for _ in range(rounds):
+            if self.accepts_arrays:
+                self.model.predict(
+                    features_to_array(
+                        [build_features(request_record(request))],
+                        self.model.input_columns,
+                    )
+                )
+            batch = self._transform_batch_to_dataframe([request] * 8)
+            self.model.predict(preprocess_features(batch))
+
+    @property
+    def accepts_arrays(self) -> bool:
+        """bool: Whether the model scores arrays ordered by its `input_columns`."""
+        return hasattr(self.model, "input_columns")
+
+    def _predict(self, preprocessed_data: DataFrame) -> np.ndarray:
+        """Predict preprocessed rows, running the model only on the cache misses.
+
+        Args:
+            preprocessed_data (DataFrame): Rows returned by `preprocess_features`.
+
+        Returns:
+            np.ndarray: The prediction of each row.
+        """
+        keys = list(preprocessed_data.itertuples(index=False, name=None))
+        return self._predict_rows(keys, lambda rows: preprocessed_data.iloc[rows])
+
+    def _predict_features(self, features: list) -> np.ndarray:
+        """Predict feature vectors built by `build_features`.
+
+        Args:
+            features (list): Feature vectors ordered like `FEATURE_COLUMNS`.
+
+        Returns:
+            np.ndarray: The prediction of each feature vector.
+        """
+        return self._predict_rows(
+            features,
+            lambda rows: features_to_array(
+                [features[row] for row in rows], self.model.input_columns
+            ),
+        )
+
+    def _predict_survival(self, model_input, threshold: float = None) -> tuple:
+        """Predict the survival probability of every row with one model call.
+
+        Probabilities are not cached: the cache holds predicted classes only.
+
+        Args:
+            model_input (DataFrame | np.ndarray): Rows accepted by the model.
+            threshold (float, optional): Minimum survival probability to predict
+                survival. When not provided the most probable class is predicted.
+
+        Returns:
+            tuple: The survival probability and the predicted outcome of each row,
+                as lists of Python numbers.
+        """
+        probabilities = self.model.predict_proba(model_input)
+        classes = np.asarray(self.model.classes_)
+        survival = probabilities[:, classes.tolist().index(1)]
+
+        if threshold is None:
+            predictions = classes.take(np.argmax(probabilities, axis=1))
+        else:
+            predictions = (survival >= threshold).astype(np.int64)
+
+        return survival.tolist(), predictions.tolist()
+
+    def _predict_rows(self, keys: list, select_rows) -> np.ndarray:
+        """Predict rows, running the model only on the cache misses.
+
+        Args:
+            keys (list): Feature vector of every row, used as cache key.
+            select_rows (Callable): Function returning the model input of the
+                given row positions.
+
+        Returns:
+            np.ndarray: The prediction of each row.
+        """
+        if self.cache is None:
+            return self.model.predict(select_rows(list(range(len(keys)))))
+
+        cached = self.cache.get_many(self.model_version, keys)
+        missing = [i for i, value in enumerate(cached) if value is None]
+        if not missing:
+            return np.array(cached)
+
+        # Repeated feature vectors of the same batch are predicted only once
+        first_row = {}
+        for i in missing:
+            first_row.setdefault(keys[i], i)
+        computed = self.model.predict(select_rows(list(first_row.values())))
+        computed_by_key = dict(zip(first_row, computed.tolist()))
+        self.cache.set_many(
+            self.model_version, list(computed_by_key), list(computed_by_key.values())
+        )
+        for i in missing:
+            cached[i] = computed_by_key[keys[i]]
+        return np.array(cached)
+
     def __call__(self, *args, **kwds) -> float:
         """Allow direct calling of the Predictor instance to make predictions.
 
@@ -73,23 +327,89 @@ class Predictor:
         Returns:
             DataFrame: Transformed data in DataFrame format.
         """
+        return self._transform_batch_to_dataframe([class_model])
+
+    def _transform_batch_to_dataframe(self, class_models: list[BaseModel]) -> DataFrame:
+        """Convert a list of Pydantic BaseModel instances into a single pandas DataFrame.
+
+        Args:
+            class_models (list[BaseModel]): Input data in Pydantic model format.
+
+        Returns:
+            DataFrame: Transformed data in DataFrame format, one row per instance.
+        """
         transition_dictionary = {}
-        for key, value in class_model.dict().items():
-            if key in ("Sex", "Embarked"):
-                transition_dictionary[key] = [value.value]
-            else:
-                transition_dictionary[key] = [value]
+        for class_model in class_models:
+            for key, value in class_model.dict().items():
+                if key in ("Sex", "Embarked"):
+                    value = value.value
+                transition_dictionary.setdefault(key, []).append(value)
         return DataFrame(transition_dictionary)
 
-    def log_to_db(self, data_input: DataFrame, prediction: int) -> None:
-        """Log the input data and the prediction result to a PostgreSQL database.
+    def log_to_db(self, data_input, prediction) -> None:
+        """Log the input data and the prediction results to a PostgreSQL database.
+
+        All the rows of `data_input` are written with a single bulk upload. When a
+        log writer is configured the rows are queued and uploaded in background.
+        Every row records the model version, whether it is a shadow
+        prediction, and the ID and stage durations of the traced request. When
+        a shadow scorer is attached, `data_input` is also handed to it to be
+        scored by the shadow models in background.
 
         Args:
-            data_input (DataFrame): The passenger data used for prediction.
-            prediction (int): The model's predicted outcome.
+            data_input (DataFrame | list[dict]): The passenger data used for
+                prediction, as a DataFrame or as records from `request_record`.
+            prediction (int | list[int]): The model's predicted outcome, one per row.
         """
-        data_to_upload = data_input.copy()
-        data_to_upload["prediction"] = [prediction]
+        predictions = np.atleast_1d(prediction)
+        request_ids, timings = _trace_columns(len(predictions))
+        if isinstance(data_input, DataFrame):
+            data_to_upload = data_input.copy()
+            data_to_upload["prediction"] = predictions
+            data_to_upload["model_version"] = self.model_version
+            data_to_upload["shadow"] = self.shadow
+            data_to_upload["request_id"] = request_ids
+            for column, value in timings.items():
+                data_to_upload[column] = value
+        else:
+            data_to_upload = [
+                dict(
+                    record,
+                    prediction=value,
+                    model_version=self.model_version,
+                    shadow=self.shadow,
+                    request_id=request_id,
+                    **timings,
+                )
+                for record, value, request_id in zip(
+                    data_input, predictions.tolist(), request_ids
+                )
+            ]
+
+        if self.shadow_scorer is not None:
+            self.shadow_scorer.submit(data_input, request_ids)
+
+        if self.log_writer is not None:
+            self.log_writer.submit(data_to_upload)
+            return
         self.db_manager.upload_dataframe_to_postgres(
-            data_to_upload, table_name="titanic"
+            DataFrame(data_to_upload), table_name="titanic"
         )
+
+
+def _trace_columns(rows: int) -> tuple[list, dict]:
+    """Private function to return the trace columns of the logged rows.
+
+    Args:
+        rows (int): Number of logged rows.
+
+    Returns:
+        tuple[list, dict]: The request ID of every row, and the milliseconds of
+            every logged stage, all None when the request is not traced.
+    """
+    trace = current_trace()
+    if trace is None:
+        return [None] * rows, dict.fromkeys(f"{stage}_ms" for stage in LOGGED_STAGES)
+    if isinstance(trace.request_id, list):
+        return trace.request_id, trace.stage_milliseconds()
+    return [trace.request_id] * rows, trace.stage_milliseconds()
@@ -0,0 +1,438 @@
+"""Module with a process-wide registry of the predictors used by the API."""
+
+import logging
+import threading
+from functools import partial
+
+from src.api.app.batch_predictor import BatchPredictor
+from src.api.app.micro_batcher import MicroBatcher
+from src.api.app.model_router import ModelRouter, ModelVariant, parse_routes
+from src.api.app.model_watcher import ModelWatcher
+from src.api.app.prediction_cache import PredictionCache
+from src.api.app.predictor import Predictor, get_model_path
+from src.api.app.shadow_scorer import ShadowScorer
+from src.db.db_manager.postgre_sql_manager import PostgreSQLManager
+from src.db.log_writer import BackgroundLogWriter
+from src.serving_configs import ServingConfigs
+
+logger = logging.getLogger(__name__)
+
+
+class PredictorRegistry:
+    """Hold the predictors shared by every request handled by the API process.
+
+    Every model is unpickled only once, and the database manager is created
+    once and reused by all the predictors. The database manager takes its
+    connections from the shared pool. Predictions are logged
+    through a shared background writer that is drained when the registry is
+    cleared. When micro-batching is enabled, single predictions are dispatched
+    through the MicroBatcher of the model they are routed to.
+
+    Several models can be served at once: each request is routed to one of the
+    `MODEL_ROUTES` in proportion to its weight, and the models listed in
+    `SHADOW_MODEL_PATHS` score a copy of every input in background, their
+    predictions being only logged.
+
+    A new model is loaded and warmed up by `reload` next to the one being
+    served, and then swapped in by replacing the predictors. Requests keep the
+    predictors they obtained, so in-flight requests finish on the old model.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._router = None
+        self._shadow_scorer = None
+        self._log_writer = None
+        self._model_watchers = []
+        self._warmed_up = False
+
+    def load(self) -> None:
+        """Load the models and build the predictors if they are not loaded yet."""
+        with self._lock:
+            if self._router is not None:
+                return
+
+            settings = ServingConfigs.model_registry
+            db_manager = PostgreSQLManager(pooled=True)
+            self._log_writer = self._build_log_writer(db_manager)
+
+            shadow_variants = [
+                self._load_variant(path.strip(), 0.0, db_manager, None, shadow=True)
+                for path in settings["shadow_paths"].split(",")
+                if path.strip()
+            ]
+            self._shadow_scorer = self._build_shadow_scorer(shadow_variants)
+
+            router = ModelRouter(
+                [
+                    self._load_variant(path, weight, db_manager, self._build_cache())
+                    for path, weight in parse_routes(
+                        settings["routes"], get_model_path()
+                    )
+                ]
+            )
+            for variant in router.variants:
+                variant.micro_batcher = self._build_micro_batcher(
+                    variant.batch_predictor
+                )
+            self._model_watchers = self._build_model_watchers(
+                router.variants + shadow_variants
+            )
+            self._router = router
+
+    def warm_up(self, rounds: int = 1) -> None:
+        """Load the models if needed and run synthetic predictions through them.
+
+        The registry is only reported ready once the warm-up is done.
+
+        Args:
+            rounds (int, optional): Number of times each path is exercised.
+                Defaults to 1.
+        """
+        router = self.router
+        shadow_variants = self._shadow_scorer.variants if self._shadow_scorer else []
+        for variant in router.variants + shadow_variants:
+            variant.predictor.warm_up(rounds)
+        self._warmed_up = True
+
+    def readiness(self) -> dict:
+        """Check whether the registry can serve traffic, without loading it.
+
+        Returns:
+            dict: Whether the models are loaded and warmed up, and whether the
+                database answers.
+        """
+        warmed_up = self.is_loaded and self._warmed_up
+        database = warmed_up and self.router.primary.predictor.db_manager.ping()
+        return {"warmed_up": warmed_up, "database": database}
+
+    def reload(self, model_path: str = None) -> bool:
+        """Load the model files again and swap in the ones whose content changed.
+
+        Each model is loaded and warmed up in the calling thread while the
+        current one keeps serving, and its predictors are then replaced at once.
+
+        Args:
+            model_path (str, optional): Reload only the models of this file.
+                Every model is reloaded when not provided.
+
+        Returns:
+            bool: Whether a different model version was swapped in.
+        """
+        if not self.is_loaded:
+            self.load()
+            return True
+
+        reloaded = False
+        with self._reload_lock:
+            for variant in self._router.variants:
+                if model_path is not None and variant.model_path != model_path:
+                    continue
+                new_variant = self._reload_variant(variant)
+                if new_variant is None:
+                    continue
+                with self._lock:
+                    # The queued requests are scored by the new model
+                    new_variant.micro_batcher = variant.micro_batcher
+                    if new_variant.micro_batcher is not None:
+                        new_variant.micro_batcher.batch_predictor = (
+                            new_variant.batch_predictor
+                        )
+                    self._router = self._router.replace(variant, new_variant)
+                reloaded = True
+
+            if self._shadow_scorer is None:
+                return reloaded
+            for variant in self._shadow_scorer.variants:
+                if model_path is not None and variant.model_path != model_path:
+                    continue
+                new_variant = self._reload_variant(variant)
+                if new_variant is None:
+                    continue
+                self._shadow_scorer.variants = [
+                    new_variant if shadow is variant else shadow
+                    for shadow in self._shadow_scorer.variants
+                ]
+                reloaded = True
+
+        return reloaded
+
+    def clear(self) -> None:
+        """Drain the pending logs, close the pooled connections and drop the predictors.
+
+        The next access loads the predictors again.
+        """
+        # Stopped before taking the lock, which a reload in progress may need
+        for model_watcher in self._model_watchers:
+            model_watcher.stop()
+
+        with self._lock:
+            for micro_batcher in self._micro_batchers():
+                micro_batcher.stop()
+            if self._shadow_scorer is not None:
+                self._shadow_scorer.stop()
+            if self._log_writer is not None:
+                self._log_writer.stop()
+            if self._router is not None:
+                PostgreSQLManager.close_pools()
+            self._router = None
+            self._shadow_scorer = None
+            self._log_writer = None
+            self._model_watchers = []
+            self._warmed_up = False
+
+    @property
+    def router(self) -> ModelRouter:
+        """ModelRouter: The router of the served models, loaded on first access."""
+        if self._router is None:
+            self.load()
+        return self._router
+
+    @property
+    def model_version(self) -> str:
+        """str: Version of the primary model, loaded on first access."""
+        return self.router.primary.model_version
+
+    @property
+    def shadow_scorer(self) -> ShadowScorer:
+        """ShadowScorer: The shared shadow scorer, None without shadow models."""
+        return self._shadow_scorer
+
+    @property
+    def log_writer(self) -> BackgroundLogWriter:
+        """BackgroundLogWriter: The shared log writer, None if it is disabled."""
+        return self._log_writer
+
+    @property
+    def micro_batchers(self) -> list[MicroBatcher]:
+        """list[MicroBatcher]: Dispatchers of the routed models, empty if disabled."""
+        if self._router is None:
+            self.load()
+        return self._micro_batchers()
+
+    @property
+    def is_loaded(self) -> bool:
+        """bool: Whether the predictors are already loaded."""
+        return self._router is not None
+
+    @property
+    def predictor(self) -> Predictor:
+        """Predictor: The single predictor of the primary model."""
+        return self.router.primary.predictor
+
+    @property
+    def batch_predictor(self) -> BatchPredictor:
+        """BatchPredictor: The batch predictor of the primary model."""
+        return self.router.primary.batch_predictor
+
+    def _micro_batchers(self) -> list[MicroBatcher]:
+        """Private method to list the dispatchers of the routed models.
+
+        Returns:
+            list[MicroBatcher]: The dispatchers, empty if none is loaded.
+        """
+        if self._router is None:
+            return []
+        return [
+            variant.micro_batcher
+            for variant in self._router.variants
+            if variant.micro_batcher is not None
+        ]
+
+    def _load_variant(
+        self,
+        model_path: str,
+        weight: float,
+        db_manager: PostgreSQLManager,
+        cache: PredictionCache,
+        shadow: bool = False,
+    ) -> ModelVariant:
+        """Load a model file and build its predictors.
+
+        Args:
+            model_path (str): Path of the model file.
+            weight (float): Relative share of the requests routed to the model.
+            db_manager (PostgreSQLManager): Shared database manager.
+            cache (PredictionCache): Cache of the predictions of the model.
+            shadow (bool, optional): Whether the predictions are only logged.
+
+        Returns:
+            ModelVariant: The loaded variant.
+        """
+        predictor = Predictor(
+            db_manager=db_manager,
+            log_writer=self._log_writer,
+            cache=cache,
+            model_path=model_path,
+        )
+        predictor.shadow = shadow
+        predictor.shadow_scorer = None if shadow else self._shadow_scorer
+        return ModelVariant(
+            model_path, weight, predictor, self._build_batch_predictor(predictor)
+        )
+
+    def _reload_variant(self, variant: ModelVariant) -> ModelVariant:
+        """Load the file of a variant again and warm it up if its content changed.
+
+        Args:
+            variant (ModelVariant): The variant being served.
+
+        Returns:
+            ModelVariant: The new variant, or None if the model did not change.
+        """
+        current = variant.predictor
+        new_variant = self._load_variant(
+            variant.model_path,
+            variant.weight,
+            current.db_manager,
+            current.cache,
+            current.shadow,
+        )
+        if new_variant.model_version == variant.model_version:
+            return None
+
+        new_variant.predictor.warm_up()
+        logger.info(
+            f"Model {variant.model_version} replaced by {new_variant.model_version} "
+            f"({variant.model_path})."
+        )
+        return new_variant
+
+    def _build_batch_predictor(self, predictor: Predictor) -> BatchPredictor:
+        """Build a batch predictor sharing the model and the resources of a predictor.
+
+        Args:
+            predictor (Predictor): Predictor whose model, database manager, log
+                writer, cache and shadow settings are reused.
+
+        Returns:
+            BatchPredictor: The batch predictor.
+        """
+        batch_predictor = BatchPredictor(
+            model=predictor.model,
+            db_manager=predictor.db_manager,
+            log_writer=predictor.log_writer,
+            model_version=predictor.model_version,
+            cache=predictor.cache,
+            model_path=predictor.model_path,
+        )
+        batch_predictor.shadow = predictor.shadow
+        batch_predictor.shadow_scorer = predictor.shadow_scorer
+        return batch_predictor
+
+    def _build_log_writer(self, db_manager: PostgreSQLManager) -> BackgroundLogWriter:
+        """Build and start the background log writer if it is enabled.
+
+        Args:
+            db_manager (PostgreSQLManager): Manager used to upload the rows.
+
+        Returns:
+            BackgroundLogWriter: The running writer, or None if it is disabled.
+        """
+        settings = dict(ServingConfigs.log_writer)
+        if not settings.pop("enabled"):
+            return None
+
+        log_writer = BackgroundLogWriter(db_manager, table_name="titanic", **settings)
+        log_writer.start()
+        return log_writer
+
+    def _build_cache(self) -> PredictionCache:
+        """Build the prediction cache of a served model if it is enabled.
+
+        Returns:
+            PredictionCache: The cache, or None if it is disabled.
+        """
+        settings = dict(ServingConfigs.prediction_cache)
+        if not settings.pop("enabled"):
+            return None
+        return PredictionCache(**settings)
+
+    def _build_shadow_scorer(self, variants: list[ModelVariant]) -> ShadowScorer:
+        """Build and start the shadow scorer if there are shadow models.
+
+        Args:
+            variants (list[ModelVariant]): The shadow variants.
+
+        Returns:
+            ShadowScorer: The running scorer, or None without shadow models.
+        """
+        if not variants:
+            return None
+
+        shadow_scorer = ShadowScorer(
+            variants, ServingConfigs.model_registry["shadow_queue_size"]
+        )
+        shadow_scorer.start()
+        return shadow_scorer
+
+    def _build_micro_batcher(self, batch_predictor: BatchPredictor) -> MicroBatcher:
+        """Build and start the micro-batching dispatcher if it is enabled.
+
+        Args:
+            batch_predictor (BatchPredictor): Predictor used to score the batches.
+
+        Returns:
+            MicroBatcher: The running dispatcher, or None if it is disabled.
+        """
+        settings = dict(ServingConfigs.micro_batching)
+        if not settings.pop("enabled"):
+            return None
+
+        micro_batcher = MicroBatcher(batch_predictor, **settings)
+        micro_batcher.start()
+        return micro_batcher
+
+    def _build_model_watchers(self, variants: list[ModelVariant]) -> list:
+        """Build and start a watcher per model file if reloading is enabled.
+
+        Args:
+            variants (list[ModelVariant]): The routed and shadow variants.
+
+        Returns:
+            list[ModelWatcher]: The running watchers, empty if it is disabled.
+        """
+        settings = dict(ServingConfigs.model_reload)
+        if not settings.pop("enabled"):
+            return []
+
+        model_watchers = []
+        for model_path in dict.fromkeys(variant.model_path for variant in variants):
+            model_watcher = ModelWatcher(
+                partial(self.reload, model_path), model_path, **settings
+            )
+            model_watcher.start()
+            model_watchers.append(model_watcher)
+        return model_watchers
+
+
+registry = PredictorRegistry()
+
+
+def get_predictor() -> Predictor:
+    """Dependency returning the single predictor of the model routed to.
+
+    Returns:
+        Predictor: The shared predictor of the chosen model.
+    """
+    return registry.router.choose().predictor
+
+
+def get_variant() -> ModelVariant:
+    """Dependency returning the model variant routed to.
+
+    Returns:
+        ModelVariant: The chosen variant, with its predictors and dispatcher.
+    """
+    return registry.router.choose()
+
+
+def get_batch_predictor() -> BatchPredictor:
+    """Dependency returning the batch predictor of the model routed to.
+
+    Returns:
+        BatchPredictor: The shared batch predictor of the chosen model.
+    """
+    return registry.router.choose().batch_predictor
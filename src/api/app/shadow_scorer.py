@@ -0,0 +1,121 @@
+"""Module with a background scorer running candidate models on live traffic."""
+
+import logging
+import queue
+import threading
+
+from pandas import DataFrame
+
+from src.api.app.tracing import RequestTrace, reset_trace, set_trace
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ShadowScorer:
+    """Score the inputs of the served models with shadow models in background.
+
+    Inputs are queued without blocking the request and scored from a worker
+    thread by the batch predictor of every shadow variant. Their predictions
+    are only logged, flagged as shadow rows. Inputs arriving while the queue is
+    full are dropped.
+
+    Args:
+        variants (list[ModelVariant]): Shadow variants scoring every input.
+        max_queue_size (int, optional): Maximum number of pending inputs.
+            Defaults to 100.
+    """
+
+    def __init__(self, variants: list, max_queue_size: int = 100) -> None:
+        """Initialize the scorer without starting the worker thread.
+
+        Args:
+            variants (list[ModelVariant]): Shadow variants scoring every input.
+            max_queue_size (int, optional): Maximum number of pending inputs.
+        """
+        self.variants = variants
+        self.dropped_inputs = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+
+    @property
+    def queue_depth(self) -> int:
+        """int: Number of inputs waiting to be scored."""
+        return self._queue.qsize()
+
+    @property
+    def is_running(self) -> bool:
+        """bool: Whether the worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the worker thread if it is not running yet."""
+        if self.is_running:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="shadow-scorer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """Score the pending inputs and stop the worker thread.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for the worker.
+        """
+        if not self.is_running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, data_input, request_ids: list = None) -> bool:
+        """Queue an input to be scored by the shadow models.
+
+        Args:
+            data_input (DataFrame | list[dict]): Passengers scored by a served
+                model, as a DataFrame or as records from `request_record`.
+            request_ids (list, optional): ID of the request of every passenger,
+                logged with the shadow predictions.
+
+        Returns:
+            bool: Whether the input was queued, False if it was dropped.
+        """
+        try:
+            self._queue.put_nowait((data_input, request_ids))
+        except queue.Full:
+            self.dropped_inputs += 1
+            return False
+        return True
+
+    def _run(self) -> None:
+        """Worker loop scoring the queued inputs."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            self._process(*item)
+
+    def _process(self, data_input, request_ids: list = None) -> None:
+        """Score an input with every shadow variant.
+
+        Args:
+            data_input (DataFrame | list[dict]): Passengers to score.
+            request_ids (list, optional): ID of the request of every passenger.
+        """
+        df_request = (
+            data_input if isinstance(data_input, DataFrame) else DataFrame(data_input)
+        )
+        for variant in self.variants:
+            # Every shadow model is traced separately, under the served requests
+            token = set_trace(RequestTrace(request_ids))
+            try:
+                variant.batch_predictor.predict_frame(df_request)
+            except Exception as e:
+                logger.error(
+                    f"Error scoring {len(df_request)} rows with the shadow model "
+                    f"{variant.model_version}: {e}"
+                )
+            finally:
+                reset_trace(token)
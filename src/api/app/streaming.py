@@ -0,0 +1,241 @@
+"""Module to score CSV and NDJSON uploads in chunks while they are received."""
+
+import codecs
+import csv
+import json
+import logging
+from typing import AsyncIterator
+
+import pandas as pd
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.api.app.batch_predictor import BatchPredictor
+from src.api.app.features import conform_request_frame
+from src.api.app.metrics import StageTimer
+
+logger = logging.getLogger(__name__)
+
+
+class RecordParser:
+    """Incremental parser turning the chunks of an upload into passenger records.
+
+    Bytes can be fed in chunks of any size: incomplete lines, multi-byte
+    characters split between chunks and quoted CSV fields spanning several lines
+    are kept until the rest of the record arrives.
+
+    Args:
+        csv_format (bool): Whether the upload is CSV with a header line. NDJSON,
+            one JSON object per line, is expected otherwise.
+    """
+
+    def __init__(self, csv_format: bool) -> None:
+        """Initialize the parser.
+
+        Args:
+            csv_format (bool): Whether the upload is CSV with a header line.
+        """
+        self.csv_format = csv_format
+        self.header = None
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+
+    @classmethod
+    def from_content_type(cls, content_type: str) -> "RecordParser":
+        """Build the parser matching the content type of a request.
+
+        Args:
+            content_type (str): Value of the Content-Type header.
+
+        Returns:
+            RecordParser: The parser for the upload.
+
+        Raises:
+            ValueError: If the content type is neither CSV nor NDJSON.
+        """
+        content_type = content_type.split(";")[0].strip().lower()
+        if content_type.endswith("csv"):
+            return cls(csv_format=True)
+        if content_type.endswith(("ndjson", "jsonl", "json-seq", "json")):
+            return cls(csv_format=False)
+        raise ValueError(f"Unsupported content type: {content_type or 'missing'}.")
+
+    def feed(self, data: bytes) -> list[dict]:
+        """Parse the records completed by a new chunk of the upload.
+
+        Args:
+            data (bytes): Next chunk of the upload.
+
+        Returns:
+            list[dict]: The complete records of the chunk, by column name.
+
+        Raises:
+            ValueError: If a record is malformed.
+        """
+        self._buffer += self._decoder.decode(data)
+        end = self._buffer.rfind("\n")
+        if end < 0:
+            return []
+
+        lines, self._buffer = self._buffer[: end + 1], self._buffer[end + 1 :]
+        if self.csv_format and lines.count('"') % 2:
+            # A quoted field continues on the next line
+            self._buffer = lines + self._buffer
+            return []
+        return self._parse(lines)
+
+    def close(self) -> list[dict]:
+        """Parse the records left after the last chunk of the upload.
+
+        Returns:
+            list[dict]: The remaining records, by column name.
+
+        Raises:
+            ValueError: If a record is malformed or truncated.
+        """
+        lines = self._buffer + self._decoder.decode(b"", final=True)
+        self._buffer = ""
+        return self._parse(lines)
+
+    def _parse(self, lines: str) -> list[dict]:
+        """Private method to parse complete lines.
+
+        Args:
+            lines (str): One or more complete records.
+
+        Returns:
+            list[dict]: The records, by column name.
+        """
+        if not self.csv_format:
+            records = [json.loads(line) for line in lines.splitlines() if line.strip()]
+            if not all(isinstance(record, dict) for record in records):
+                raise ValueError("Every NDJSON line must be a JSON object.")
+            return records
+
+        rows = [row for row in csv.reader(lines.splitlines(keepends=True)) if row]
+        if self.header is None and rows:
+            self.header = [column.strip() for column in rows.pop(0)]
+        return [
+            {column: value or None for column, value in zip(self.header, row)}
+            for row in rows
+        ]
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """StreamingResponse that keeps reading the request body while it streams.
+
+    Starlette's StreamingResponse listens for the client disconnection by
+    reading `receive`, which would steal the body chunks still being uploaded.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Stream the response without listening to `receive`.
+
+        Args:
+            scope (Scope): ASGI connection scope.
+            receive (Receive): ASGI receive channel, left to the request.
+            send (Send): ASGI send channel.
+        """
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def records_to_frame(records: list[dict]) -> pd.DataFrame:
+    """Build the DataFrame of a chunk of passenger records.
+
+    Args:
+        records (list[dict]): Passenger records by column name.
+
+    Returns:
+        pd.DataFrame: The records with the `REQUEST_COLUMNS`.
+    """
+    return conform_request_frame(pd.DataFrame.from_records(records))
+
+
+def score_chunk(batch_predictor: BatchPredictor, records: list[dict]) -> bytes:
+    """Score a chunk of records and serialize the predictions as NDJSON.
+
+    Args:
+        batch_predictor (BatchPredictor): Predictor used to score the chunk.
+        records (list[dict]): Passenger records by column name.
+
+    Returns:
+        bytes: One line per passenger with its PassengerId and prediction, or a
+            single error line if the chunk could not be scored.
+    """
+    timer = StageTimer()
+    try:
+        frame = records_to_frame(records)
+        timer.lap("transform")
+        predictions = batch_predictor.predict_frame(frame)
+    except Exception as e:
+        logger.error(f"Error scoring a chunk of {len(records)} rows: {e}")
+        return _error_line(e, rows=len(records))
+
+    passenger_ids = frame["PassengerId"].astype(object)
+    passenger_ids = passenger_ids.where(passenger_ids.notna(), None).tolist()
+    return "".join(
+        json.dumps({"PassengerId": passenger_id, "Survived": int(prediction)}) + "\n"
+        for passenger_id, prediction in zip(passenger_ids, predictions)
+    ).encode()
+
+
+async def stream_predictions(
+    body: AsyncIterator[bytes],
+    parser: RecordParser,
+    batch_predictor: BatchPredictor,
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    """Score an upload chunk by chunk while it is being received.
+
+    At most `chunk_size` records plus one received block are held in memory,
+    and each chunk is scored and sent before more of the upload is read.
+
+    Args:
+        body (AsyncIterator[bytes]): The request body stream.
+        parser (RecordParser): Parser matching the upload format.
+        batch_predictor (BatchPredictor): Predictor used to score every chunk.
+        chunk_size (int): Number of records scored together.
+
+    Yields:
+        bytes: NDJSON lines with the predictions of every chunk.
+    """
+    records = []
+    try:
+        async for data in body:
+            timer = StageTimer()
+            records.extend(parser.feed(data))
+            timer.lap("parse")
+            while len(records) >= chunk_size:
+                yield await run_in_threadpool(
+                    score_chunk, batch_predictor, records[:chunk_size]
+                )
+                del records[:chunk_size]
+        records.extend(parser.close())
+    except (ValueError, csv.Error) as e:
+        # The rest of the upload cannot be split into records reliably
+        yield _error_line(e)
+        return
+
+    for start in range(0, len(records), chunk_size):
+        yield await run_in_threadpool(
+            score_chunk, batch_predictor, records[start : start + chunk_size]
+        )
+
+
+def _error_line(error: Exception, rows: int = None) -> bytes:
+    """Private function to serialize an error as an NDJSON line.
+
+    Args:
+        error (Exception): The error to report.
+        rows (int, optional): Number of records affected by the error.
+
+    Returns:
+        bytes: The error line.
+    """
+    content = {"error": str(error)}
+    if rows is not None:
+        content["rows"] = rows
+    return (json.dumps(content) + "\n").encode()
@@ -0,0 +1,174 @@
+"""Module with the request IDs and stage timings traced for every API call."""
+
+import uuid
+from contextvars import ContextVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_HEADER = "X-Request-ID"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# Stages whose duration is stored next to every logged row, in milliseconds
+LOGGED_STAGES = ("transform", "preprocess", "predict")
+
+# Longest request ID accepted from the caller
+MAX_REQUEST_ID_LENGTH = 128
+
+_current_trace = ContextVar("current_trace", default=None)
+
+
+class RequestTrace:
+    """ID and accumulated stage durations of the request being served.
+
+    Args:
+        request_id (str | list): ID of the request, or one ID per row when a
+            batch gathers several requests.
+    """
+
+    __slots__ = ("request_id", "timings")
+
+    def __init__(self, request_id) -> None:
+        """Initialize a trace without timings.
+
+        Args:
+            request_id (str | list): ID of the request, or one ID per row.
+        """
+        self.request_id = request_id
+        self.timings = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage, summed when a stage runs several times.
+
+        Args:
+            stage (str): Name of the stage.
+            seconds (float): Duration of the stage.
+        """
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def stage_milliseconds(self) -> dict:
+        """Return the durations stored with the logged rows.
+
+        Returns:
+            dict: Milliseconds of every stage of `LOGGED_STAGES` as
+                `<stage>_ms`, None for the stages that did not run.
+        """
+        return {
+            f"{stage}_ms": (
+                self.timings[stage] * 1000 if stage in self.timings else None
+            )
+            for stage in LOGGED_STAGES
+        }
+
+    def server_timing(self) -> str:
+        """Format the durations as a `Server-Timing` header value.
+
+        Returns:
+            str: Every stage with its duration in milliseconds.
+        """
+        return ", ".join(
+            f"{stage};dur={seconds * 1000:.3f}"
+            for stage, seconds in self.timings.items()
+        )
+
+
+def current_trace() -> RequestTrace:
+    """Return the trace of the request being served.
+
+    Returns:
+        RequestTrace: The trace, or None outside of a traced request.
+    """
+    return _current_trace.get()
+
+
+def set_trace(trace: RequestTrace):
+    """Make a trace the current one, e.g. in a background worker.
+
+    Args:
+        trace (RequestTrace): The trace, or None to stop tracing.
+
+    Returns:
+        Token: Token to restore the previous trace with `reset_trace`.
+    """
+    return _current_trace.set(trace)
+
+
+def reset_trace(token) -> None:
+    """Restore the trace that was current before `set_trace`.
+
+    Args:
+        token (Token): Token returned by `set_trace`.
+    """
+    _current_trace.reset(token)
+
+
+class TracingMiddleware:
+    """Trace every HTTP request and report its stage durations.
+
+    The request ID is taken from the `X-Request-ID` header of the request, or
+    generated when it is missing or invalid. It is returned in the same header,
+    next to a `Server-Timing` header with the durations of the stages completed
+    before the response starts. Streamed responses start before any chunk is
+    scored, so they only report the request ID.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a request with its trace as the current one.
+
+        Args:
+            scope (Scope): The ASGI connection scope.
+            receive (Receive): The ASGI receive channel.
+            send (Send): The ASGI send channel.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(_request_id(scope))
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(REQUEST_ID_HEADER, trace.request_id)
+                if trace.timings:
+                    headers.append(SERVER_TIMING_HEADER, trace.server_timing())
+            await send(message)
+
+        token = set_trace(trace)
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            reset_trace(token)
+
+
+def _request_id(scope: Scope) -> str:
+    """Private function to read the request ID sent by the caller.
+
+    Args:
+        scope (Scope): The ASGI connection scope.
+
+    Returns:
+        str: The ID of the caller if it is printable and short enough,
+            otherwise a new random ID.
+    """
+    header = REQUEST_ID_HEADER.lower().encode()
+    for name, value in scope["headers"]:
+        if name == header:
+            request_id = value.decode("latin-1")
+            if 0 < len(request_id) <= MAX_REQUEST_ID_LENGTH and (
+                request_id.isprintable()
+            ):
+                return request_id
+            break
+    return uuid.uuid4().hex
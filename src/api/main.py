@@ -1,45 +1,420 @@
 """Module with API endpoints for Titanic Predictions."""
 
-from fastapi import FastAPI
+import queue
+from contextlib import asynccontextmanager, nullcontext
 
+import numpy as np
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from pandas import DataFrame
+from starlette.concurrency import run_in_threadpool
+
+from src.api.app.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+    parse_limits,
+)
 from src.api.app.batch_predictor import BatchPredictor
+from src.api.app.binary_formats import read_frame, resolve_media_type, write_frame
+from src.api.app.metrics import CONTENT_TYPE, StageTimer, render_metrics
+from src.api.app.model_router import ModelVariant
 from src.api.app.models import (
     BatchPredictionRequest,
     BatchPredictionResponse,
+    BatchProbabilityResponse,
+    ColumnarBatchPredictionRequest,
+    ModelReloadResponse,
     PredictionRequest,
     PredictionResponse,
+    ProbabilityResponse,
 )
 from src.api.app.predictor import Predictor
+from src.api.app.registry import (
+    get_batch_predictor,
+    get_predictor,
+    get_variant,
+    registry,
+)
+from src.api.app.streaming import (
+    BodyStreamingResponse,
+    RecordParser,
+    stream_predictions,
+)
+from src.api.app.tracing import TracingMiddleware
+from src.serving_configs import ServingConfigs
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load and warm up the models when the API starts and release them on shutdown.
+
+    Args:
+        app (FastAPI): The application being started.
+    """
+    registry.load()
+    registry.warm_up(ServingConfigs.warm_up["rounds"])
+    yield
+    registry.clear()
+
 
 app = FastAPI(
     docs_url="/",
     title="Titanic Predictions",
     description="Inference endpoint for a model trained on the Titanic dataset.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Limits of the prediction requests and batch rows in flight, None if disabled
+admission = (
+    AdmissionController(
+        max_concurrency=ServingConfigs.admission["max_concurrency"],
+        max_queue_size=ServingConfigs.admission["max_queue_size"],
+        queue_timeout=ServingConfigs.admission["queue_timeout"],
+        retry_after=ServingConfigs.admission["retry_after"],
+        max_rows_in_flight=ServingConfigs.admission["max_rows_in_flight"],
+        limits=parse_limits(ServingConfigs.admission["limits"]),
+    )
+    if ServingConfigs.admission["enabled"]
+    else None
+)
+if admission is not None:
+    app.add_middleware(AdmissionMiddleware, controller=admission)
+# Added last to be the outermost middleware, so rejections are traced too
+app.add_middleware(TracingMiddleware)
+
+# Header with the model version of the responses that are not JSON
+MODEL_VERSION_HEADER = "X-Model-Version"
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected) -> Response:
+    """Answer a request refused by the admission control.
+
+    Args:
+        request (Request): The refused request.
+        exc (AdmissionRejected): The reason of the rejection.
+
+    Returns:
+        Response: The error with its `Retry-After` header.
+    """
+    return exc.to_response()
+
+
+def reserve_rows(rows: int):
+    """Hold rows of the batch budget while a batch is scored.
+
+    Args:
+        rows (int): Rows of the batch.
+
+    Returns:
+        ContextManager: Context holding the rows, a no-op when the admission
+            control is disabled.
+
+    Raises:
+        AdmissionRejected: If the batch does not fit in the budget.
+    """
+    if admission is None:
+        return nullcontext()
+    return admission.rows.reserve(rows)
+
+
+@app.get("/healthz")
+def healthz() -> dict:
+    """Liveness endpoint, answering as long as the process serves requests.
+
+    Returns:
+        dict: The status of the process.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readyz(response: Response) -> dict:
+    """Readiness endpoint, answering 503 until the replica can serve traffic.
+
+    The replica is ready once the models are loaded and warmed up and the
+    database answers.
+
+    Args:
+        response (Response): The response, whose status code is set.
+
+    Returns:
+        dict: The status and the result of every check.
+    """
+    checks = registry.readiness()
+    ready = all(checks.values())
+    if not ready:
+        response.status_code = 503
+    return {"status": "ready" if ready else "not ready", **checks}
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    """Endpoint exposing the latency and load metrics in the Prometheus format.
+
+    Returns:
+        Response: Stage latency and batch size histograms, admission control
+            load and rejections, cache statistics and queue depths of the
+            background workers.
+    """
+    return Response(
+        content=render_metrics(registry, admission), media_type=CONTENT_TYPE
+    )
+
 
 @app.post("/v1/prediction")
-def predict(request: PredictionRequest) -> PredictionResponse:
+def predict(
+    request: PredictionRequest,
+    variant: ModelVariant = Depends(get_variant),
+) -> PredictionResponse:
     """Endpoint for predicting the survival of a single Titanic passenger.
 
+    When micro-batching is enabled the request is scored together with the
+    other requests routed to the same model in the same window.
+
     Args:
         request (PredictionRequest): Data for a single prediction request.
+        variant (ModelVariant): The model routed to, chosen once per request.
 
     Returns:
         PredictionResponse: A response object with the survival prediction.
     """
-    return PredictionResponse(Survived=Predictor()(request))
+    predictor, micro_batcher = variant.predictor, variant.micro_batcher
+    if micro_batcher is None:
+        return PredictionResponse(
+            Survived=predictor(request), ModelVersion=predictor.model_version
+        )
+
+    try:
+        return PredictionResponse(
+            Survived=micro_batcher(request),
+            ModelVersion=micro_batcher.batch_predictor.model_version,
+        )
+    except queue.Full:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many pending predictions.",
+            headers={"Retry-After": str(ServingConfigs.admission["retry_after"])},
+        )
+    except TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Timed out waiting for the prediction.",
+            headers={"Retry-After": str(ServingConfigs.admission["retry_after"])},
+        )
+
+
+@app.post("/v1/prediction/proba")
+def predict_proba(
+    request: PredictionRequest,
+    threshold: float = Query(None, ge=0, le=1),
+    predictor: Predictor = Depends(get_predictor),
+) -> ProbabilityResponse:
+    """Endpoint for the survival probability of a single Titanic passenger.
+
+    Args:
+        request (PredictionRequest): Data for a single prediction request.
+        threshold (float, optional): Minimum survival probability to predict
+            survival. When not provided the most probable class is predicted.
+        predictor (Predictor): The process-wide predictor.
+
+    Returns:
+        ProbabilityResponse: The survival probability and the predicted outcome.
+    """
+    probability, prediction = predictor.get_probability(request, threshold)
+    return ProbabilityResponse(
+        SurvivalProbability=probability,
+        Survived=prediction,
+        ModelVersion=predictor.model_version,
+    )
 
 
 @app.post("/v1/batch_prediction")
-def batch_predict(request: BatchPredictionRequest) -> BatchPredictionResponse:
+def batch_predict(
+    request: BatchPredictionRequest,
+    batch_predictor: BatchPredictor = Depends(get_batch_predictor),
+) -> BatchPredictionResponse:
     """Endpoint for predicting the survival of multiple Titanic passengers.
 
     Args:
         request (BatchPredictionRequest): Data for a batch prediction request.
+        batch_predictor (BatchPredictor): The process-wide batch predictor.
 
     Returns:
         BatchPredictionResponse: A response object containing survival predictions.
     """
-    return BatchPredictionResponse(Survived=BatchPredictor()(request))
+    with reserve_rows(len(request.batch_data)):
+        predictions = batch_predictor(request)
+    return BatchPredictionResponse(
+        Survived=predictions, ModelVersion=batch_predictor.model_version
+    )
+
+
+@app.post("/v1/batch_prediction/proba")
+def batch_predict_proba(
+    request: BatchPredictionRequest,
+    threshold: float = Query(None, ge=0, le=1),
+    batch_predictor: BatchPredictor = Depends(get_batch_predictor),
+) -> BatchProbabilityResponse:
+    """Endpoint for the survival probabilities of multiple Titanic passengers.
+
+    Args:
+        request (BatchPredictionRequest): Data for a batch prediction request.
+        threshold (float, optional): Minimum survival probability to predict
+            survival. When not provided the most probable class is predicted.
+        batch_predictor (BatchPredictor): The process-wide batch predictor.
+
+    Returns:
+        BatchProbabilityResponse: The survival probabilities and predicted outcomes.
+    """
+    with reserve_rows(len(request.batch_data)):
+        probabilities, predictions = batch_predictor.predict_proba_many(
+            request.batch_data, threshold
+        )
+    return BatchProbabilityResponse(
+        SurvivalProbability=probabilities,
+        Survived=predictions,
+        ModelVersion=batch_predictor.model_version,
+    )
+
+
+@app.post("/v1/batch_prediction/columnar")
+def columnar_batch_predict(
+    request: ColumnarBatchPredictionRequest,
+    batch_predictor: BatchPredictor = Depends(get_batch_predictor),
+) -> BatchPredictionResponse:
+    """Endpoint for predicting the survival of passengers given column by column.
+
+    Args:
+        request (ColumnarBatchPredictionRequest): One list of values per field.
+        batch_predictor (BatchPredictor): The process-wide batch predictor.
+
+    Returns:
+        BatchPredictionResponse: A response object containing survival predictions.
+    """
+    timer = StageTimer()
+    df_request = request.to_dataframe()
+    timer.lap("transform")
+    with reserve_rows(len(df_request)):
+        predictions = batch_predictor.predict_frame(df_request)
+    return BatchPredictionResponse(
+        Survived=predictions, ModelVersion=batch_predictor.model_version
+    )
+
+
+@app.post("/v1/batch_prediction/binary")
+async def binary_batch_predict(
+    request: Request,
+    batch_predictor: BatchPredictor = Depends(get_batch_predictor),
+) -> Response:
+    """Endpoint for predicting the survival of passengers sent in a binary format.
+
+    The body is an Arrow IPC stream (`application/vnd.apache.arrow.stream`), a
+    Parquet file (`application/vnd.apache.parquet`) or a structured NPY array
+    (`application/x-npy`) with the `PredictionRequest` columns. The response
+    has the PassengerId and Survived columns in the same format, unless the
+    Accept header asks for another supported format or for JSON. Decoding,
+    scoring and encoding run in the threadpool, off the event loop.
+
+    Args:
+        request (Request): The request with the encoded batch as body.
+        batch_predictor (BatchPredictor): The process-wide batch predictor.
+
+    Returns:
+        Response: The encoded predictions, or a BatchPredictionResponse as JSON.
+    """
+    media_type = resolve_media_type(request.headers.get("content-type", ""))
+    if media_type is None:
+        raise HTTPException(
+            status_code=415, detail="Expected an Arrow, Parquet or NPY batch."
+        )
+
+    content = await request.body()
+    timer = StageTimer()
+    try:
+        df_request = await run_in_threadpool(read_frame, content, media_type)
+    except (ValueError, OSError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid batch: {e}")
+    timer.lap("parse")
+
+    with reserve_rows(len(df_request)):
+        predictions = await run_in_threadpool(batch_predictor.predict_frame, df_request)
+
+    accept = request.headers.get("accept", "")
+    if accept.startswith("application/json"):
+        return BatchPredictionResponse(
+            Survived=predictions, ModelVersion=batch_predictor.model_version
+        )
+
+    response_type = resolve_media_type(accept) or media_type
+    content = await run_in_threadpool(
+        write_frame,
+        DataFrame(
+            {
+                "PassengerId": df_request["PassengerId"].to_numpy(),
+                "Survived": np.asarray(predictions, dtype=np.int64),
+            }
+        ),
+        response_type,
+    )
+    return Response(
+        content=content,
+        media_type=response_type,
+        headers={MODEL_VERSION_HEADER: str(batch_predictor.model_version)},
+    )
+
+
+@app.post("/v1/batch_prediction/stream")
+async def stream_batch_predict(
+    request: Request,
+    batch_predictor: BatchPredictor = Depends(get_batch_predictor),
+) -> BodyStreamingResponse:
+    """Endpoint for predicting the survival of passengers streamed as CSV or NDJSON.
+
+    The upload uses the columns of `data/api-test.csv`, as CSV with a header
+    (`Content-Type: text/csv`) or one JSON object per line
+    (`Content-Type: application/x-ndjson`). It is scored in chunks while it is
+    received and every chunk is answered with one NDJSON line per passenger.
+
+    Args:
+        request (Request): The request with the upload as body.
+        batch_predictor (BatchPredictor): The process-wide batch predictor.
+
+    Returns:
+        BodyStreamingResponse: NDJSON stream with the PassengerId and Survived
+            prediction of every passenger.
+    """
+    try:
+        parser = RecordParser.from_content_type(request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    return BodyStreamingResponse(
+        stream_predictions(
+            request.stream(),
+            parser,
+            batch_predictor,
+            ServingConfigs.streaming["chunk_size"],
+        ),
+        media_type="application/x-ndjson",
+        headers={MODEL_VERSION_HEADER: str(batch_predictor.model_version)},
+    )
+
+
+@app.post("/v1/model/reload")
+def reload_model() -> ModelReloadResponse:
+    """Endpoint for loading the model file again and serving it if it changed.
+
+    The new model is loaded and warmed up while the current one keeps serving
+    requests, and is then swapped in atomically.
+
+    Returns:
+        ModelReloadResponse: Whether the model changed and the version served.
+    """
+    try:
+        reloaded = registry.reload()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reloading the model: {e}")
+
+    return ModelReloadResponse(Reloaded=reloaded, ModelVersion=registry.model_version)
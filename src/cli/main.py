@@ -11,6 +11,8 @@ import src.ml_core.train as train_model
 import src.ml_core.validation as validation_model
 from src.configs import Configs
 from src.db.db_manager.postgre_sql_manager import PostgreSQLManager
+from src.ml_pipelines.compiled_scorer import export_compiled_scorer
+from src.ml_pipelines.training_cache import TrainingCache
 from src.utils.run_make import run_makefile
 
 app = typer.Typer()
@@ -46,18 +48,26 @@ def train(
         "-th",
         help="Accuracy threshold for the model to be registered (between 0 and 1))",
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Fit the preparation steps again instead of reusing the training cache",
+        show_default=False,
+    ),
 ):
     """Train the specified machine learning model(s).
 
     Args:
         model (Optional[List[ModelType]]): List of models to train.
         threshold (float): Accuracy threshold for model registration.
+        no_cache (bool): Whether to bypass the training cache.
     """
+    options = {"use_cache": False} if no_cache else {}
     # If no threshold is provided, train without it
     if threshold is None:
-        train_model.train([mod.value for mod in model])
+        train_model.train([mod.value for mod in model], **options)
     elif 0 <= threshold <= 1:
-        train_model.train([mod.value for mod in model], threshold)
+        train_model.train([mod.value for mod in model], threshold, **options)
     else:
         typer.echo("Invalid input. Please enter a float number between 0 and 1.")
         raise typer.Abort()
@@ -111,6 +121,61 @@ def test(
         run_makefile("test")
 
 
+@app.command()
+def cache(
+    clear: bool = typer.Option(
+        False, "--clear", help="Remove every cached entry", show_default=False
+    ),
+    info: bool = typer.Option(
+        False, "--info", help="Show the size of the cache", show_default=False
+    ),
+):
+    """Inspect or clear the cache of the fitted preparation steps.
+
+    Args:
+        clear (bool): Whether to remove every cached entry.
+        info (bool): Whether to show the location, entries and size of the cache.
+    """
+    settings = Configs.training["cache"]
+    training_cache = TrainingCache(settings["location"], settings["bytes_limit"])
+
+    if clear:
+        training_cache.clear()
+        typer.echo(f"Training cache '{training_cache.location}' cleared.")
+
+    if info or not clear:
+        stats = training_cache.info()
+        typer.echo(f"Location: {stats['location']}")
+        typer.echo(f"Entries: {stats['entries']}")
+        typer.echo(f"Size: {stats['size_bytes'] / 2**20:.1f} MiB")
+
+
+@app.command("export-scorer")
+def export_scorer(
+    model_path: str = typer.Option(
+        "models/best_model.pkl", help="The path of the trained pipeline"
+    ),
+    output: str = typer.Option(
+        "models/best_model_compiled.pkl", help="The path of the compiled scorer"
+    ),
+):
+    """Compile the trained pipeline into an inference-only scorer.
+
+    Args:
+        model_path (str): The path of the trained pipeline.
+        output (str): The path where the compiled scorer is saved.
+    """
+    if not os.path.exists(model_path):
+        typer.echo(f"Error: File '{model_path}' does not exist.")
+        raise typer.Exit()
+
+    try:
+        export_compiled_scorer(model_path, output)
+        typer.echo(f"Compiled scorer saved to '{output}'.")
+    except ValueError as e:
+        typer.echo(f"Error compiling the model: {e}")
+
+
 @app.command("run-sql")
 def run_sql_file(sql_file: str = typer.Option(..., help="The path of the SQL file")):
     """Run the SQL file against the PostgreSQL database.
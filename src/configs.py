@@ -1,20 +1,75 @@
 """Module with configs of models to use."""
 
+import os
+
 import numpy as np
 from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
 from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.svm import SVC
 
+from src.ml_pipelines.search_strategies import TimeBudgetHalvingSearchCV
+
 
 class Configs:
     """Class to store all the configurations of the project.
 
     Attributes:
         search_tecnique (dict): Dictionary with the search technique to use
-        models (list): List of dictionaries with the models to use
+        models (list): List of dictionaries with the models to use, each one
+            can set its own search technique under `search`
+        training (dict): Dictionary with the settings of a training run
+        feature_selection (dict): Dictionary with the settings of the feature
+            selection by permutation importance
     """
 
+    training = {
+        # Fit the preprocessing and feature selection once per run and share
+        # the transformed matrix with the search of every model
+        "share_preparation": True,
+        # On-disk cache of the fitted preparation, keyed by the training data
+        # and the parameters of the steps, evicting the least recently used
+        # entries over the size limit
+        "cache": {
+            # TRAINING_CACHE_ENABLED
+            "enabled": os.getenv("TRAINING_CACHE_ENABLED", "true").lower() == "true",
+            # TRAINING_CACHE_DIR
+            "location": os.getenv("TRAINING_CACHE_DIR", ".cache/training"),
+            # TRAINING_CACHE_SIZE
+            "bytes_limit": os.getenv("TRAINING_CACHE_SIZE", "1G"),
+        },
+        # Fit the models concurrently in worker processes, splitting the cores
+        # between the models and the search of each one
+        "scheduler": {
+            # TRAINING_SCHEDULER_ENABLED
+            "enabled": os.getenv("TRAINING_SCHEDULER_ENABLED", "true").lower()
+            == "true",
+            # TRAINING_CORES, 0 for every core of the machine
+            "cores": int(os.getenv("TRAINING_CORES", "0")) or None,
+            # TRAINING_MAX_WORKERS, 0 for one worker per model
+            "max_workers": int(os.getenv("TRAINING_MAX_WORKERS", "0")) or None,
+        },
+        # HALVING_SEARCH_MODELS, names of the models tuned with `halving_search`
+        # instead of their own search, e.g. random_forest,gradient_boosting
+        "halving_search_models": [
+            name.strip()
+            for name in os.getenv("HALVING_SEARCH_MODELS", "").split(",")
+            if name.strip()
+        ],
+    }
+
+    feature_selection = {
+        # Times each feature is permuted
+        "n_repeats": 10,
+        # Cores fitting the random forest and permuting the features
+        "n_jobs": -1,
+        # Rows drawn to select the features, bounding its cost on large
+        # training sets
+        "max_samples": 10_000,
+        # Refit a model on the selected features to print its accuracy
+        "validate_selection": False,
+    }
+
     search_tecnique = {
         "technique": RandomizedSearchCV,
         "params": {"n_iter": 15, "cv": 5, "verbose": 0, "n_jobs": -1},
@@ -29,6 +84,27 @@ class Configs:
     #     }
     # }
 
+    # Successive halving using the number of trees as the resource: 27
+    # candidates start with 10 trees and the best third of each round gets 3
+    # times more, up to 270 trees for the last one. No new round starts after
+    # `time_budget` seconds. Only used by the models listed in
+    # `training["halving_search_models"]`, without `n_estimators` in their grid.
+    halving_search = {
+        "technique": TimeBudgetHalvingSearchCV,
+        "params": {
+            "resource": "n_estimators",
+            "min_resources": 10,
+            "max_resources": 300,
+            "n_candidates": 27,
+            "factor": 3,
+            "time_budget": 300,
+            "cv": 5,
+            "verbose": 0,
+            "n_jobs": -1,
+            "random_state": 42,
+        },
+    }
+
     models = [
         {
             "name": "random_forest",
@@ -0,0 +1,174 @@
+"""Module with a thread-safe pool of database connections."""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """Thread-safe pool that keeps database connections open between checkouts.
+
+    Idle connections are reused in LIFO order so the warmest one is handed out
+    first. A connection idle for longer than `health_check_interval` seconds is
+    pinged before being returned, and broken connections are replaced.
+
+    Args:
+        connect (Callable): Function returning a new DB-API connection.
+        max_connections (int, optional): Maximum number of connections checked
+            out at the same time. Defaults to 10.
+        timeout (float, optional): Seconds to wait for a free connection before
+            raising a PoolError. Defaults to 30.0.
+        health_check_interval (float, optional): Idle seconds after which a
+            connection is pinged before reuse. Defaults to 30.0.
+    """
+
+    def __init__(
+        self,
+        connect: Callable,
+        max_connections: int = 10,
+        timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+    ) -> None:
+        """Initialize the pool without opening any connection.
+
+        Args:
+            connect (Callable): Function returning a new DB-API connection.
+            max_connections (int, optional): Maximum connections checked out.
+            timeout (float, optional): Seconds to wait for a free connection.
+            health_check_interval (float, optional): Idle seconds before a ping.
+        """
+        self._connect = connect
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._idle = []
+        self.in_use = 0
+
+    @property
+    def idle(self) -> int:
+        """int: Number of open connections waiting to be reused."""
+        return len(self._idle)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a `with` block.
+
+        The transaction is committed when the block succeeds and rolled back
+        when it raises. The connection goes back to the pool in both cases.
+
+        Yields:
+            connection: A healthy DB-API connection.
+        """
+        connection = self.getconn()
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            self.putconn(connection)
+
+    def getconn(self):
+        """Take a healthy connection from the pool, opening one if none is idle.
+
+        Returns:
+            connection: A DB-API connection that must be given back with `putconn`.
+
+        Raises:
+            PoolError: If no connection is released within `timeout` seconds.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            from psycopg2.pool import PoolError
+
+            raise PoolError("connection pool exhausted")
+
+        try:
+            while True:
+                with self._lock:
+                    idle = self._idle.pop() if self._idle else None
+
+                if idle is None:
+                    connection = self._connect()
+                    break
+
+                connection, last_used = idle
+                if self._is_healthy(connection, last_used):
+                    break
+                self._discard(connection)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.in_use += 1
+        return connection
+
+    def putconn(self, connection) -> None:
+        """Give a connection back to the pool.
+
+        Any open transaction is rolled back, and connections that are closed or
+        fail to roll back are discarded.
+
+        Args:
+            connection: Connection previously returned by `getconn`.
+        """
+        try:
+            if not connection.closed:
+                connection.rollback()
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+        except Exception as e:
+            logger.warning(f"Discarding broken connection: {e}")
+            self._discard(connection)
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+
+    def closeall(self) -> None:
+        """Close every idle connection kept by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def _is_healthy(self, connection, last_used: float) -> bool:
+        """Private method to check that an idle connection can still be used.
+
+        Args:
+            connection: Connection taken from the idle list.
+            last_used (float): Monotonic time when it was given back.
+
+        Returns:
+            bool: True if the connection is usable.
+        """
+        if connection.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Connection failed the health check: {e}")
+            return False
+
+    def _discard(self, connection) -> None:
+        """Private method to close a connection ignoring errors.
+
+        Args:
+            connection: Connection to close.
+        """
+        try:
+            connection.close()
+        except Exception:
+            pass
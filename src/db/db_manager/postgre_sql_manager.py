@@ -2,36 +2,56 @@
 
 import logging
 import os
+import threading
+from contextlib import contextmanager
+from io import StringIO
 
 import pandas as pd
-import psycopg2
-from dotenv import load_dotenv
 
 from src.db.db_manager.abstract import InterfaceDatabaseManager
+from src.db.db_manager.connection_pool import ConnectionPool
+from src.db.tables import TABLE_COLUMN_TYPES
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Marker of the missing values in the CSV streamed with COPY
+COPY_NULL = r"\N"
+
 
 class PostgreSQLManager(InterfaceDatabaseManager):
     """PostgreSQL-specific implementation of the DatabaseManager.
 
     This class handles connecting to a PostgreSQL database, executing queries,
     fetching results, and converting query results to a pandas DataFrame.
+
+    In pooled mode connections are taken from a process-wide pool shared by every
+    manager pointing to the same database, so they stay open between operations.
     """
 
-    def __init__(self):
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, pooled: bool = None):
         """Load the necessary PostgreSQL connection credentials from the .env file.
 
+        Args:
+            pooled (bool, optional): Whether to use the shared connection pool.
+                Defaults to the `POSTGRES_POOL_ENABLED` environment variable.
+
         Attributes:
             host (str): The host address of the PostgreSQL server.
             dbname (str): The name of the PostgreSQL database to connect to.
             user (str): The PostgreSQL username.
             password (str): The PostgreSQL user's password.
             port (str): The PostgreSQL server port, defaulting to 5432.
+            pool_size (int): Maximum connections of the pool, defaulting to 10.
+            pool_timeout (float): Seconds to wait for a pooled connection.
         """
         # Load environment variables from the .env file
+        from dotenv import load_dotenv
+
         load_dotenv()
 
         # Get the PostgreSQL credentials from environment variables
@@ -41,38 +61,127 @@ class PostgreSQLManager(InterfaceDatabaseManager):
         self.password = os.getenv("POSTGRES_PASSWORD")
         self.port = os.getenv("POSTGRES_PORT", "5432")  # Default port is 5432
 
+        # Connection pool settings
+        if pooled is None:
+            pooled = os.getenv("POSTGRES_POOL_ENABLED", "false").lower() == "true"
+        self.pooled = pooled
+        self.pool_size = int(os.getenv("POSTGRES_POOL_SIZE", "10"))
+        self.pool_timeout = float(os.getenv("POSTGRES_POOL_TIMEOUT", "30"))
+
         self.connection = None
         self.cursor = None
 
     def connect(self):
         """Establish a connection to the PostgreSQL database."""
         try:
-            self.connection = psycopg2.connect(
-                host=self.host,
-                dbname=self.dbname,
-                user=self.user,
-                password=self.password,
-                port=self.port,
-            )
+            if self.pooled:
+                self.connection = self.get_pool().getconn()
+            else:
+                self.connection = self._new_connection()
             self.cursor = self.connection.cursor()
             logger.info("Connected to PostgreSQL database.")
         except Exception as e:
             logger.error(f"Error connecting to PostgreSQL: {e}")
             raise
 
-    def execute_query(self, query, params=None):
+    def get_pool(self) -> ConnectionPool:
+        """Return the process-wide pool for this database, creating it if needed.
+
+        Returns:
+            ConnectionPool: The pool shared by every manager using this database.
+        """
+        key = (self.host, self.port, self.dbname, self.user)
+        with self._pools_lock:
+            if key not in self._pools:
+                self._pools[key] = ConnectionPool(
+                    self._new_connection,
+                    max_connections=self.pool_size,
+                    timeout=self.pool_timeout,
+                )
+            return self._pools[key]
+
+    @classmethod
+    def close_pools(cls):
+        """Close the idle connections of every pool and forget the pools."""
+        with cls._pools_lock:
+            pools, cls._pools = cls._pools, {}
+        for pool in pools.values():
+            pool.closeall()
+
+    @contextmanager
+    def checkout(self):
+        """Provide a connection for the duration of a `with` block.
+
+        The transaction is committed when the block succeeds and rolled back when
+        it raises. In pooled mode the connection is given back to the pool,
+        otherwise it is closed.
+
+        Yields:
+            connection: An open psycopg2 connection.
+        """
+        if self.pooled:
+            with self.get_pool().connection() as connection:
+                yield connection
+            return
+
+        connection = self._new_connection()
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def _new_connection(self):
+        """Private method to open a new connection with the loaded credentials.
+
+        Returns:
+            connection: A new psycopg2 connection.
+        """
+        # Imported on the first connection to keep the API import light
+        import psycopg2
+
+        return psycopg2.connect(
+            host=self.host,
+            dbname=self.dbname,
+            user=self.user,
+            password=self.password,
+            port=self.port,
+        )
+
+    def ping(self) -> bool:
+        """Check that the database answers a trivial query.
+
+        Returns:
+            bool: Whether `SELECT 1` succeeded.
+        """
+        try:
+            with self.checkout() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            return True
+        except Exception as e:
+            logger.warning(f"PostgreSQL is not reachable: {e}")
+            return False
+
+    def execute_query(self, query, params=None, commit=True):
         """Execute a query on the PostgreSQL database.
 
         Parameters:
             query (str): The SQL query to be executed.
             params (tuple, optional): Optional parameters to include in the query.
+            commit (bool, optional): Whether to commit right after the query.
+                Defaults to True.
 
         Raises:
             Exception: If there is an error during query execution.
         """
         try:
             self.cursor.execute(query, params)
-            self.connection.commit()
+            if commit:
+                self.connection.commit()
             logger.info("Query executed successfully.")
         except Exception as e:
             logger.error(f"Error executing query: {e}")
@@ -125,54 +234,122 @@ class PostgreSQLManager(InterfaceDatabaseManager):
             raise
 
     def close(self):
-        """Close the cursor and the PostgreSQL connection."""
+        """Close the cursor and the PostgreSQL connection.
+
+        In pooled mode the connection is given back to the pool instead.
+        """
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
             logger.info("Cursor closed.")
         if self.connection:
-            self.connection.close()
-            logger.info("PostgreSQL connection closed.")
+            if self.pooled:
+                self.get_pool().putconn(self.connection)
+                logger.info("PostgreSQL connection returned to the pool.")
+            else:
+                self.connection.close()
+                logger.info("PostgreSQL connection closed.")
+            self.connection = None
 
     def upload_dataframe_to_postgres(self, df: pd.DataFrame, table_name: str):
         """Uploads a Pandas DataFrame to a PostgreSQL table.
 
+        The rows are streamed with `COPY FROM STDIN`. If the copy fails the
+        transaction is rolled back and the rows are inserted with `executemany`.
+
         Parameters:
             df (pd.DataFrame): The DataFrame containing data to upload.
             table_name (str): The name of the target table in PostgreSQL.
         """
-        # Create a connection to PostgreSQL
         try:
+            with self.checkout() as connection:
+                try:
+                    self._copy_dataframe(connection, df, table_name)
+                except Exception as error:
+                    logger.warning(f"COPY failed, falling back to INSERT: {error}")
+                    connection.rollback()
+                    self._insert_dataframe(connection, df, table_name)
 
-            self.connect()
+            print(f"Data uploaded successfully to {table_name}")
 
-            cursor = self.connection.cursor()
+        except Exception as error:
+            print(f"Error occurred: {error}")
+
+    def _copy_dataframe(self, connection, df: pd.DataFrame, table_name: str):
+        """Private method to stream a DataFrame into a table with COPY.
 
-            # Create an insert query template
-            columns = ", ".join(df.columns)
-            values_template = ", ".join(["%s"] * len(df.columns))
-            insert_query = (
-                f"INSERT INTO {table_name} ({columns}) VALUES ({values_template})"
-            )
+        Missing values are written as `COPY_NULL`, the NULL marker of the copy,
+        so empty strings are stored as such, like with INSERT.
 
-            # Convert the DataFrame to a list of tuples
-            data_tuples = [tuple(row) for row in df.to_numpy()]
+        Parameters:
+            connection: Open connection used for the copy.
+            df (pd.DataFrame): The DataFrame containing data to upload.
+            table_name (str): The name of the target table in PostgreSQL.
+        """
+        buffer = StringIO()
+        self._cast_to_table_types(df, table_name).to_csv(
+            buffer, index=False, header=False, na_rep=COPY_NULL
+        )
+        buffer.seek(0)
+
+        columns = ", ".join(df.columns)
+        copy_query = (
+            f"COPY {table_name} ({columns}) FROM STDIN "
+            f"WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+        with connection.cursor() as cursor:
+            cursor.copy_expert(copy_query, buffer)
+
+    def _insert_dataframe(self, connection, df: pd.DataFrame, table_name: str):
+        """Private method to insert a DataFrame row by row with executemany.
 
-            # Execute the insert query for all rows in the DataFrame
+        Parameters:
+            connection: Open connection used for the inserts.
+            df (pd.DataFrame): The DataFrame containing data to upload.
+            table_name (str): The name of the target table in PostgreSQL.
+        """
+        # Create an insert query template
+        columns = ", ".join(df.columns)
+        values_template = ", ".join(["%s"] * len(df.columns))
+        insert_query = (
+            f"INSERT INTO {table_name} ({columns}) VALUES ({values_template})"
+        )
+
+        # Convert the DataFrame to a list of tuples
+        data_tuples = [tuple(row) for row in df.to_numpy()]
+
+        with connection.cursor() as cursor:
             cursor.executemany(insert_query, data_tuples)
 
-            # Commit the transaction
-            self.connection.commit()
-            print(f"Data uploaded successfully to {table_name}")
+    def _cast_to_table_types(self, df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+        """Private method to cast the columns to the types of the target table.
 
-        except Exception as error:
-            print(f"Error occurred: {error}")
+        Integer columns are rounded and stored as nullable integers so they are
+        written without decimals. Columns of unknown tables are left untouched.
 
-        finally:
-            # Close the cursor and connection
-            if cursor:
-                cursor.close()
-            if self.connection:
-                self.connection.close()
+        Parameters:
+            df (pd.DataFrame): The DataFrame containing data to upload.
+            table_name (str): The name of the target table in PostgreSQL.
+
+        Returns:
+            pd.DataFrame: The DataFrame with the columns cast.
+        """
+        column_types = TABLE_COLUMN_TYPES.get(table_name, {})
+        casted = {}
+        for column in df.columns:
+            sql_type = column_types.get(column)
+            if sql_type == "INT":
+                values = pd.to_numeric(df[column]).round().astype("Int64")
+            elif sql_type == "FLOAT":
+                values = pd.to_numeric(df[column]).astype("float64")
+            elif sql_type == "TEXT":
+                values = df[column].astype("string")
+            elif sql_type == "BOOLEAN":
+                values = df[column].astype("boolean")
+            else:
+                values = df[column]
+            casted[column] = values
+        return pd.DataFrame(casted, index=df.index)
 
 
 # Example usage:
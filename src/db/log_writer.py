@@ -0,0 +1,163 @@
+"""Module with a background writer that uploads logged rows in bulk."""
+
+import logging
+import queue
+import threading
+import time
+
+import pandas as pd
+
+from src.db.db_manager.postgre_sql_manager import PostgreSQLManager
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BackgroundLogWriter:
+    """Queue DataFrames in memory and upload them to the database from a worker thread.
+
+    Submitted frames are accumulated and written with a single upload once
+    `flush_size` rows are pending or `flush_interval` seconds have passed since
+    the first pending row, so callers never wait on database round-trips.
+
+    Args:
+        db_manager (PostgreSQLManager): Manager used to upload the rows.
+        table_name (str): Name of the target table.
+        max_queue_size (int, optional): Maximum number of pending submissions.
+            Submissions over this limit are dropped. Defaults to 10000.
+        flush_size (int, optional): Number of rows that triggers a flush.
+            Defaults to 500.
+        flush_interval (float, optional): Maximum seconds a row waits before being
+            flushed. Defaults to 1.0.
+    """
+
+    def __init__(
+        self,
+        db_manager: PostgreSQLManager,
+        table_name: str,
+        max_queue_size: int = 10000,
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """Initialize the writer without starting the worker thread.
+
+        Args:
+            db_manager (PostgreSQLManager): Manager used to upload the rows.
+            table_name (str): Name of the target table.
+            max_queue_size (int, optional): Maximum number of pending submissions.
+            flush_size (int, optional): Number of rows that triggers a flush.
+            flush_interval (float, optional): Maximum seconds a row waits.
+        """
+        self.db_manager = db_manager
+        self.table_name = table_name
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.dropped_rows = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+
+    @property
+    def queue_depth(self) -> int:
+        """int: Number of submissions waiting to be picked up by the worker."""
+        return self._queue.qsize()
+
+    @property
+    def is_running(self) -> bool:
+        """bool: Whether the worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the worker thread if it is not running yet."""
+        if self.is_running:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, data) -> bool:
+        """Queue rows to be uploaded without blocking the caller.
+
+        Args:
+            data (pd.DataFrame | list[dict]): Rows to upload, as a DataFrame or as
+                a list of records.
+
+        Returns:
+            bool: True if the rows were queued, False if the queue was full.
+        """
+        try:
+            self._queue.put_nowait(data)
+            return True
+        except queue.Full:
+            self.dropped_rows += len(data)
+            logger.warning(f"Log queue is full, dropping {len(data)} rows.")
+            return False
+
+    def stop(self, timeout: float = None) -> None:
+        """Flush every pending row and stop the worker thread.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for the drain.
+        """
+        if not self.is_running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        """Worker loop accumulating submissions and flushing them in bulk."""
+        pending = []
+        pending_rows = 0
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(pending)
+                return
+
+            if item is not None:
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+                pending_rows += len(item)
+
+            if pending and (
+                pending_rows >= self.flush_size or time.monotonic() >= deadline
+            ):
+                self._flush(pending)
+                pending = []
+                pending_rows = 0
+                deadline = None
+
+    def _flush(self, pending: list) -> None:
+        """Upload the accumulated submissions with a single call.
+
+        Args:
+            pending (list): DataFrames and lists of records waiting to be uploaded.
+        """
+        if not pending:
+            return
+        try:
+            frames = [item for item in pending if isinstance(item, pd.DataFrame)]
+            records = [
+                record
+                for item in pending
+                if not isinstance(item, pd.DataFrame)
+                for record in item
+            ]
+            if records:
+                frames.append(pd.DataFrame(records))
+            data = pd.concat(frames, ignore_index=True)
+            self.db_manager.upload_dataframe_to_postgres(
+                data, table_name=self.table_name
+            )
+        except Exception as e:
+            logger.error(f"Error flushing {len(pending)} log batches: {e}")
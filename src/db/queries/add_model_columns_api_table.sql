@@ -0,0 +1,2 @@
+ALTER TABLE titanic ADD COLUMN IF NOT EXISTS model_version TEXT;
+ALTER TABLE titanic ADD COLUMN IF NOT EXISTS shadow BOOLEAN DEFAULT FALSE;
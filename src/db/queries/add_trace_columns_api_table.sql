@@ -0,0 +1,5 @@
+ALTER TABLE titanic ADD COLUMN IF NOT EXISTS request_id TEXT;
+ALTER TABLE titanic ADD COLUMN IF NOT EXISTS transform_ms FLOAT;
+ALTER TABLE titanic ADD COLUMN IF NOT EXISTS preprocess_ms FLOAT;
+ALTER TABLE titanic ADD COLUMN IF NOT EXISTS predict_ms FLOAT;
+CREATE INDEX IF NOT EXISTS titanic_request_id_idx ON titanic (request_id);
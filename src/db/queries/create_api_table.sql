@@ -11,5 +11,11 @@
 --     Cabin       TEXT,
 --     Embarked    TEXT,
 --     prediction  INT,
+--     model_version TEXT,
+--     shadow      BOOLEAN DEFAULT FALSE,
+--     request_id  TEXT,
+--     transform_ms  FLOAT,
+--     preprocess_ms FLOAT,
+--     predict_ms    FLOAT,
 --     created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 -- );
\ No newline at end of file
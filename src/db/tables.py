@@ -0,0 +1,25 @@
+"""Module with the column types of the tables written by the project."""
+
+# Mirrors the definition in src/db/queries/create_api_table.sql
+TITANIC_COLUMN_TYPES = {
+    "PassengerId": "FLOAT",
+    "Pclass": "INT",
+    "Name": "TEXT",
+    "Sex": "TEXT",
+    "Age": "INT",
+    "SibSp": "INT",
+    "Parch": "INT",
+    "Ticket": "TEXT",
+    "Fare": "FLOAT",
+    "Cabin": "TEXT",
+    "Embarked": "TEXT",
+    "prediction": "INT",
+    "model_version": "TEXT",
+    "shadow": "BOOLEAN",
+    "request_id": "TEXT",
+    "transform_ms": "FLOAT",
+    "preprocess_ms": "FLOAT",
+    "predict_ms": "FLOAT",
+}
+
+TABLE_COLUMN_TYPES = {"titanic": TITANIC_COLUMN_TYPES}
@@ -6,8 +6,11 @@ import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 
+from src.configs import Configs
 from src.ml_pipelines.feature_selection import *
 from src.ml_pipelines.model_training import ModelTraining
+from src.ml_pipelines.training_cache import TrainingCache
+from src.ml_pipelines.training_scheduler import TrainingScheduler
 from src.utils.data_functions import (
     generate_validation_report,
     load_data,
@@ -19,12 +22,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def train(models_to_use: list, acc_threshold: float = 0.7) -> None:
+def train(
+    models_to_use: list, acc_threshold: float = 0.7, use_cache: bool = True
+) -> None:
     """Train the models and save the best one locally.
 
     Args:
         models_to_use (list, optional): List of models to train.
         acc_threshold (float, optional): Accuracy threshold to consider the model as good. Defaults to 0.7.}
+        use_cache (bool, optional): Whether to reuse the preparation fitted by a
+            previous run on the same data, if the training cache is enabled.
+            Defaults to True.
 
 
     Raises:
@@ -50,8 +58,19 @@ def train(models_to_use: list, acc_threshold: float = 0.7) -> None:
 
     logger.info("Training models")
 
-    model_train = ModelTraining(X_train, y_train, atributes_types, models_to_use)
+    cache = training_cache() if use_cache else None
+    model_train = ModelTraining(
+        X_train, y_train, atributes_types, models_to_use, cache, training_scheduler()
+    )
     models = model_train.train_models()
+    for name, timing in model_train.timings.items():
+        logger.info(
+            "Trained %s in %.1fs wall, %.1fs CPU with %d cores",
+            name,
+            timing["wall_seconds"],
+            timing["cpu_seconds"],
+            timing["n_jobs"],
+        )
 
     scores = model_train.generate_scores(X_test, y_test)
     logger.info(f"Scores: {scores}")
@@ -65,7 +84,34 @@ def train(models_to_use: list, acc_threshold: float = 0.7) -> None:
 
     logger.info("Saving model locally")
     model_train.save_model(best_model_name, "models/best_model.pkl")
+    candidate_paths = model_train.save_models("models/candidates")
+    logger.info(f"Candidate models saved in {candidate_paths}")
 
     generate_validation_report(models[best_model_name], X, y, training_report)
 
     logger.info("Training report generated in %s", training_report)
+
+
+def training_cache() -> TrainingCache:
+    """Build the cache of the fitted preparation steps from the configs.
+
+    Returns:
+        TrainingCache: The cache, or None if it is disabled.
+    """
+    settings = Configs.training["cache"]
+    if not settings["enabled"]:
+        return None
+    return TrainingCache(settings["location"], settings["bytes_limit"])
+
+
+def training_scheduler() -> TrainingScheduler:
+    """Build the scheduler of the model fits from the configs.
+
+    Returns:
+        TrainingScheduler: The scheduler, or None if the models are fitted one
+            after another.
+    """
+    settings = Configs.training["scheduler"]
+    if not settings["enabled"]:
+        return None
+    return TrainingScheduler(settings["cores"], settings["max_workers"])
@@ -0,0 +1,373 @@
+"""Module to compile a fitted pipeline into a NumPy-only scorer."""
+
+import copy
+import os
+from io import BytesIO
+
+import numpy as np
+from joblib import dump, load
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble._forest import ForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.model_selection._search import BaseSearchCV
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+from src.ml_pipelines.feature_selection import FeatureSelection
+
+
+class CompiledScorer:
+    """Inference-only version of a pipeline built by `PipelineBuilding`.
+
+    The fitted imputers, scalers and encoders are reduced to plain NumPy
+    parameters, only the columns kept by `FeatureSelection` are computed, and the
+    best estimator of the search is called directly. For random forests the leaf
+    probabilities of every tree are precomputed and the trees are walked without
+    going through the joblib dispatch of `predict_proba`.
+
+    Args:
+        input_columns (list): Names of the raw columns used by the pipeline, in
+            the order expected when an array is given instead of a DataFrame.
+        outputs (list): Description of every selected output column.
+        estimator (BaseEstimator): The fitted final estimator.
+    """
+
+    def __init__(self, input_columns: list, outputs: list, estimator) -> None:
+        """Initialize the scorer.
+
+        Args:
+            input_columns (list): Names of the raw columns used by the pipeline.
+            outputs (list): Description of every selected output column.
+            estimator (BaseEstimator): The fitted final estimator.
+        """
+        self.input_columns = input_columns
+        self.outputs = outputs
+        self.estimator = estimator
+        self.classes_ = getattr(estimator, "classes_", None)
+        self.leaf_probabilities = _compile_forest(estimator)
+
+    def transform(self, X) -> np.ndarray:
+        """Build the estimator input matrix.
+
+        Args:
+            X (pd.DataFrame | np.ndarray): Rows with the raw columns, either as a
+                DataFrame or as a 2D array ordered like `input_columns`.
+
+        Returns:
+            np.ndarray: Matrix with the selected features.
+
+        Raises:
+            ValueError: If a categorical column contains an unknown category.
+        """
+        columns = self._get_columns(X)
+        n_rows = len(next(iter(columns.values()))) if columns else 0
+        transformed = np.empty((n_rows, len(self.outputs)), dtype=np.float64)
+
+        filled = {}
+        for position, output in enumerate(self.outputs):
+            key = (output["column"], output["fill_value"])
+            if key not in filled:
+                filled[key] = _fill_missing(
+                    columns[output["column"]], output["fill_value"]
+                )
+            values = filled[key]
+
+            if output["kind"] == "numeric":
+                values = values.astype(np.float64)
+                transformed[:, position] = (values - output["mean"]) / output["scale"]
+            elif output["kind"] == "ordinal":
+                transformed[:, position] = _encode(
+                    values, output["categories"], output["column"]
+                )
+            else:
+                if output["check_unknown"]:
+                    _encode(values, output["categories"], output["column"])
+                transformed[:, position] = values == output["category"]
+
+        return transformed
+
+    def predict(self, X) -> np.ndarray:
+        """Predict the class of every row.
+
+        Args:
+            X (pd.DataFrame | np.ndarray): Rows with the raw columns.
+
+        Returns:
+            np.ndarray: The predicted classes.
+        """
+        if self.leaf_probabilities is None:
+            return self.estimator.predict(self.transform(X))
+
+        probabilities = self._forest_predict_proba(self.transform(X))
+        return self.classes_.take(np.argmax(probabilities, axis=1), axis=0)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Predict the class probabilities of every row.
+
+        Args:
+            X (pd.DataFrame | np.ndarray): Rows with the raw columns.
+
+        Returns:
+            np.ndarray: The probability of each class for every row.
+        """
+        if self.leaf_probabilities is None:
+            return self.estimator.predict_proba(self.transform(X))
+
+        return self._forest_predict_proba(self.transform(X))
+
+    def _forest_predict_proba(self, transformed: np.ndarray) -> np.ndarray:
+        """Private method to average the leaf probabilities of every tree.
+
+        Args:
+            transformed (np.ndarray): Matrix returned by `transform`.
+
+        Returns:
+            np.ndarray: The probability of each class for every row.
+        """
+        transformed = np.ascontiguousarray(transformed, dtype=np.float32)
+        probabilities = np.zeros((len(transformed), len(self.classes_)))
+        for tree, leaf_probabilities in zip(
+            self.estimator.estimators_, self.leaf_probabilities
+        ):
+            probabilities += leaf_probabilities[tree.tree_.apply(transformed)]
+        probabilities /= len(self.leaf_probabilities)
+        return probabilities
+
+    def _get_columns(self, X) -> dict:
+        """Private method to index the raw columns by name.
+
+        Args:
+            X (pd.DataFrame | np.ndarray): Rows with the raw columns.
+
+        Returns:
+            dict: Array of values of every input column.
+        """
+        if hasattr(X, "columns"):
+            return {column: X[column].to_numpy() for column in self.input_columns}
+
+        X = np.asarray(X)
+        return {column: X[:, i] for i, column in enumerate(self.input_columns)}
+
+
+def compile_pipeline(pipeline: Pipeline) -> CompiledScorer:
+    """Compile a fitted pipeline built by `PipelineBuilding` into a scorer.
+
+    Args:
+        pipeline (Pipeline): Fitted pipeline with a `preparation` step made of a
+            ColumnTransformer and a FeatureSelection, and a `model` step.
+
+    Returns:
+        CompiledScorer: Equivalent inference-only scorer.
+
+    Raises:
+        ValueError: If the pipeline contains steps that cannot be compiled.
+    """
+    preparation = pipeline.named_steps["preparation"]
+    column_transformer = preparation.named_steps["data_processing"]
+    feature_selection = preparation.named_steps["FeatureSelection"]
+
+    if not isinstance(column_transformer, ColumnTransformer):
+        raise ValueError("The data processing step must be a ColumnTransformer.")
+    if not isinstance(feature_selection, FeatureSelection):
+        raise ValueError("The feature selection step must be a FeatureSelection.")
+
+    input_columns, outputs = _compile_column_transformer(column_transformer)
+    if len(outputs) != len(feature_selection.columns):
+        raise ValueError("The processed columns do not match FeatureSelection.")
+
+    selected_outputs = [
+        outputs[feature_selection.columns.index(feature)]
+        for feature in feature_selection.selected_features
+    ]
+
+    estimator = pipeline.named_steps["model"]
+    if isinstance(estimator, BaseSearchCV):
+        estimator = estimator.best_estimator_
+    estimator = copy.deepcopy(estimator)
+    # The scorer passes arrays, the column names are already resolved
+    if hasattr(estimator, "feature_names_in_"):
+        del estimator.feature_names_in_
+
+    return CompiledScorer(input_columns, selected_outputs, estimator)
+
+
+def export_compiled_scorer(model_path: str, output_path: str) -> CompiledScorer:
+    """Compile a saved pipeline and save the resulting scorer.
+
+    Args:
+        model_path (str): Path of the pipeline saved with joblib.
+        output_path (str): Path where the compiled scorer is saved.
+
+    Returns:
+        CompiledScorer: The saved scorer.
+    """
+    with open(model_path, "rb") as model_file:
+        pipeline = load(BytesIO(model_file.read()))
+
+    scorer = compile_pipeline(pipeline)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    dump(scorer, output_path)
+    return scorer
+
+
+def _compile_column_transformer(column_transformer: ColumnTransformer) -> tuple:
+    """Private function to describe every output column of a ColumnTransformer.
+
+    Args:
+        column_transformer (ColumnTransformer): Fitted ColumnTransformer.
+
+    Returns:
+        tuple: The list of input columns and the list of output descriptions.
+    """
+    input_columns = []
+    outputs = []
+    for name, transformer, columns in column_transformer.transformers_:
+        if transformer == "drop":
+            continue
+        if transformer == "passthrough":
+            raise ValueError(f"Passthrough columns are not supported ({name}).")
+
+        steps = (
+            [step for _, step in transformer.steps]
+            if isinstance(transformer, Pipeline)
+            else [transformer]
+        )
+        for index, column in enumerate(columns):
+            input_columns.append(column)
+            outputs.extend(_compile_feature(column, index, steps))
+
+    return input_columns, outputs
+
+
+def _compile_feature(column: str, index: int, steps: list) -> list:
+    """Private function to describe the output columns produced from one feature.
+
+    Args:
+        column (str): Name of the raw column.
+        index (int): Position of the column inside its transformer.
+        steps (list): Fitted steps applied to the column, in order.
+
+    Returns:
+        list: Description of every output column.
+    """
+    fill_value = None
+    mean = 0.0
+    scale = 1.0
+
+    for position, step in enumerate(steps):
+        is_last = position == len(steps) - 1
+
+        if isinstance(step, SimpleImputer):
+            fill_value = step.statistics_[index]
+        elif isinstance(step, StandardScaler) and is_last:
+            if step.mean_ is not None:
+                mean = step.mean_[index]
+            if step.scale_ is not None:
+                scale = step.scale_[index]
+        elif isinstance(step, OrdinalEncoder) and is_last:
+            return [
+                {
+                    "kind": "ordinal",
+                    "column": column,
+                    "fill_value": fill_value,
+                    "categories": step.categories_[index],
+                }
+            ]
+        elif isinstance(step, OneHotEncoder) and is_last and step.drop is None:
+            categories = step.categories_[index]
+            return [
+                {
+                    "kind": "onehot",
+                    "column": column,
+                    "fill_value": fill_value,
+                    "category": category,
+                    "categories": categories,
+                    "check_unknown": step.handle_unknown == "error",
+                }
+                for category in categories
+            ]
+        else:
+            raise ValueError(f"Step {step!r} of column {column} is not supported.")
+
+    return [
+        {
+            "kind": "numeric",
+            "column": column,
+            "fill_value": fill_value,
+            "mean": mean,
+            "scale": scale,
+        }
+    ]
+
+
+def _compile_forest(estimator) -> list:
+    """Private function to precompute the leaf probabilities of a random forest.
+
+    Args:
+        estimator (BaseEstimator): The fitted final estimator.
+
+    Returns:
+        list: Class probabilities of every node of every tree, or None if the
+            estimator is not a single-output forest classifier.
+    """
+    if not isinstance(estimator, ForestClassifier) or estimator.n_outputs_ != 1:
+        return None
+
+    leaf_probabilities = []
+    for tree in estimator.estimators_:
+        values = tree.tree_.value[:, 0, :]
+        totals = values.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1
+        leaf_probabilities.append(values / totals)
+    return leaf_probabilities
+
+
+def _fill_missing(values: np.ndarray, fill_value) -> np.ndarray:
+    """Private function to replace missing values (None or NaN).
+
+    Args:
+        values (np.ndarray): Column values.
+        fill_value: Value used for the missing entries, or None to keep them.
+
+    Returns:
+        np.ndarray: The filled values.
+    """
+    if fill_value is None:
+        return values
+    if values.dtype.kind == "f":
+        return np.where(np.isnan(values), fill_value, values)
+    if values.dtype.kind == "O":
+        missing = np.fromiter(
+            (value is None or value != value for value in values),
+            dtype=bool,
+            count=len(values),
+        )
+        if missing.any():
+            values = values.copy()
+            values[missing] = fill_value
+    return values
+
+
+def _encode(values: np.ndarray, categories: np.ndarray, column: str) -> np.ndarray:
+    """Private function to replace every value by the index of its category.
+
+    Args:
+        values (np.ndarray): Column values.
+        categories (np.ndarray): Sorted categories learned by the encoder.
+        column (str): Name of the column, used in the error message.
+
+    Returns:
+        np.ndarray: The category index of every value.
+
+    Raises:
+        ValueError: If a value is not one of the categories.
+    """
+    codes = np.searchsorted(categories, values)
+    codes = np.minimum(codes, len(categories) - 1)
+    unknown = categories[codes] != values
+    if np.any(unknown):
+        raise ValueError(
+            f"Found unknown categories {list(np.unique(values[unknown]))} "
+            f"in column {column} during transform"
+        )
+    return codes
@@ -15,6 +15,7 @@ from sklearn.model_selection import train_test_split
 
 # sklearn Pipelines
 from sklearn.pipeline import Pipeline
+from sklearn.utils import resample
 
 
 class FeatureSelection(BaseEstimator, TransformerMixin):
@@ -23,18 +24,46 @@ class FeatureSelection(BaseEstimator, TransformerMixin):
     Args:
         columns (list): List of column names.
         verbose (bool, optional): Whether to print the results of the feature selection. Defaults to False.
+        n_repeats (int, optional): Times each feature is permuted. Defaults to 10.
+        n_jobs (int, optional): Cores used to fit the random forest and to
+            permute the features in parallel, -1 for all of them. Defaults to None.
+        max_samples (int | float, optional): Rows drawn at random to select the
+            features on large datasets, as a count or a fraction of the rows.
+            Defaults to None, using every row.
+        validate_selection (bool, optional): Whether to refit a random forest on
+            the selected features to print its accuracy, only done when
+            `verbose` is set. Defaults to True.
     """
 
-    def __init__(self, columns: list, verbose=False) -> None:
+    def __init__(
+        self,
+        columns: list,
+        verbose=False,
+        n_repeats: int = 10,
+        n_jobs: int = None,
+        max_samples=None,
+        validate_selection: bool = True,
+    ) -> None:
         """Initialize the FeatureSelection class.
 
         Args:
             columns (list): List of column names.
             verbose (bool, optional): Whether to print the results of the feature selection. Defaults to False.
+            n_repeats (int, optional): Times each feature is permuted.
+            n_jobs (int, optional): Cores used by the random forest and the
+                permutation importance.
+            max_samples (int | float, optional): Rows drawn to select the
+                features.
+            validate_selection (bool, optional): Whether to refit a model on the
+                selected features when `verbose` is set.
         """
         super().__init__()
         self.columns = columns
         self.verbose = verbose
+        self.n_repeats = n_repeats
+        self.n_jobs = n_jobs
+        self.max_samples = max_samples
+        self.validate_selection = validate_selection
         self.RANDOM_SEED = 42
 
     def fit(self, X: np.array, y: np.array = None) -> BaseEstimator:
@@ -47,15 +76,17 @@ class FeatureSelection(BaseEstimator, TransformerMixin):
         Returns:
             BaseEstimator: The fitted FeatureSelection class.
         """
-        X_df = self._to_dataframe(X)
+        X_df, y = self._subsample(self._to_dataframe(X), y)
         model, X_test, y_test, X_train, y_train = self._train_feature_selection_model(
             X_df, y
         )
         perm_importance = self._calculate_permutation_importance(model, X_test, y_test)
         self.selected_features = self._select_features(perm_importance, X_train, X_test)
-        self._test_selected_features(
-            self.selected_features, X_train, X_test, y_train, y_test
-        )
+        # The accuracy of the refitted model is only printed
+        if self.verbose and self.validate_selection:
+            self._test_selected_features(
+                self.selected_features, X_train, X_test, y_train, y_test
+            )
 
         return self
 
@@ -84,6 +115,30 @@ class FeatureSelection(BaseEstimator, TransformerMixin):
         X_processed = pd.DataFrame(X, columns=self.columns)
         return X_processed
 
+    def _subsample(self, X: pd.DataFrame, y: np.array) -> tuple:
+        """Private method to draw the rows used to select the features.
+
+        Args:
+            X (pd.DataFrame): DataFrame of features.
+            y (np.array): Array of labels.
+
+        Returns:
+            tuple: The features and labels, unchanged if they have no more than
+                `max_samples` rows.
+        """
+        if self.max_samples is None:
+            return X, y
+
+        n_samples = self.max_samples
+        if isinstance(n_samples, float):
+            n_samples = int(n_samples * len(X))
+        if n_samples >= len(X):
+            return X, y
+
+        return resample(
+            X, y, n_samples=n_samples, replace=False, random_state=self.RANDOM_SEED
+        )
+
     def _train_feature_selection_model(self, X: pd.DataFrame, y: np.array) -> tuple:
         """Private method to train a random forest classifier to select features.
 
@@ -106,14 +161,14 @@ class FeatureSelection(BaseEstimator, TransformerMixin):
             X_test.shape[0]
         )  # add a random feature
 
-        model = RandomForestClassifier(random_state=self.RANDOM_SEED)
+        model = RandomForestClassifier(
+            random_state=self.RANDOM_SEED, n_jobs=self.n_jobs
+        )
         model.fit(X_train, y_train)
 
-        y_pred = model.predict(X_test)
-
         # Calculate the accuracy of the model
-        accuracy = accuracy_score(y_test, y_pred)
         if self.verbose:
+            accuracy = accuracy_score(y_test, model.predict(X_test))
             print(f"Model Accuracy: {accuracy:.2f}")
 
         return model, X_test, y_test, X_train, y_train
@@ -132,7 +187,12 @@ class FeatureSelection(BaseEstimator, TransformerMixin):
             np.array: An array of the permutation importance scores.
         """
         perm_importance = permutation_importance(
-            model, X_test, y_test, n_repeats=10, random_state=self.RANDOM_SEED
+            model,
+            X_test,
+            y_test,
+            n_repeats=self.n_repeats,
+            n_jobs=self.n_jobs,
+            random_state=self.RANDOM_SEED,
         )
 
         if self.verbose:
@@ -194,7 +254,7 @@ class FeatureSelection(BaseEstimator, TransformerMixin):
         selected_X_train = X_train[selected_features]
         selected_X_test = X_test[selected_features]
 
-        selected_model = RandomForestClassifier(random_state=42)
+        selected_model = RandomForestClassifier(random_state=42, n_jobs=self.n_jobs)
         selected_model.fit(selected_X_train, y_train)
 
         # Make predictions on the test set using the selected model
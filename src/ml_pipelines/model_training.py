@@ -1,14 +1,19 @@
 """Module with class to train the model."""
 
+import os
+
 # Data processing
 import numpy as np
 import pandas as pd
 
 # Save model
 from joblib import dump
+from sklearn.pipeline import Pipeline
 
 # Pipelines
 from src.ml_pipelines.pipeline_connection import PipelineBuilding
+from src.ml_pipelines.training_cache import TrainingCache
+from src.ml_pipelines.training_scheduler import TrainingScheduler, limit_cores
 
 
 class ModelTraining(PipelineBuilding):
@@ -22,10 +27,25 @@ class ModelTraining(PipelineBuilding):
         y (pd.DataFrame): The target labels.
         atributes_types (dict): A dictionary containing the types of attributes for pipeline building.
         models (list): List of model names to be trained.
+        cache (TrainingCache, optional): On-disk cache of the fitted preparation
+            steps. Defaults to None.
+        scheduler (TrainingScheduler, optional): Scheduler fitting the models
+            concurrently under a core budget. Defaults to None, fitting them one
+            after another.
+
+    Attributes:
+        timings (dict): Wall and CPU seconds of the fit of every model, filled
+            by `train_models` when a scheduler is given.
     """
 
     def __init__(
-        self, X: pd.DataFrame, y: pd.DataFrame, atributes_types: dict, models: list
+        self,
+        X: pd.DataFrame,
+        y: pd.DataFrame,
+        atributes_types: dict,
+        models: list,
+        cache: TrainingCache = None,
+        scheduler: TrainingScheduler = None,
     ) -> None:
         """Initializes the ModelTraining class.
 
@@ -34,11 +54,16 @@ class ModelTraining(PipelineBuilding):
             y (pd.DataFrame): The target labels.
             atributes_types (dict): Attribute types for constructing pipelines.
             models (list): List of model names to be trained.
+            cache (TrainingCache, optional): Cache of the fitted preparation steps.
+            scheduler (TrainingScheduler, optional): Scheduler of the model fits.
         """
         super().__init__(X, y, atributes_types)
         models_pipelines = self.build_full_pipeline()
         self.X = X
         self.y = y
+        self.cache = cache
+        self.scheduler = scheduler
+        self.timings = {}
         self.models = {}
         for name in models:
             self.models[name] = models_pipelines[name]
@@ -46,14 +71,102 @@ class ModelTraining(PipelineBuilding):
     def train_models(self) -> dict:
         """Trains the models specified during initialization.
 
+        When every model pipeline starts with the same `preparation` step and
+        `training["share_preparation"]` is enabled, the preprocessing and
+        feature selection are fitted once and the transformed matrix is given
+        to the search of every model. The fitted pipelines are the same as when
+        each one is fitted on its own, since the preparation is deterministic.
+
+        With a `cache`, the fitted preparation steps are loaded from disk when
+        the training data and the steps are unchanged since a previous run.
+        With a `scheduler`, the models are fitted concurrently in worker
+        processes and their timings are stored in `timings`.
+
         Returns:
             dict: A dictionary where the keys are model names and the values are the trained models.
         """
-        for name in self.models:
-            self.models[name].fit(self.X, self.y)
+        preparation = self._shared_preparation()
+        if preparation is not None:
+            preparation, X_prepared = self._fit_preparation(preparation)
+
+        # Estimator to fit and its training features, by model
+        tasks = {}
+        for name, pipeline in self.models.items():
+            if preparation is not None:
+                pipeline.steps[0] = ("preparation", preparation)
+                tasks[name] = (pipeline.named_steps["model"], X_prepared)
+            elif self.cache is not None and _has_preparation(pipeline):
+                fitted_preparation, X_fit = self._fit_preparation(
+                    pipeline.named_steps["preparation"]
+                )
+                pipeline.steps[0] = ("preparation", fitted_preparation)
+                tasks[name] = (pipeline.named_steps["model"], X_fit)
+            else:
+                tasks[name] = (pipeline, self.X)
+
+        for name, estimator in self._fit_tasks(tasks).items():
+            if tasks[name][0] is self.models[name]:
+                self.models[name] = estimator
+            else:
+                self.models[name].steps[-1] = ("model", estimator)
 
         return self.models
 
+    def _fit_tasks(self, tasks: dict) -> dict:
+        """Private method to fit the estimators, through the scheduler if any.
+
+        Args:
+            tasks (dict): Pairs of estimator and training features, by name.
+
+        Returns:
+            dict: The fitted estimators, by name.
+        """
+        if self.scheduler is None:
+            for estimator, X in tasks.values():
+                estimator.fit(X, self.y)
+            return {name: estimator for name, (estimator, _) in tasks.items()}
+
+        fitted, self.timings = self.scheduler.fit(tasks, self.y)
+        return fitted
+
+    def _fit_preparation(self, preparation: Pipeline) -> tuple:
+        """Private method to fit a preparation step, through the cache if any.
+
+        Args:
+            preparation (Pipeline): The unfitted preparation step.
+
+        Returns:
+            tuple: The fitted step and the transformed training data.
+        """
+        if self.scheduler is not None:
+            # Fitted before the models, so it can use every core of the budget
+            limit_cores(preparation, self.scheduler.cores)
+        if self.cache is None:
+            return preparation, preparation.fit_transform(self.X, self.y)
+        return self.cache.fit_transform(preparation, self.X, self.y)
+
+    def _shared_preparation(self) -> Pipeline:
+        """Private method to find the preparation step shared by every model.
+
+        Returns:
+            Pipeline: The shared `preparation` step, or None if the models do
+                not share one or sharing it is disabled.
+        """
+        if not self.training["share_preparation"] or not self.models:
+            return None
+
+        pipelines = list(self.models.values())
+        if not all(_has_preparation(pipeline) for pipeline in pipelines):
+            return None
+
+        preparation = pipelines[0].named_steps["preparation"]
+        if any(
+            pipeline.named_steps["preparation"] is not preparation
+            for pipeline in pipelines
+        ):
+            return None
+        return preparation
+
     def generate_scores(self, X_test: pd.DataFrame, y_test: pd.DataFrame) -> dict:
         """Generates performance scores for each trained model using the test dataset.
 
@@ -94,3 +207,37 @@ class ModelTraining(PipelineBuilding):
         """
         model = self.models[model_name]
         dump(model, path)
+
+    def save_models(self, directory: str) -> dict:
+        """Saves every trained model in a directory, named after the model.
+
+        The saved candidates can be served next to the best model, either
+        routed a share of the traffic or in shadow.
+
+        Args:
+            directory (str): The directory where the models should be saved.
+
+        Returns:
+            dict: The path of each saved model, by model name.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for name in self.models:
+            paths[name] = os.path.join(directory, f"{name}.pkl")
+            self.save_model(name, paths[name])
+        return paths
+
+
+def _has_preparation(pipeline) -> bool:
+    """Private function to check that a pipeline is a preparation and a model.
+
+    Args:
+        pipeline: The model pipeline.
+
+    Returns:
+        bool: Whether the pipeline has exactly the `preparation` and `model` steps.
+    """
+    return isinstance(pipeline, Pipeline) and [name for name, _ in pipeline.steps] == [
+        "preparation",
+        "model",
+    ]
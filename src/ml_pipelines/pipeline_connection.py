@@ -151,7 +151,10 @@ class PipelineBuilding(Configs):
         processing_feature_selection_pipeline = Pipeline(
             [
                 ("data_processing", data_processing_pipeline),
-                ("FeatureSelection", FeatureSelection(columns=new_columns)),
+                (
+                    "FeatureSelection",
+                    FeatureSelection(columns=new_columns, **self.feature_selection),
+                ),
             ]
         )
 
@@ -162,6 +165,9 @@ class PipelineBuilding(Configs):
     ) -> dict:
         """Builds the pipeline for the data processing and feature selection.
 
+        The models listed in `training["halving_search_models"]` are tuned with
+        `halving_search`, without their resource parameter in the grid.
+
         Args:
             processing_feature_selection_pipeline (Pipeline): Pipeline for the data processing and feature selection.
 
@@ -172,11 +178,23 @@ class PipelineBuilding(Configs):
 
         for model in self.models:
 
-            seach_tecnique = self.search_tecnique["technique"]
-            seach_params = self.search_tecnique["params"]
-
             name = model["name"]
-            params = model["params"]
+
+            # A model can override the default search technique
+            if name in self.training["halving_search_models"]:
+                search = self.halving_search
+            else:
+                search = model.get("search", self.search_tecnique)
+            seach_tecnique = search["technique"]
+            seach_params = search["params"]
+
+            # The resource of a halving search cannot be searched as well
+            resource = seach_params.get("resource")
+            params = {
+                key: values
+                for key, values in model["params"].items()
+                if key != resource
+            }
             model = model["model"]
 
             random_seach = seach_tecnique(model, params, **seach_params)
@@ -0,0 +1,158 @@
+"""Module with adaptive hyperparameter search strategies."""
+
+from math import ceil
+from time import perf_counter
+
+import numpy as np
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV
+
+
+class _BudgetExhausted(Exception):
+    """Raised to stop a search once its time budget is spent."""
+
+
+class TimeBudgetHalvingSearchCV(HalvingRandomSearchCV):
+    """Successive halving random search stopped when a time budget is spent.
+
+    Every round evaluates the remaining candidates with more of the resource,
+    either training rows (`n_samples`) or a parameter of the estimator such as
+    `n_estimators`, and keeps the best `1 / factor` of them, so clearly bad
+    candidates only cost a cheap fit. Once `time_budget` seconds have passed, no
+    new round starts and the best candidate of the last completed round is
+    refitted.
+
+    Args:
+        estimator (BaseEstimator): The estimator to tune.
+        param_distributions (dict): Lists or distributions of the parameters
+            to sample the candidates from.
+        time_budget (float, optional): Seconds after which no new round starts.
+            Defaults to None, running every round.
+        n_candidates (int or str, optional): Candidates sampled for the first
+            round. Defaults to "exhaust", as many as the resources allow.
+        factor (int, optional): Proportion of candidates kept at every round,
+            and growth of their resource. Defaults to 3.
+        resource (str, optional): Resource growing at every round, `n_samples`
+            or a parameter of the estimator. Defaults to "n_samples".
+        max_resources (int or str, optional): Maximum resource of a candidate.
+            Defaults to "auto", the number of training rows.
+        min_resources (int or str, optional): Resource of the first round.
+            Defaults to "smallest".
+        aggressive_elimination (bool, optional): Whether to run extra rounds on
+            the minimum resource when it cannot reach a single candidate.
+            Defaults to False.
+        cv (int or object, optional): Cross-validation splits or splitter.
+            Defaults to 5.
+        scoring (str or callable, optional): Metric ranking the candidates.
+            Defaults to None, the score of the estimator.
+        refit (bool, optional): Whether to refit the best candidate on the
+            whole data. Defaults to True.
+        error_score (float or str, optional): Score given to a failed fit, or
+            "raise". Defaults to NaN.
+        return_train_score (bool, optional): Whether to record the training
+            scores. Defaults to True.
+        random_state (int, optional): Seed of the sampling and of the row
+            subsets. Defaults to None.
+        n_jobs (int, optional): Fits run in parallel. Defaults to None.
+        verbose (int, optional): Verbosity of the search. Defaults to 0.
+
+    Attributes:
+        budget_exhausted_ (bool): Whether the search stopped before its last
+            round because of the time budget.
+    """
+
+    def __init__(
+        self,
+        estimator,
+        param_distributions,
+        *,
+        time_budget=None,
+        n_candidates="exhaust",
+        factor=3,
+        resource="n_samples",
+        max_resources="auto",
+        min_resources="smallest",
+        aggressive_elimination=False,
+        cv=5,
+        scoring=None,
+        refit=True,
+        error_score=np.nan,
+        return_train_score=True,
+        random_state=None,
+        n_jobs=None,
+        verbose=0,
+    ):
+        """Initialize the search.
+
+        Args:
+            estimator (BaseEstimator): The estimator to tune.
+            param_distributions (dict): Parameters to sample the candidates from.
+            time_budget (float, optional): Seconds after which no new round starts.
+            n_candidates (int or str, optional): Candidates of the first round.
+            factor (int, optional): Proportion of candidates kept at every round.
+            resource (str, optional): Resource growing at every round.
+            max_resources (int or str, optional): Maximum resource of a candidate.
+            min_resources (int or str, optional): Resource of the first round.
+            aggressive_elimination (bool, optional): Whether to run extra rounds
+                on the minimum resource.
+            cv (int or object, optional): Cross-validation splits or splitter.
+            scoring (str or callable, optional): Metric ranking the candidates.
+            refit (bool, optional): Whether to refit the best candidate.
+            error_score (float or str, optional): Score given to a failed fit.
+            return_train_score (bool, optional): Whether to record training scores.
+            random_state (int, optional): Seed of the sampling.
+            n_jobs (int, optional): Fits run in parallel.
+            verbose (int, optional): Verbosity of the search.
+        """
+        super().__init__(
+            estimator,
+            param_distributions,
+            n_candidates=n_candidates,
+            factor=factor,
+            resource=resource,
+            max_resources=max_resources,
+            min_resources=min_resources,
+            aggressive_elimination=aggressive_elimination,
+            cv=cv,
+            scoring=scoring,
+            refit=refit,
+            error_score=error_score,
+            return_train_score=return_train_score,
+            random_state=random_state,
+            n_jobs=n_jobs,
+            verbose=verbose,
+        )
+        self.time_budget = time_budget
+
+    def _run_search(self, evaluate_candidates) -> None:
+        """Private method to run the rounds until the last one or the deadline.
+
+        The first round always runs, so the search has a candidate to refit.
+
+        Args:
+            evaluate_candidates (callable): Cross-validates a list of candidates.
+        """
+        self.budget_exhausted_ = False
+        if self.time_budget is None:
+            super()._run_search(evaluate_candidates)
+            return
+
+        deadline = perf_counter() + self.time_budget
+        rounds = 0
+
+        def evaluate_within_budget(candidate_params, cv=None, more_results=None):
+            nonlocal rounds
+            if rounds and perf_counter() >= deadline:
+                raise _BudgetExhausted
+            rounds += 1
+            return evaluate_candidates(candidate_params, cv, more_results)
+
+        try:
+            super()._run_search(evaluate_within_budget)
+        except _BudgetExhausted:
+            self.budget_exhausted_ = True
+            # The round that did not start was already recorded
+            del self.n_resources_[rounds:]
+            del self.n_candidates_[rounds:]
+            self.n_iterations_ = rounds
+            self.n_remaining_candidates_ = ceil(self.n_candidates_[-1] / self.factor)
@@ -0,0 +1,130 @@
+"""Module with an on-disk cache of the fitted preprocessing steps."""
+
+import hashlib
+import inspect
+import os
+import sys
+
+import pandas as pd
+import sklearn
+from joblib import Memory
+from sklearn.base import BaseEstimator, clone
+
+
+class TrainingCache:
+    """Cache the fitted preparation steps of the pipelines on disk.
+
+    Entries are keyed by the parameters of the step, a hash of the training
+    data and the code of the project estimators it uses, so a rerun on
+    unchanged data loads the fitted steps instead of fitting them again. Once
+    the cache exceeds `bytes_limit` the least recently used entries are
+    evicted.
+
+    Args:
+        location (str): Directory of the cache.
+        bytes_limit (int | str, optional): Maximum size of the cache, in bytes
+            or as a string such as `"1G"`. Defaults to "1G".
+    """
+
+    def __init__(self, location: str, bytes_limit="1G") -> None:
+        """Initialize the cache, creating its directory on first use.
+
+        Args:
+            location (str): Directory of the cache.
+            bytes_limit (int | str, optional): Maximum size of the cache.
+        """
+        self.location = location
+        self.bytes_limit = bytes_limit
+        self.memory = Memory(location, verbose=0)
+        self._fit_transform = self.memory.cache(_fit_transform)
+
+    def fit_transform(
+        self, step: BaseEstimator, X: pd.DataFrame, y: pd.Series
+    ) -> tuple:
+        """Fit a step and transform the training data, or load both from the cache.
+
+        Args:
+            step (BaseEstimator): Unfitted step, usually the `preparation`
+                pipeline.
+            X (pd.DataFrame): Training features.
+            y (pd.Series): Training labels.
+
+        Returns:
+            tuple: A fitted copy of the step and the transformed features.
+        """
+        # An unfitted copy keeps the key independent of the state of `step`
+        fitted = self._fit_transform(clone(step), X, y, _code_fingerprint(step))
+        self.reduce_size()
+        return fitted
+
+    def reduce_size(self) -> None:
+        """Evict the least recently used entries over the size limit."""
+        self.memory.reduce_size(bytes_limit=self.bytes_limit)
+
+    def info(self) -> dict:
+        """Describe the content of the cache.
+
+        Returns:
+            dict: Location, number of entries and total size in bytes.
+        """
+        items = (
+            self.memory.store_backend.get_items()
+            if os.path.isdir(self.memory.location)
+            else []
+        )
+        return {
+            "location": self.location,
+            "entries": len(items),
+            "size_bytes": sum(item.size for item in items),
+        }
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        self.memory.clear(warn=False)
+
+
+def _fit_transform(
+    step: BaseEstimator, X: pd.DataFrame, y: pd.Series, code_fingerprint: str
+) -> tuple:
+    """Private function to fit a step and transform the training data.
+
+    Args:
+        step (BaseEstimator): Unfitted step.
+        X (pd.DataFrame): Training features.
+        y (pd.Series): Training labels.
+        code_fingerprint (str): Version of the code fitting the step, only
+            used as part of the cache key.
+
+    Returns:
+        tuple: The fitted step and the transformed features.
+    """
+    X_transformed = step.fit_transform(X, y)
+    return step, X_transformed
+
+
+def _code_fingerprint(step: BaseEstimator) -> str:
+    """Private function to hash the code that fits a step.
+
+    The pickled parameters of a step do not change when the code of its
+    classes does, so the scikit-learn version and the source of the project
+    modules defining the nested estimators are part of the cache key.
+
+    Args:
+        step (BaseEstimator): The step to fit.
+
+    Returns:
+        str: Hash of the code used by the step.
+    """
+    estimators = [step] + list(step.get_params(deep=True).values())
+    modules = sorted(
+        {
+            type(estimator).__module__
+            for estimator in estimators
+            if isinstance(estimator, BaseEstimator)
+            and type(estimator).__module__.startswith("src.")
+        }
+    )
+    digest = hashlib.sha256(sklearn.__version__.encode())
+    for module in modules:
+        digest.update(inspect.getsource(sys.modules[module]).encode())
+    return digest.hexdigest()
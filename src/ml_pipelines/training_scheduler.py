@@ -0,0 +1,156 @@
+"""Module with the scheduler training the candidate models under a core budget."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter, process_time
+
+import pandas as pd
+from joblib import parallel_config
+from sklearn.base import BaseEstimator
+from threadpoolctl import threadpool_limits
+
+
+class TrainingScheduler:
+    """Fit several estimators at once without using more than `cores` cores.
+
+    The estimators are fitted concurrently in worker processes, one per model
+    up to `max_workers`, and the cores are split evenly between them: every
+    `n_jobs` parameter of an estimator is set to its share, and nested ones to
+    1, so the search of a model and its estimators do not multiply the threads.
+    Inside a worker the search runs on threads, so the whole fit stays in one
+    process and its CPU time can be measured.
+
+    Args:
+        cores (int, optional): Cores available to the training. Defaults to
+            None, using every core of the machine.
+        max_workers (int, optional): Maximum models fitted at once. Defaults to
+            None, one per model up to `cores`.
+    """
+
+    def __init__(self, cores: int = None, max_workers: int = None) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            cores (int, optional): Cores available to the training.
+            max_workers (int, optional): Maximum models fitted at once.
+        """
+        self.cores = cores or os.cpu_count() or 1
+        self.max_workers = max_workers
+
+    def workers(self, n_tasks: int) -> int:
+        """Number of estimators fitted at once.
+
+        Args:
+            n_tasks (int): Number of estimators to fit.
+
+        Returns:
+            int: The number of worker processes, at least 1.
+        """
+        workers = min(n_tasks, self.cores, self.max_workers or self.cores)
+        return max(workers, 1)
+
+    def fit(self, tasks: dict, y: pd.Series) -> tuple:
+        """Fit every estimator on its training data.
+
+        A single worker fits the estimators one after another in the current
+        process, without starting a worker process.
+
+        Args:
+            tasks (dict): Pairs of estimator and training features, by name.
+            y (pd.Series): Training labels, shared by every estimator.
+
+        Returns:
+            tuple: The fitted estimators by name, and their timings by name with
+                the `wall_seconds`, `cpu_seconds` and `n_jobs` of each fit.
+        """
+        workers = self.workers(len(tasks))
+        n_jobs = max(self.cores // workers, 1)
+
+        if workers == 1:
+            results = {
+                name: _fit_task(estimator, X, y, n_jobs)
+                for name, (estimator, X) in tasks.items()
+            }
+        else:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(workers, mp_context=context) as executor:
+                futures = {
+                    name: executor.submit(_fit_task, estimator, X, y, n_jobs)
+                    for name, (estimator, X) in tasks.items()
+                }
+                results = {name: future.result() for name, future in futures.items()}
+
+        fitted = {name: estimator for name, (estimator, _) in results.items()}
+        timings = {name: timing for name, (_, timing) in results.items()}
+        return fitted, timings
+
+
+def limit_cores(estimator: BaseEstimator, n_jobs: int) -> BaseEstimator:
+    """Set the `n_jobs` parameters of an estimator to a share of the cores.
+
+    The outermost `n_jobs` of every branch of the estimator gets the share and
+    the ones nested under it get 1, so nested parallelism does not oversubscribe
+    the cores.
+
+    Args:
+        estimator (BaseEstimator): The estimator, changed in place.
+        n_jobs (int): Cores given to the estimator.
+
+    Returns:
+        BaseEstimator: The same estimator.
+    """
+    keys = [key for key in estimator.get_params(deep=True) if _is_n_jobs(key)]
+    # Parameters of the estimator owning each `n_jobs`, e.g. `model__`
+    owners = {key: key[: -len("n_jobs")] for key in keys}
+    estimator.set_params(
+        **{
+            key: (
+                1
+                if any(
+                    key != other and key.startswith(owner)
+                    for other, owner in owners.items()
+                )
+                else n_jobs
+            )
+            for key in keys
+        }
+    )
+    return estimator
+
+
+def _is_n_jobs(key: str) -> bool:
+    """Private function to recognize an `n_jobs` parameter.
+
+    Args:
+        key (str): Name of a parameter, with the `__` path of nested estimators.
+
+    Returns:
+        bool: Whether the parameter is `n_jobs`.
+    """
+    return key == "n_jobs" or key.endswith("__n_jobs")
+
+
+def _fit_task(
+    estimator: BaseEstimator, X: pd.DataFrame, y: pd.Series, n_jobs: int
+) -> tuple:
+    """Private function to fit an estimator within its share of the cores.
+
+    Args:
+        estimator (BaseEstimator): The estimator to fit.
+        X (pd.DataFrame): Training features.
+        y (pd.Series): Training labels.
+        n_jobs (int): Cores given to the estimator.
+
+    Returns:
+        tuple: The fitted estimator and the timings of the fit.
+    """
+    limit_cores(estimator, n_jobs)
+    start_wall, start_cpu = perf_counter(), process_time()
+    with parallel_config(backend="threading"), threadpool_limits(limits=1):
+        estimator.fit(X, y)
+    return estimator, {
+        "wall_seconds": perf_counter() - start_wall,
+        "cpu_seconds": process_time() - start_cpu,
+        "n_jobs": n_jobs,
+    }
@@ -0,0 +1,110 @@
+"""Module with the configs of the API serving the models.
+
+Kept apart from `src.configs` so the API does not import scikit-learn to read
+its settings.
+"""
+
+import os
+
+
+class ServingConfigs:
+    """Class to store the configurations of the prediction API.
+
+    Every value can be overridden with the environment variable named in the
+    comment next to it.
+
+    Attributes:
+        log_writer (dict): Settings of the background prediction log writer
+        prediction_cache (dict): Settings of the in-process prediction cache
+        compile_model (bool): Whether to compile the loaded pipeline into a
+            NumPy-only scorer
+        micro_batching (dict): Settings of the dispatcher grouping concurrent
+            single predictions
+        streaming (dict): Settings of the streaming batch prediction endpoint
+        model_reload (dict): Settings of the watcher reloading a changed model
+        model_registry (dict): Models served with their routing weights and
+            models scoring the traffic in shadow
+        warm_up (dict): Settings of the warm-up run before serving traffic
+        admission (dict): Limits of the requests and batch rows in flight
+    """
+
+    # COMPILE_MODEL
+    compile_model = os.getenv("COMPILE_MODEL", "true").lower() == "true"
+
+    log_writer = {
+        # LOG_WRITER_ENABLED
+        "enabled": os.getenv("LOG_WRITER_ENABLED", "true").lower() == "true",
+        # LOG_WRITER_QUEUE_SIZE
+        "max_queue_size": int(os.getenv("LOG_WRITER_QUEUE_SIZE", "10000")),
+        # LOG_WRITER_FLUSH_SIZE
+        "flush_size": int(os.getenv("LOG_WRITER_FLUSH_SIZE", "500")),
+        # LOG_WRITER_FLUSH_INTERVAL
+        "flush_interval": float(os.getenv("LOG_WRITER_FLUSH_INTERVAL", "1.0")),
+    }
+
+    prediction_cache = {
+        # PREDICTION_CACHE_ENABLED
+        "enabled": os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() == "true",
+        # PREDICTION_CACHE_SIZE
+        "max_size": int(os.getenv("PREDICTION_CACHE_SIZE", "10000")),
+        # PREDICTION_CACHE_TTL
+        "ttl": float(os.getenv("PREDICTION_CACHE_TTL", "3600")),
+    }
+
+    micro_batching = {
+        # MICRO_BATCHING_ENABLED
+        "enabled": os.getenv("MICRO_BATCHING_ENABLED", "false").lower() == "true",
+        # MICRO_BATCHING_WINDOW_MS
+        "window": float(os.getenv("MICRO_BATCHING_WINDOW_MS", "2")) / 1000,
+        # MICRO_BATCHING_MAX_BATCH
+        "max_batch_size": int(os.getenv("MICRO_BATCHING_MAX_BATCH", "64")),
+        # MICRO_BATCHING_QUEUE_DEPTH
+        "max_queue_size": int(os.getenv("MICRO_BATCHING_QUEUE_DEPTH", "1024")),
+        # MICRO_BATCHING_TIMEOUT_MS
+        "score_timeout": float(os.getenv("MICRO_BATCHING_TIMEOUT_MS", "1000")) / 1000,
+    }
+
+    streaming = {
+        # STREAMING_CHUNK_SIZE
+        "chunk_size": int(os.getenv("STREAMING_CHUNK_SIZE", "1000")),
+    }
+
+    model_reload = {
+        # MODEL_WATCH_ENABLED
+        "enabled": os.getenv("MODEL_WATCH_ENABLED", "false").lower() == "true",
+        # MODEL_WATCH_INTERVAL
+        "interval": float(os.getenv("MODEL_WATCH_INTERVAL", "5")),
+    }
+
+    model_registry = {
+        # MODEL_ROUTES, e.g. "models/best_model.pkl=0.9,models/knn.pkl=0.1".
+        # When empty only MODEL_PATH is served
+        "routes": os.getenv("MODEL_ROUTES", ""),
+        # SHADOW_MODEL_PATHS, e.g. "models/gradient_boosting.pkl"
+        "shadow_paths": os.getenv("SHADOW_MODEL_PATHS", ""),
+        # SHADOW_QUEUE_SIZE
+        "shadow_queue_size": int(os.getenv("SHADOW_QUEUE_SIZE", "100")),
+    }
+
+    warm_up = {
+        # WARM_UP_ROUNDS, 0 to start serving without warming the models up
+        "rounds": int(os.getenv("WARM_UP_ROUNDS", "3")),
+    }
+
+    admission = {
+        # ADMISSION_CONTROL_ENABLED
+        "enabled": os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true",
+        # ADMISSION_MAX_CONCURRENCY, requests running at once per endpoint
+        "max_concurrency": int(os.getenv("ADMISSION_MAX_CONCURRENCY", "32")),
+        # ADMISSION_QUEUE_SIZE, requests waiting for a slot per endpoint
+        "max_queue_size": int(os.getenv("ADMISSION_QUEUE_SIZE", "64")),
+        # ADMISSION_QUEUE_TIMEOUT, seconds a request waits for a slot
+        "queue_timeout": float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "1.0")),
+        # ADMISSION_RETRY_AFTER, seconds sent in the Retry-After header
+        "retry_after": int(os.getenv("ADMISSION_RETRY_AFTER", "1")),
+        # ADMISSION_LIMITS, e.g. "/v1/batch_prediction=4:8" for 4 running
+        # and 8 waiting requests, replacing the defaults for those endpoints
+        "limits": os.getenv("ADMISSION_LIMITS", ""),
+        # MAX_ROWS_IN_FLIGHT, rows of batch predictions scored at once
+        "max_rows_in_flight": int(os.getenv("MAX_ROWS_IN_FLIGHT", "50000")),
+    }
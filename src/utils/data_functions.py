@@ -1,13 +1,16 @@
 """Module with methods to process data."""
 
 from io import BytesIO
+from typing import TYPE_CHECKING
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from joblib import load
-from sklearn.metrics import classification_report, confusion_matrix
-from sklearn.pipeline import Pipeline
+
+from src.utils.serving_functions import preprocess_features
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
 
 
 def generate_validation_report(
@@ -24,6 +27,10 @@ def generate_validation_report(
     Returns:
         None
     """
+    # Imported here so loading the data does not pull in the plotting backend
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import classification_report, confusion_matrix
+
     y_pred = model.predict(X_test)
 
     conf_matrix = confusion_matrix(y_test, y_pred)
@@ -72,26 +79,6 @@ def generate_validation_report(
     print(f"Validation report written to {output_file}")
 
 
-def preprocess_features(data: pd.DataFrame) -> pd.DataFrame:
-    """Preprocess the features.
-
-    Its importat that the data has those columns:
-        - Cabin
-        - PassengerId
-        - Name
-        - Ticket
-        - SibSp
-        - Parch.
-    """
-    titanic_data = data.copy()
-    titanic_data.drop(["Cabin", "PassengerId", "Name", "Ticket"], axis=1, inplace=True)
-    titanic_data["FamilySize"] = titanic_data["SibSp"] + titanic_data["Parch"]
-    titanic_data["IsAlone"] = 0
-    titanic_data.loc[titanic_data["FamilySize"] == 0, "IsAlone"] = 1
-
-    return titanic_data
-
-
 def preprocess_data(data: pd.DataFrame, target_column: str) -> pd.DataFrame:
     """Preprocess the data.
 
@@ -122,7 +109,7 @@ def load_data(path: str) -> pd.DataFrame:
     return X, y
 
 
-def load_model(path: str) -> Pipeline:
+def load_model(path: str) -> "Pipeline":
     """Load model from a pickle file.
 
     Args:
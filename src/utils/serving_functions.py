@@ -0,0 +1,27 @@
+"""Module with the data processing needed to serve predictions.
+
+It only depends on pandas, so the API can import it without the plotting and
+reporting dependencies of `src.utils.data_functions`.
+"""
+
+import pandas as pd
+
+
+def preprocess_features(data: pd.DataFrame) -> pd.DataFrame:
+    """Preprocess the features.
+
+    Its importat that the data has those columns:
+        - Cabin
+        - PassengerId
+        - Name
+        - Ticket
+        - SibSp
+        - Parch.
+    """
+    titanic_data = data.copy()
+    titanic_data.drop(["Cabin", "PassengerId", "Name", "Ticket"], axis=1, inplace=True)
+    titanic_data["FamilySize"] = titanic_data["SibSp"] + titanic_data["Parch"]
+    titanic_data["IsAlone"] = 0
+    titanic_data.loc[titanic_data["FamilySize"] == 0, "IsAlone"] = 1
+
+    return titanic_data
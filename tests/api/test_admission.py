@@ -0,0 +1,112 @@
+"""Module with tests for the admission control."""
+
+import asyncio
+
+import pytest
+
+from src.api.app.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    ConcurrencyLimiter,
+    RowBudget,
+    parse_limits,
+)
+
+
+def test_concurrency_limiter_queues_then_rejects():
+    """Test that requests wait for a slot, then get a 429 once the queue is full."""
+
+    async def scenario():
+        limiter = ConcurrencyLimiter(
+            max_concurrency=1, max_queue_size=1, queue_timeout=5, retry_after=2
+        )
+        await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+
+        with pytest.raises(AdmissionRejected) as rejection:
+            await limiter.acquire()
+        assert rejection.value.status_code == 429
+        assert rejection.value.retry_after == 2
+
+        limiter.release()
+        await waiting
+        assert limiter.in_flight == 1
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_concurrency_limiter_times_out_waiting_requests():
+    """Test that a request waiting longer than the timeout gets a 503."""
+
+    async def scenario():
+        limiter = ConcurrencyLimiter(
+            max_concurrency=1, max_queue_size=4, queue_timeout=0.01, retry_after=1
+        )
+        await limiter.acquire()
+        with pytest.raises(AdmissionRejected) as rejection:
+            await limiter.acquire()
+        assert rejection.value.status_code == 503
+        assert limiter.queue_depth == 0
+        assert limiter.rejected["queue_timeout"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_row_budget_limits_rows_in_flight():
+    """Test that batches are refused while the budget is used by other batches."""
+    budget = RowBudget(max_rows=10, retry_after=1)
+
+    with pytest.raises(AdmissionRejected) as rejection:
+        with budget.reserve(11):
+            pass
+    assert rejection.value.status_code == 413
+
+    with budget.reserve(6):
+        with pytest.raises(AdmissionRejected) as rejection:
+            with budget.reserve(5):
+                pass
+        assert rejection.value.status_code == 429
+    assert budget.in_flight == 0
+
+    with budget.reserve(10):
+        assert budget.in_flight == 10
+
+
+def test_controller_limits_only_prediction_paths():
+    """Test that the per-endpoint limits replace the defaults."""
+    controller = AdmissionController(
+        max_concurrency=8,
+        max_queue_size=16,
+        queue_timeout=1,
+        retry_after=1,
+        max_rows_in_flight=100,
+        limits=parse_limits("/v1/batch_prediction=2:3, /v1/prediction=4"),
+    )
+
+    assert controller.limiter("/healthz") is None
+    assert controller.limiter("/v1/prediction/proba").max_concurrency == 8
+    batch = controller.limiter("/v1/batch_prediction")
+    assert (batch.max_concurrency, batch.max_queue_size) == (2, 3)
+    assert controller.limiter("/v1/prediction").max_queue_size == 0
+    assert controller.limiter("/v1/batch_prediction") is batch
+
+
+def test_controller_ignores_unknown_paths():
+    """Test that requests to unknown paths bypass admission without a limiter."""
+    controller = AdmissionController(
+        max_concurrency=8,
+        max_queue_size=16,
+        queue_timeout=1,
+        retry_after=1,
+        max_rows_in_flight=100,
+    )
+    limiters = dict(controller.limiters)
+
+    for i in range(50):
+        assert controller.limiter(f"/v1/prediction/unknown-{i}") is None
+    assert controller.limiter("/metrics") is None
+    assert controller.limiters == limiters
@@ -1,15 +1,20 @@
 """Module with API tests."""
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import pytest
 from fastapi.testclient import TestClient
 
-from src.api.main import app
+from src.api.app.admission import LIMITED_PATHS, ConcurrencyLimiter
+from src.api.app.micro_batcher import MicroBatcher
+from src.api.app.predictor import WARM_UP_PASSENGER
+from src.api.main import admission, app, registry
+from src.serving_configs import ServingConfigs
 
 client = TestClient(app)
 
 
-@patch("src.db.db_manager.postgre_sql_manager.psycopg2.connect")
+@patch("psycopg2.connect")
 def test_prediction(mock_connect):
     """Test the prediction endpoint for a single passenger.
 
@@ -37,9 +42,10 @@ def test_prediction(mock_connect):
     )
     assert response.status_code == 200
     assert response.json()["Survived"] in (0, 1)
+    assert response.json()["ModelVersion"] == registry.model_version
 
 
-@patch("src.db.db_manager.postgre_sql_manager.psycopg2.connect")
+@patch("psycopg2.connect")
 def test_batch_prediction(mock_connect):
     """Test the batch prediction endpoint for multiple passengers.
 
@@ -73,3 +79,228 @@ def test_batch_prediction(mock_connect):
     assert isinstance(response.json()["Survived"], list)
     for prediction in response.json()["Survived"]:
         assert prediction in (0, 1)
+
+
+@patch("psycopg2.connect")
+def test_columnar_batch_prediction(mock_connect):
+    """Test that the columnar batch endpoint matches the row batch endpoint.
+
+    Args:
+        mock_connect: Mocked database connection.
+    """
+    passengers = [
+        {
+            "PassengerId": i,
+            "Pclass": pclass,
+            "Name": "string",
+            "Sex": sex,
+            "Age": 30,
+            "SibSp": 0,
+            "Parch": 0,
+            "Ticket": "string",
+            "Fare": 10,
+            "Cabin": "string",
+            "Embarked": "S",
+        }
+        for i, (pclass, sex) in enumerate([(1, "female"), (3, "male"), (2, "male")])
+    ]
+    columns = {
+        key: [passenger[key] for passenger in passengers] for key in passengers[0]
+    }
+
+    response = client.post("/v1/batch_prediction/columnar", json=columns)
+    expected = client.post("/v1/batch_prediction", json={"batch_data": passengers})
+
+    assert response.status_code == 200
+    assert response.json()["Survived"] == expected.json()["Survived"]
+
+    columns["Sex"][0] = "unknown"
+    response = client.post("/v1/batch_prediction/columnar", json=columns)
+    assert response.status_code == 422
+
+
+@patch("psycopg2.connect")
+def test_probability_endpoints(mock_connect):
+    """Test that the probability endpoints agree and apply the threshold.
+
+    Args:
+        mock_connect: Mocked database connection.
+    """
+    passenger = {
+        "PassengerId": 0,
+        "Pclass": 1,
+        "Name": "string",
+        "Sex": "female",
+        "Age": 30,
+        "SibSp": 0,
+        "Parch": 0,
+        "Ticket": "string",
+        "Fare": 80,
+        "Cabin": "string",
+        "Embarked": "C",
+    }
+
+    single = client.post("/v1/prediction/proba", json=passenger).json()
+    batch = client.post(
+        "/v1/batch_prediction/proba", json={"batch_data": [passenger, passenger]}
+    ).json()
+
+    assert 0 <= single["SurvivalProbability"] <= 1
+    assert batch["SurvivalProbability"] == pytest.approx(
+        [single["SurvivalProbability"]] * 2
+    )
+    assert batch["Survived"] == [single["Survived"]] * 2
+
+    strict = client.post(
+        "/v1/prediction/proba", params={"threshold": 1}, json=passenger
+    ).json()
+    assert strict["Survived"] == int(single["SurvivalProbability"] >= 1)
+
+    response = client.post(
+        "/v1/prediction/proba", params={"threshold": 2}, json=passenger
+    )
+    assert response.status_code == 422
+
+
+@patch("src.api.main.registry.reload", return_value=False)
+def test_reload_model(mock_reload):
+    """Test that the reload endpoint reports the version being served.
+
+    Args:
+        mock_reload: Mocked registry reload.
+    """
+    response = client.post("/v1/model/reload")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "Reloaded": False,
+        "ModelVersion": registry.model_version,
+    }
+
+
+def test_health_and_readiness():
+    """Test that readiness waits for the warm-up and the database check."""
+    registry.clear()
+    assert client.get("/healthz").json() == {"status": "ok"}
+    assert client.get("/readyz").status_code == 503
+
+    with patch(
+        "src.db.db_manager.postgre_sql_manager.PostgreSQLManager.ping",
+        return_value=True,
+    ):
+        with TestClient(app) as started_client:
+            response = started_client.get("/readyz")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "warmed_up": True, "database": True}
+
+
+@patch("psycopg2.connect")
+def test_metrics(mock_connect):
+    """Test that the metrics endpoint exposes the stages of a prediction.
+
+    Args:
+        mock_connect: Mocked database connection.
+    """
+    client.post("/v1/prediction", json=WARM_UP_PASSENGER)
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for stage in ("transform", "preprocess", "predict", "log"):
+        assert (
+            f'titanic_prediction_stage_seconds_count{{stage="{stage}",shadow="false"}}'
+            in response.text
+        )
+    assert "titanic_prediction_cache_hits_total" in response.text
+
+
+@patch("psycopg2.connect")
+def test_request_id_and_server_timing(mock_connect):
+    """Test that responses carry the request ID and the stage durations.
+
+    Args:
+        mock_connect: Mocked database connection.
+    """
+    response = client.post(
+        "/v1/prediction", json=WARM_UP_PASSENGER, headers={"X-Request-ID": "abc-1"}
+    )
+    assert response.headers["X-Request-ID"] == "abc-1"
+    assert "predict;dur=" in response.headers["Server-Timing"]
+
+    response = client.get("/healthz")
+    assert len(response.headers["X-Request-ID"]) == 32
+    assert "Server-Timing" not in response.headers
+
+
+@patch("psycopg2.connect")
+def test_batch_rows_admission(mock_connect):
+    """Test that batches over the rows in flight are refused with Retry-After.
+
+    Args:
+        mock_connect: Mocked database connection.
+    """
+    batch = {"batch_data": [WARM_UP_PASSENGER] * 3}
+
+    with admission.rows.reserve(admission.rows.max_rows - 2):
+        response = client.post("/v1/batch_prediction", json=batch)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(admission.rows.retry_after)
+
+    with patch.object(admission.rows, "max_rows", 2):
+        response = client.post("/v1/batch_prediction", json=batch)
+    assert response.status_code == 413
+
+    assert client.post("/v1/batch_prediction", json=batch).status_code == 200
+
+
+def test_overloaded_endpoint_is_shed():
+    """Test that a saturated endpoint answers 429 before running the handler."""
+    saturated = ConcurrencyLimiter(
+        max_concurrency=0, max_queue_size=0, queue_timeout=1, retry_after=3
+    )
+    with patch.dict(admission.limiters, {"/v1/prediction": saturated}):
+        response = client.post("/v1/prediction", json=WARM_UP_PASSENGER)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert "X-Request-ID" in response.headers
+    assert client.get("/healthz").status_code == 200
+
+
+def test_every_prediction_endpoint_is_limited():
+    """Test that the admission control has a limiter for every prediction route."""
+    paths = {
+        route.path
+        for route in app.routes
+        if route.path.startswith(("/v1/prediction", "/v1/batch_prediction"))
+    }
+
+    assert paths == set(LIMITED_PATHS)
+
+
+@patch("psycopg2.connect")
+def test_prediction_chooses_the_model_once(mock_connect):
+    """Test that a single prediction draws one routed model per request.
+
+    Args:
+        mock_connect: Mocked database connection.
+    """
+    router = registry.router
+    with patch.object(router, "choose", wraps=router.choose) as choose:
+        response = client.post("/v1/prediction", json=WARM_UP_PASSENGER)
+
+    assert response.status_code == 200
+    assert choose.call_count == 1
+
+
+def test_stalled_micro_batcher_answers_503():
+    """Test that a prediction not scored in time by the micro-batcher is a 503."""
+    stalled = MicroBatcher(MagicMock(), window=0.01, score_timeout=0.05)
+    with patch.object(registry.router.primary, "micro_batcher", stalled):
+        response = client.post("/v1/prediction", json=WARM_UP_PASSENGER)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(
+        ServingConfigs.admission["retry_after"]
+    )
@@ -0,0 +1,108 @@
+"""Module with tests for the batch predictor."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.api.app.batch_predictor import BatchPredictor
+from src.api.app.models import BatchPredictionRequest, PredictionRequest
+from src.api.app.prediction_cache import PredictionCache
+
+
+def build_request(size: int, age: int = 22) -> BatchPredictionRequest:
+    """Build a batch request with `size` passengers.
+
+    Args:
+        size (int): Number of passengers in the batch.
+        age (int, optional): Age of every passenger. Defaults to 22.
+
+    Returns:
+        BatchPredictionRequest: The batch request.
+    """
+    passenger = {
+        "PassengerId": 0,
+        "Pclass": 3,
+        "Name": "string",
+        "Sex": "male",
+        "Age": age,
+        "SibSp": 1,
+        "Parch": 0,
+        "Ticket": "string",
+        "Fare": 7.25,
+        "Cabin": "string",
+        "Embarked": "S",
+    }
+    return BatchPredictionRequest(
+        batch_data=[PredictionRequest(**passenger) for _ in range(size)]
+    )
+
+
+def test_batch_predictor_predicts_and_logs_once():
+    """Test that a batch runs one model call and one database upload."""
+    model = MagicMock()
+    model.predict.side_effect = lambda X: np.ones(len(X), dtype=int)
+    db_manager = MagicMock()
+
+    predictor = BatchPredictor(model=model, db_manager=db_manager)
+    predictions = predictor(build_request(5))
+
+    assert predictions == [1, 1, 1, 1, 1]
+    model.predict.assert_called_once()
+    db_manager.upload_dataframe_to_postgres.assert_called_once()
+
+    uploaded = db_manager.upload_dataframe_to_postgres.call_args.args[0]
+    assert len(uploaded) == 5
+    assert uploaded["Sex"].tolist() == ["male"] * 5
+    assert uploaded["prediction"].tolist() == [1] * 5
+
+
+def test_batch_predictor_empty_batch():
+    """Test that an empty batch neither calls the model nor the database."""
+    model = MagicMock()
+    db_manager = MagicMock()
+
+    predictor = BatchPredictor(model=model, db_manager=db_manager)
+
+    assert predictor(build_request(0)) == []
+    model.predict.assert_not_called()
+    db_manager.upload_dataframe_to_postgres.assert_not_called()
+
+
+def test_batch_predictor_only_predicts_cache_misses():
+    """Test that only new and distinct feature vectors are sent to the model."""
+    model = MagicMock()
+    model.predict.side_effect = lambda X: np.ones(len(X), dtype=int)
+
+    predictor = BatchPredictor(
+        model=model, db_manager=MagicMock(), model_version="v1", cache=PredictionCache()
+    )
+    predictor(build_request(1, age=22))
+
+    request = build_request(1, age=22)
+    request.batch_data += build_request(2, age=40).batch_data
+    predictions = predictor(request)
+
+    assert predictions == [1, 1, 1]
+    assert len(model.predict.call_args.args[0]) == 1
+    assert predictor.cache.stats["hits"] == 1
+
+
+def test_batch_predictor_probabilities_with_threshold():
+    """Test that probabilities come from one call and the threshold is applied."""
+    model = MagicMock()
+    model.classes_ = np.array([0, 1])
+    model.predict_proba.side_effect = lambda X: np.tile([0.4, 0.6], (len(X), 1))
+
+    predictor = BatchPredictor(model=model, db_manager=MagicMock())
+    request = build_request(3)
+
+    probabilities, predictions = predictor.predict_proba_many(request.batch_data)
+    assert probabilities == [0.6, 0.6, 0.6]
+    assert predictions == [1, 1, 1]
+
+    _, predictions = predictor.predict_proba_many(request.batch_data, threshold=0.7)
+    assert predictions == [0, 0, 0]
+    assert model.predict_proba.call_count == 2
+
+    uploaded = predictor.db_manager.upload_dataframe_to_postgres.call_args.args[0]
+    assert uploaded["prediction"].tolist() == [0, 0, 0]
@@ -0,0 +1,137 @@
+"""Module with tests for the binary batch formats and endpoint."""
+
+import asyncio
+from io import BytesIO
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app.binary_formats import (
+    ARROW_MEDIA_TYPE,
+    NPY_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    read_frame,
+    write_frame,
+)
+from src.api.main import app
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "media_type", [ARROW_MEDIA_TYPE, PARQUET_MEDIA_TYPE, NPY_MEDIA_TYPE]
+)
+def test_binary_formats_round_trip(media_type):
+    """Test that a batch written in every format is read back unchanged.
+
+    Args:
+        media_type (str): Media type of the format under test.
+    """
+    frame = pd.read_csv("data/api-test.csv").head(20)
+
+    decoded = read_frame(write_frame(frame, media_type), media_type)
+
+    assert decoded.columns.tolist() == frame.columns.tolist()
+    assert decoded["Sex"].tolist() == frame["Sex"].tolist()
+    assert decoded["Cabin"].isna().tolist() == frame["Cabin"].isna().tolist()
+    np.testing.assert_array_equal(decoded["Age"], frame["Age"])
+
+
+@patch("psycopg2.connect")
+def test_binary_batch_prediction_arrow(mock_connect):
+    """Test that an Arrow batch is answered with an Arrow stream of predictions.
+
+    Args:
+        mock_connect: Mocked database connection.
+    """
+    frame = pd.read_csv("data/api-test.csv")
+
+    response = client.post(
+        "/v1/batch_prediction/binary",
+        content=write_frame(frame, ARROW_MEDIA_TYPE),
+        headers={"Content-Type": ARROW_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+    predictions = read_frame(response.content, ARROW_MEDIA_TYPE)
+    assert predictions["PassengerId"].tolist() == frame["PassengerId"].tolist()
+
+    columns = pd.read_parquet(
+        BytesIO(
+            client.post(
+                "/v1/batch_prediction/binary",
+                content=write_frame(frame, ARROW_MEDIA_TYPE),
+                headers={
+                    "Content-Type": ARROW_MEDIA_TYPE,
+                    "Accept": PARQUET_MEDIA_TYPE,
+                },
+            ).content
+        )
+    )
+    assert columns.columns.tolist() == ["PassengerId", "Survived"]
+    assert set(columns["Survived"]) <= {0, 1}
+
+
+def test_binary_batch_prediction_rejects_invalid_content():
+    """Test that unsupported, corrupted or invalid batches are rejected."""
+    response = client.post(
+        "/v1/batch_prediction/binary",
+        content=b"PassengerId\n1\n",
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 415
+
+    response = client.post(
+        "/v1/batch_prediction/binary",
+        content=b"not arrow",
+        headers={"Content-Type": ARROW_MEDIA_TYPE},
+    )
+    assert response.status_code == 422
+
+    frame = pd.read_csv("data/api-test.csv").head(3)
+    frame.loc[1, "Sex"] = "unknown"
+    response = client.post(
+        "/v1/batch_prediction/binary",
+        content=write_frame(frame, ARROW_MEDIA_TYPE),
+        headers={"Content-Type": ARROW_MEDIA_TYPE},
+    )
+    assert response.status_code == 422
+    assert "unknown" in response.json()["detail"]
+
+
+@patch("psycopg2.connect")
+def test_binary_batch_prediction_converts_off_the_event_loop(mock_connect):
+    """Test that decoding and encoding the batch do not block the event loop.
+
+    Args:
+        mock_connect: Mocked database connection.
+    """
+    frame = pd.read_csv("data/api-test.csv").head(5)
+    on_event_loop = []
+
+    def record(convert):
+        def wrapper(*args):
+            try:
+                asyncio.get_running_loop()
+                on_event_loop.append(True)
+            except RuntimeError:
+                on_event_loop.append(False)
+            return convert(*args)
+
+        return wrapper
+
+    with patch("src.api.main.read_frame", record(read_frame)), patch(
+        "src.api.main.write_frame", record(write_frame)
+    ):
+        response = client.post(
+            "/v1/batch_prediction/binary",
+            content=write_frame(frame, ARROW_MEDIA_TYPE),
+            headers={"Content-Type": ARROW_MEDIA_TYPE},
+        )
+
+    assert response.status_code == 200
+    assert on_event_loop == [False, False]
@@ -0,0 +1,80 @@
+"""Module with tests for the pandas-free feature building."""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from src.api.app.features import (
+    FEATURE_COLUMNS,
+    build_features,
+    features_to_array,
+    request_record,
+)
+from src.api.app.models import PredictionRequest
+from src.api.app.predictor import Predictor
+from src.utils.data_functions import preprocess_features
+
+PASSENGERS = [
+    {
+        "PassengerId": 1,
+        "Pclass": 3,
+        "Name": "Kelly",
+        "Sex": "male",
+        "Age": 34,
+        "SibSp": 0,
+        "Parch": 0,
+        "Ticket": "330911",
+        "Fare": 7.83,
+        "Cabin": "",
+        "Embarked": "Q",
+    },
+    {
+        "PassengerId": 2,
+        "Pclass": 1,
+        "Name": "Wilkes",
+        "Sex": "female",
+        "Age": 47,
+        "SibSp": 1,
+        "Parch": 2,
+        "Ticket": "363272",
+        "Fare": 70.0,
+        "Cabin": "C85",
+        "Embarked": "S",
+    },
+]
+
+
+def test_build_features_matches_preprocess_features():
+    """Test that the feature vectors match the pandas preprocessing."""
+    requests = [PredictionRequest(**passenger) for passenger in PASSENGERS]
+    records = [request_record(request) for request in requests]
+
+    expected = preprocess_features(pd.DataFrame(records))
+
+    assert list(expected.columns) == FEATURE_COLUMNS
+    assert [build_features(record) for record in records] == list(
+        expected.itertuples(index=False, name=None)
+    )
+
+
+def test_features_to_array_orders_columns():
+    """Test that the array follows the requested column order."""
+    record = request_record(PredictionRequest(**PASSENGERS[1]))
+
+    array = features_to_array([build_features(record)], ["Sex", "FamilySize"])
+
+    assert array.tolist() == [["female", 3]]
+
+
+def test_predictor_fast_path_matches_pandas_path():
+    """Test that the compiled model gives the same prediction on both paths."""
+    predictor = Predictor(db_manager=MagicMock())
+    assert predictor.accepts_arrays
+
+    for passenger in PASSENGERS:
+        request = PredictionRequest(**passenger)
+        expected = predictor.model.predict(
+            preprocess_features(predictor._transform_to_dataframe(request))
+        )[0]
+
+        assert predictor(request) == expected
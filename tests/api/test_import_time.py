@@ -0,0 +1,52 @@
+"""Module with tests for the import-time cost of the API."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Cumulative import time of `src.api.main` allowed, in microseconds
+IMPORT_TIME_BUDGET_US = 2_000_000
+
+# Training and reporting dependencies the API must not import when it starts
+FORBIDDEN_MODULES = ("matplotlib", "scipy", "sklearn", "psycopg2", "dotenv")
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _import_times() -> dict:
+    """Import the API in a fresh interpreter and parse the `-X importtime` log.
+
+    Returns:
+        dict: Cumulative import time in microseconds of every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.api.main"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_api_import_skips_training_dependencies():
+    """Test that importing the API loads neither training nor database drivers."""
+    imported = _import_times()
+
+    assert "src.api.main" in imported
+    assert not [
+        module for module in imported if module.split(".")[0] in FORBIDDEN_MODULES
+    ]
+
+
+def test_api_import_time_budget():
+    """Test that importing the API stays within the import-time budget."""
+    imported = _import_times()
+
+    assert imported["src.api.main"] < IMPORT_TIME_BUDGET_US
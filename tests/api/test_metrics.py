@@ -0,0 +1,47 @@
+"""Module with tests for the Prometheus metrics."""
+
+from unittest.mock import MagicMock
+
+from src.api.app.metrics import STAGE_SECONDS, Histogram, StageTimer, render_metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that the buckets are cumulative and end with the total count."""
+    histogram = Histogram("rows", "Rows scored.", (1, 10), ("shadow",))
+    for value in (1, 5, 5, 50):
+        histogram.observe(value, ("false",))
+
+    assert histogram.render() == [
+        "# HELP rows Rows scored.",
+        "# TYPE rows histogram",
+        'rows_bucket{shadow="false",le="1"} 1',
+        'rows_bucket{shadow="false",le="10"} 3',
+        'rows_bucket{shadow="false",le="+Inf"} 4',
+        'rows_sum{shadow="false"} 61.0',
+        'rows_count{shadow="false"} 4',
+    ]
+
+
+def test_stage_timer_records_every_lap():
+    """Test that every lap is recorded under its stage and shadow label."""
+    STAGE_SECONDS.reset()
+    timer = StageTimer(shadow=True)
+    timer.lap("preprocess")
+    timer.lap("predict")
+
+    snapshot = STAGE_SECONDS.snapshot()
+    assert set(snapshot) == {("preprocess", "true"), ("predict", "true")}
+    assert all(sum(counts) == 1 for counts, _ in snapshot.values())
+
+
+def test_render_metrics_reports_worker_queues():
+    """Test that the queue depths of the background workers are exported."""
+    registry = MagicMock(is_loaded=True, shadow_scorer=None, micro_batchers=[])
+    registry.router.variants = []
+    registry.log_writer.queue_depth = 3
+    registry.log_writer.dropped_rows = 0
+
+    text = render_metrics(registry)
+
+    assert "titanic_log_writer_queue_depth 3\n" in text
+    assert "titanic_micro_batcher_queue_depth" not in text
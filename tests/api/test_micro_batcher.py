@@ -0,0 +1,61 @@
+"""Module with tests for the micro-batching dispatcher."""
+
+import queue
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.api.app.micro_batcher import MicroBatcher
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    """Test that requests queued in the same window share one model call."""
+    batch_predictor = MagicMock()
+    batch_predictor.predict_many.side_effect = lambda requests: [
+        request * 10 for request in requests
+    ]
+    micro_batcher = MicroBatcher(batch_predictor, window=0.5, max_batch_size=3)
+
+    futures = [micro_batcher.submit(value) for value in (1, 2, 3)]
+    micro_batcher.start()
+
+    assert [future.result(timeout=5) for future in futures] == [10, 20, 30]
+    batch_predictor.predict_many.assert_called_once_with([1, 2, 3])
+    assert micro_batcher.batch_sizes == {3: 1}
+    micro_batcher.stop()
+
+
+def test_micro_batcher_propagates_errors():
+    """Test that a failing batch fails every caller of the batch."""
+    batch_predictor = MagicMock()
+    batch_predictor.predict_many.side_effect = ValueError("bad input")
+    micro_batcher = MicroBatcher(batch_predictor, window=0.01)
+    micro_batcher.start()
+
+    with pytest.raises(ValueError):
+        micro_batcher(1)
+    micro_batcher.stop()
+
+
+def test_micro_batcher_rejects_when_queue_is_full():
+    """Test that submissions over the queue depth are rejected."""
+    micro_batcher = MicroBatcher(MagicMock(), max_queue_size=1)
+
+    micro_batcher.submit(1)
+    with pytest.raises(queue.Full):
+        micro_batcher.submit(2)
+
+
+def test_micro_batcher_times_out_when_the_worker_stalls():
+    """Test that a caller gives up when its request is not scored in time."""
+    batch_predictor = MagicMock()
+    micro_batcher = MicroBatcher(batch_predictor, window=0.01, score_timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        micro_batcher(1)
+
+    # The worker skips the request of the caller that gave up
+    micro_batcher.start()
+    micro_batcher.stop()
+    batch_predictor.predict_many.assert_not_called()
+    assert micro_batcher.queue_depth == 0
@@ -0,0 +1,72 @@
+"""Module with tests for the weighted routing between models."""
+
+from collections import Counter
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.api.app.model_router import ModelRouter, ModelVariant, parse_routes
+
+
+def build_variant(name: str, weight: float) -> ModelVariant:
+    """Build a variant with mocked predictors.
+
+    Args:
+        name (str): Path of the model of the variant.
+        weight (float): Routing weight.
+
+    Returns:
+        ModelVariant: The variant.
+    """
+    return ModelVariant(name, weight, MagicMock(), MagicMock())
+
+
+def test_parse_routes():
+    """Test that routes are parsed with a default weight and a default path."""
+    assert parse_routes("a.pkl=0.9, b.pkl=0.1,c.pkl", "default.pkl") == [
+        ("a.pkl", 0.9),
+        ("b.pkl", 0.1),
+        ("c.pkl", 1.0),
+    ]
+    assert parse_routes("", "default.pkl") == [("default.pkl", 1.0)]
+
+
+def test_router_splits_traffic_by_weight():
+    """Test that variants are chosen in proportion to their weights."""
+    champion, challenger, disabled = (
+        build_variant("champion", 0.8),
+        build_variant("challenger", 0.2),
+        build_variant("disabled", 0),
+    )
+    router = ModelRouter([champion, challenger, disabled])
+
+    counts = Counter(router.choose().model_path for _ in range(5000))
+
+    assert router.primary is champion
+    assert counts["disabled"] == 0
+    assert 0.75 < counts["champion"] / 5000 < 0.85
+
+
+def test_router_replace_builds_new_router():
+    """Test that replacing a variant leaves the previous router untouched."""
+    old, other, new = (
+        build_variant("a", 1),
+        build_variant("b", 1),
+        build_variant("a", 1),
+    )
+    router = ModelRouter([old, other])
+
+    replaced = router.replace(old, new)
+
+    assert replaced.variants == [new, other]
+    assert router.variants == [old, other]
+    with pytest.raises(ValueError):
+        ModelRouter([])
+
+
+def test_router_rejects_invalid_weights():
+    """Test that negative weights and all-zero weights are rejected up front."""
+    with pytest.raises(ValueError, match="non-negative"):
+        ModelRouter([build_variant("a", 1), build_variant("b", -1)])
+    with pytest.raises(ValueError, match="positive"):
+        ModelRouter([build_variant("a", 0), build_variant("b", 0)])
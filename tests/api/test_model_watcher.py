@@ -0,0 +1,42 @@
+"""Module with tests for the model file watcher."""
+
+import os
+from unittest.mock import MagicMock
+
+from src.api.app.model_watcher import ModelWatcher
+
+
+def test_model_watcher_reloads_changed_file(tmp_path):
+    """Test that only a changed file triggers a reload, retried after failures.
+
+    Args:
+        tmp_path: Temporary directory provided by pytest.
+    """
+    model_path = tmp_path / "model.pkl"
+    model_path.write_bytes(b"first")
+    reload = MagicMock(side_effect=[ValueError("truncated"), True])
+    watcher = ModelWatcher(reload, str(model_path))
+
+    assert not watcher.check()
+    reload.assert_not_called()
+
+    model_path.write_bytes(b"second model")
+    os.utime(model_path, ns=(1, 1))
+    assert not watcher.check()
+    assert watcher.check()
+    assert not watcher.check()
+    assert reload.call_count == 2
+
+
+def test_model_watcher_start_stop(tmp_path):
+    """Test that the watcher thread can be started and stopped.
+
+    Args:
+        tmp_path: Temporary directory provided by pytest.
+    """
+    watcher = ModelWatcher(MagicMock(), str(tmp_path / "missing.pkl"), interval=0.01)
+
+    watcher.start()
+    assert watcher.is_running
+    watcher.stop()
+    assert not watcher.is_running
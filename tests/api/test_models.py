@@ -0,0 +1,58 @@
+"""Module with tests for the request data models."""
+
+import pytest
+from pydantic import ValidationError
+
+from src.api.app.models import ColumnarBatchPredictionRequest
+
+
+def build_columns(size: int) -> dict:
+    """Build the columns of a batch with `size` passengers.
+
+    Args:
+        size (int): Number of passengers in the batch.
+
+    Returns:
+        dict: One list of values per request field.
+    """
+    return {
+        "PassengerId": list(range(size)),
+        "Pclass": [3] * size,
+        "Name": ["string"] * size,
+        "Sex": ["male", "female"] * (size // 2) + ["male"] * (size % 2),
+        "Age": [22] * size,
+        "SibSp": [1] * size,
+        "Parch": [0] * size,
+        "Ticket": ["string"] * size,
+        "Fare": [7.25] * size,
+        "Cabin": ["string"] * size,
+        "Embarked": ["S"] * size,
+    }
+
+
+def test_columnar_request_to_dataframe():
+    """Test that a columnar batch becomes one DataFrame row per passenger."""
+    request = ColumnarBatchPredictionRequest(**build_columns(3))
+    df_request = request.to_dataframe()
+
+    assert df_request.shape == (3, 11)
+    assert df_request["Sex"].tolist() == ["male", "female", "male"]
+    assert df_request["Age"].dtype.kind == "i"
+
+
+def test_columnar_request_rejects_different_lengths():
+    """Test that columns of different lengths are rejected."""
+    columns = build_columns(3)
+    columns["Age"] = [22, 40]
+
+    with pytest.raises(ValidationError, match="same length"):
+        ColumnarBatchPredictionRequest(**columns)
+
+
+def test_columnar_request_rejects_unknown_categories():
+    """Test that values outside the Sex and Embarked enums are rejected."""
+    columns = build_columns(3)
+    columns["Embarked"] = ["S", "X", "Q"]
+
+    with pytest.raises(ValidationError, match="Unknown values \\['X'\\]"):
+        ColumnarBatchPredictionRequest(**columns)
@@ -0,0 +1,63 @@
+"""Module with tests for the prediction cache."""
+
+import time
+
+import numpy as np
+
+from src.api.app.prediction_cache import PredictionCache
+
+
+def test_prediction_cache_hits_and_misses():
+    """Test that stored predictions are returned and counted as hits."""
+    cache = PredictionCache()
+
+    assert cache.get_many("v1", [(1, "male"), (3, "female")]) == [None, None]
+    cache.set_many("v1", [(1, "male")], [1])
+
+    assert cache.get_many("v1", [(1, "male"), (3, "female")]) == [1, None]
+    assert cache.stats == {"hits": 1, "misses": 3, "size": 1}
+
+
+def test_prediction_cache_evicts_least_recently_used():
+    """Test that the oldest unused entry is evicted when the cache is full."""
+    cache = PredictionCache(max_size=2)
+
+    cache.set_many("v1", ["a", "b"], [0, 1])
+    cache.get_many("v1", ["a"])
+    cache.set_many("v1", ["c"], [1])
+
+    assert cache.get_many("v1", ["a", "b", "c"]) == [0, None, 1]
+
+
+def test_prediction_cache_expires_entries():
+    """Test that entries older than the TTL are not returned."""
+    cache = PredictionCache(ttl=0.01)
+
+    cache.set_many("v1", ["a"], [1])
+    time.sleep(0.02)
+
+    assert cache.get_many("v1", ["a"]) == [None]
+    assert len(cache) == 0
+
+
+def test_prediction_cache_keeps_model_versions_apart():
+    """Test that model versions served together neither share nor clear entries."""
+    cache = PredictionCache()
+
+    cache.set_many("v1", ["a"], [1])
+
+    assert cache.get_many("v2", ["a"]) == [None]
+    cache.set_many("v2", ["a"], [0])
+    assert cache.get_many("v1", ["a"]) == [1]
+    assert cache.get_many("v2", ["a"]) == [0]
+    assert len(cache) == 2
+
+
+def test_prediction_cache_hits_rows_with_missing_values():
+    """Test that rows with NaN features are found instead of filling the cache."""
+    cache = PredictionCache()
+    cache.set_many("v1", [(1, float("nan"))], [0])
+    cache.set_many("v1", [(1, np.float64("nan"))], [0])
+
+    assert cache.get_many("v1", [(1, np.nan)]) == [0]
+    assert len(cache) == 1
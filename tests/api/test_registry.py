@@ -0,0 +1,160 @@
+"""Module with tests for the predictor registry."""
+
+from unittest.mock import patch
+
+import numpy as np
+from fastapi.testclient import TestClient
+from joblib import dump
+from sklearn.dummy import DummyClassifier
+
+from src.api.app.registry import PredictorRegistry, get_variant, registry
+from src.api.main import app
+from src.serving_configs import ServingConfigs
+
+
+@patch("src.api.app.predictor.Predictor.get_model")
+def test_registry_loads_model_once(mock_get_model):
+    """Test that the registry loads the model a single time and shares it.
+
+    Args:
+        mock_get_model: Mocked model loading method.
+    """
+    predictor_registry = PredictorRegistry()
+
+    first = predictor_registry.predictor
+    second = predictor_registry.predictor
+    batch = predictor_registry.batch_predictor
+
+    mock_get_model.assert_called_once()
+    assert first is second
+    assert batch.model is first.model
+    assert batch.db_manager is first.db_manager
+
+
+@patch("src.api.app.predictor.Predictor.get_model")
+def test_registry_clear(mock_get_model):
+    """Test that clearing the registry forces the model to be loaded again.
+
+    Args:
+        mock_get_model: Mocked model loading method.
+    """
+    predictor_registry = PredictorRegistry()
+
+    predictor_registry.load()
+    predictor_registry.clear()
+    assert not predictor_registry.is_loaded
+
+    predictor_registry.load()
+    assert mock_get_model.call_count == 2
+
+
+def test_lifespan_loads_registry():
+    """Test that starting the application loads the predictors before requests."""
+    registry.clear()
+
+    with TestClient(app):
+        assert registry.is_loaded
+
+    assert not registry.is_loaded
+
+
+def test_registry_reload_swaps_changed_model(tmp_path, monkeypatch):
+    """Test that a reload keeps old predictors intact and swaps in the new model.
+
+    Args:
+        tmp_path: Temporary directory provided by pytest.
+        monkeypatch: Pytest fixture to set the model path.
+    """
+    model_path = tmp_path / "model.pkl"
+    monkeypatch.setenv("MODEL_PATH", str(model_path))
+    X, y = np.zeros((4, 1)), np.array([0, 1, 1, 1])
+    dump(DummyClassifier(strategy="constant", constant=0).fit(X, y), model_path)
+
+    predictor_registry = PredictorRegistry()
+    old_predictor = predictor_registry.predictor
+    old_version = predictor_registry.model_version
+
+    assert not predictor_registry.reload()
+    assert predictor_registry.predictor is old_predictor
+
+    dump(DummyClassifier(strategy="constant", constant=1).fit(X, y), model_path)
+    assert predictor_registry.reload()
+
+    new_predictor = predictor_registry.predictor
+    assert predictor_registry.model_version != old_version
+    assert new_predictor.model.constant == 1
+    assert old_predictor.model.constant == 0
+    assert predictor_registry.batch_predictor.model is new_predictor.model
+    assert new_predictor.db_manager is old_predictor.db_manager
+    predictor_registry.clear()
+
+
+def test_registry_routes_and_shadows_models(tmp_path, monkeypatch):
+    """Test that the registry serves weighted routes and shadow models.
+
+    Args:
+        tmp_path: Temporary directory provided by pytest.
+        monkeypatch: Pytest fixture to set the model paths.
+    """
+    X, y = np.zeros((4, 1)), np.array([0, 1, 1, 1])
+    paths = {}
+    for constant in (0, 1):
+        paths[constant] = str(tmp_path / f"model_{constant}.pkl")
+        dump(
+            DummyClassifier(strategy="constant", constant=constant).fit(X, y),
+            paths[constant],
+        )
+    monkeypatch.setitem(
+        ServingConfigs.model_registry, "routes", f"{paths[0]}=1,{paths[1]}=0"
+    )
+    monkeypatch.setitem(ServingConfigs.model_registry, "shadow_paths", paths[1])
+
+    predictor_registry = PredictorRegistry()
+    router = predictor_registry.router
+
+    assert [variant.model_path for variant in router.variants] == [
+        paths[0],
+        paths[1],
+    ]
+    assert all(router.choose() is router.primary for _ in range(20))
+    assert router.primary.predictor.shadow_scorer is predictor_registry.shadow_scorer
+
+    (shadow_variant,) = predictor_registry.shadow_scorer.variants
+    assert shadow_variant.batch_predictor.shadow
+    assert shadow_variant.batch_predictor.model.constant == 1
+    assert predictor_registry.shadow_scorer.is_running
+    predictor_registry.clear()
+    assert not predictor_registry.is_loaded
+
+
+def test_registry_micro_batches_per_route(tmp_path, monkeypatch):
+    """Test that micro-batched predictions follow the weights of the routes.
+
+    Args:
+        tmp_path: Temporary directory provided by pytest.
+        monkeypatch: Pytest fixture to set the model paths.
+    """
+    X, y = np.zeros((4, 1)), np.array([0, 1, 1, 1])
+    paths = {}
+    for constant in (0, 1):
+        paths[constant] = str(tmp_path / f"model_{constant}.pkl")
+        dump(
+            DummyClassifier(strategy="constant", constant=constant).fit(X, y),
+            paths[constant],
+        )
+    monkeypatch.setitem(
+        ServingConfigs.model_registry, "routes", f"{paths[0]}=0,{paths[1]}=1"
+    )
+    monkeypatch.setitem(ServingConfigs.micro_batching, "enabled", True)
+    predictor_registry = PredictorRegistry()
+    monkeypatch.setattr("src.api.app.registry.registry", predictor_registry)
+
+    variants = predictor_registry.router.variants
+    micro_batchers = predictor_registry.micro_batchers
+
+    assert [variant.micro_batcher for variant in variants] == micro_batchers
+    assert len(set(map(id, micro_batchers))) == 2
+    assert all(get_variant() is variants[1] for _ in range(20))
+    assert variants[1].micro_batcher.batch_predictor.model.constant == 1
+    predictor_registry.clear()
+    assert not any(micro_batcher.is_running for micro_batcher in micro_batchers)
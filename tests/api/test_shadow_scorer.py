@@ -0,0 +1,48 @@
+"""Module with tests for the shadow scorer."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.api.app.batch_predictor import BatchPredictor
+from src.api.app.model_router import ModelVariant
+from src.api.app.shadow_scorer import ShadowScorer
+from tests.api.test_batch_predictor import build_request
+
+
+def test_shadow_scorer_logs_shadow_predictions():
+    """Test that served inputs are scored and logged by the shadow models only."""
+    primary_model, shadow_model = MagicMock(), MagicMock()
+    primary_model.predict.side_effect = lambda X: np.ones(len(X), dtype=int)
+    shadow_model.predict.side_effect = lambda X: np.zeros(len(X), dtype=int)
+
+    shadow = BatchPredictor(
+        model=shadow_model, db_manager=MagicMock(), model_version="shadow"
+    )
+    shadow.shadow = True
+    shadow_scorer = ShadowScorer([ModelVariant("shadow.pkl", 0, shadow, shadow)])
+    shadow_scorer.start()
+
+    primary = BatchPredictor(
+        model=primary_model, db_manager=MagicMock(), model_version="primary"
+    )
+    primary.shadow_scorer = shadow_scorer
+
+    assert primary(build_request(3)) == [1, 1, 1]
+    shadow_scorer.stop()
+
+    primary_rows = primary.db_manager.upload_dataframe_to_postgres.call_args.args[0]
+    shadow_rows = shadow.db_manager.upload_dataframe_to_postgres.call_args.args[0]
+    assert primary_rows["shadow"].tolist() == [False] * 3
+    assert shadow_rows["shadow"].tolist() == [True] * 3
+    assert shadow_rows["model_version"].tolist() == ["shadow"] * 3
+    assert shadow_rows["prediction"].tolist() == [0, 0, 0]
+
+
+def test_shadow_scorer_drops_inputs_when_full():
+    """Test that inputs are dropped instead of blocking when the queue is full."""
+    shadow_scorer = ShadowScorer([], max_queue_size=1)
+
+    assert shadow_scorer.submit([{"PassengerId": 0}])
+    assert not shadow_scorer.submit([{"PassengerId": 1}])
+    assert shadow_scorer.dropped_inputs == 1
@@ -0,0 +1,112 @@
+"""Module with tests for the streaming batch prediction endpoint."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from src.api.app.batch_predictor import BatchPredictor
+from src.api.app.streaming import RecordParser, stream_predictions
+from src.api.main import app
+from src.serving_configs import ServingConfigs
+
+client = TestClient(app)
+
+
+def test_record_parser_handles_split_chunks():
+    """Test that records split anywhere between chunks are parsed once complete."""
+    content = (
+        'PassengerId,Name,Age,Cabin\n892,"Kelly, Mr. James",34.5,\n'
+        '893,"Wilkes,\nMrs. James",47,C85\n'
+    ).encode()
+    parser = RecordParser(csv_format=True)
+
+    records = []
+    for start in range(0, len(content), 7):
+        records.extend(parser.feed(content[start : start + 7]))
+    records.extend(parser.close())
+
+    assert records == [
+        {
+            "PassengerId": "892",
+            "Name": "Kelly, Mr. James",
+            "Age": "34.5",
+            "Cabin": None,
+        },
+        {
+            "PassengerId": "893",
+            "Name": "Wilkes,\nMrs. James",
+            "Age": "47",
+            "Cabin": "C85",
+        },
+    ]
+
+
+def test_stream_predictions_scores_fixed_size_chunks():
+    """Test that every chunk is scored and sent before the upload ends."""
+    model = MagicMock()
+    model.predict.side_effect = lambda X: np.ones(len(X), dtype=int)
+    predictor = BatchPredictor(model=model, db_manager=MagicMock())
+    lines = [
+        json.dumps({"PassengerId": i, "Sex": "male", "SibSp": 0, "Parch": 0}) + "\n"
+        for i in range(5)
+    ]
+    received = []
+
+    async def body():
+        for line in lines:
+            received.append(line)
+            yield line.encode()
+
+    async def consume():
+        outputs = []
+        async for output in stream_predictions(
+            body(), RecordParser(csv_format=False), predictor, chunk_size=2
+        ):
+            outputs.append((len(received), output))
+        return outputs
+
+    outputs = asyncio.run(consume())
+
+    assert [len(output.splitlines()) for _, output in outputs] == [2, 2, 1]
+    assert [n_received for n_received, _ in outputs] == [2, 4, 5]
+    assert [len(call.args[0]) for call in model.predict.call_args_list] == [2, 2, 1]
+
+
+@patch("psycopg2.connect")
+def test_stream_prediction_csv(mock_connect):
+    """Test that a CSV upload is answered with one prediction per passenger.
+
+    Args:
+        mock_connect: Mocked database connection.
+    """
+    with open("data/api-test.csv", "rb") as file:
+        content = file.read()
+    expected_ids = pd.read_csv("data/api-test.csv")["PassengerId"].tolist()
+
+    with patch.dict(ServingConfigs.streaming, {"chunk_size": 100}):
+        response = client.post(
+            "/v1/batch_prediction/stream",
+            content=content,
+            headers={"Content-Type": "text/csv"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["PassengerId"] for result in results] == expected_ids
+    assert {result["Survived"] for result in results} <= {0, 1}
+
+
+def test_stream_prediction_rejects_unknown_content_type():
+    """Test that uploads in an unsupported format are rejected."""
+    response = client.post(
+        "/v1/batch_prediction/stream",
+        content=b"<passengers/>",
+        headers={"Content-Type": "application/xml"},
+    )
+
+    assert response.status_code == 415
@@ -0,0 +1,75 @@
+"""Module with tests for the request traces."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.api.app.batch_predictor import BatchPredictor
+from src.api.app.micro_batcher import MicroBatcher
+from src.api.app.models import PredictionRequest
+from src.api.app.predictor import WARM_UP_PASSENGER
+from src.api.app.tracing import RequestTrace, reset_trace, set_trace
+
+
+def build_predictor() -> tuple[BatchPredictor, MagicMock]:
+    """Build a batch predictor predicting survival for every passenger.
+
+    Returns:
+        tuple[BatchPredictor, MagicMock]: The predictor and its database manager.
+    """
+    model = MagicMock()
+    model.predict.side_effect = lambda X: np.ones(len(X), dtype=int)
+    db_manager = MagicMock()
+    return BatchPredictor(model=model, db_manager=db_manager), db_manager
+
+
+def test_request_trace_sums_stages():
+    """Test that repeated stages are summed and formatted in milliseconds."""
+    trace = RequestTrace("abc")
+    trace.add("predict", 0.001)
+    trace.add("predict", 0.002)
+    trace.add("log", 0.0005)
+
+    assert trace.server_timing() == "predict;dur=3.000, log;dur=0.500"
+    assert trace.stage_milliseconds() == {
+        "transform_ms": None,
+        "preprocess_ms": None,
+        "predict_ms": 3.0,
+    }
+
+
+def test_logged_rows_carry_the_trace():
+    """Test that the request ID and stage durations are logged with every row."""
+    predictor, db_manager = build_predictor()
+    trace = RequestTrace("abc")
+
+    token = set_trace(trace)
+    try:
+        predictor.predict_many([PredictionRequest(**WARM_UP_PASSENGER)] * 3)
+    finally:
+        reset_trace(token)
+
+    uploaded = db_manager.upload_dataframe_to_postgres.call_args.args[0]
+    assert uploaded["request_id"].tolist() == ["abc"] * 3
+    assert uploaded["predict_ms"].notna().all()
+    assert set(trace.timings) == {"transform", "preprocess", "predict", "log"}
+
+
+def test_micro_batcher_traces_every_request():
+    """Test that a micro-batch logs the ID of each request and shares timings."""
+    predictor, db_manager = build_predictor()
+    micro_batcher = MicroBatcher(predictor, window=0.05)
+    traces = [RequestTrace("first"), RequestTrace("second")]
+
+    futures = []
+    for trace in traces:
+        token = set_trace(trace)
+        futures.append(micro_batcher.submit(PredictionRequest(**WARM_UP_PASSENGER)))
+        reset_trace(token)
+    micro_batcher.start()
+    assert [future.result(timeout=5) for future in futures] == [1, 1]
+    micro_batcher.stop()
+
+    uploaded = db_manager.upload_dataframe_to_postgres.call_args.args[0]
+    assert uploaded["request_id"].tolist() == ["first", "second"]
+    assert all("predict" in trace.timings for trace in traces)
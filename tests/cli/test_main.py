@@ -96,6 +96,19 @@ def test_test_command_with_coverage(mock_run_makefile):
     assert result.exit_code == 0
 
 
+def test_export_scorer_command():
+    """Test the 'export-scorer' CLI command to verify it compiles the model."""
+    with patch("src.cli.main.export_compiled_scorer") as mock_export:
+        result = runner.invoke(
+            app, ["export-scorer", "--output", "models/compiled.pkl"]
+        )
+
+        mock_export.assert_called_once_with(
+            "models/best_model.pkl", "models/compiled.pkl"
+        )
+        assert result.exit_code == 0
+
+
 def test_run_sql_command(mock_postgresql_manager):
     """Test the 'run-sql' CLI command to verify SQL file execution.
 
@@ -122,3 +135,19 @@ def test_run_sql_command_file_not_found():
         # Verify that the command exits with an error message
         assert "Error: File 'nonexistent.sql' does not exist." in result.output
         assert result.exit_code == 0
+
+
+def test_cache_command(tmp_path):
+    """Test the 'cache' CLI command to inspect and clear the training cache."""
+    settings = {"enabled": True, "location": str(tmp_path), "bytes_limit": "1G"}
+    with patch.dict("src.cli.main.Configs.training", {"cache": settings}):
+        result = runner.invoke(app, ["cache", "--info"])
+        assert result.exit_code == 0
+        assert "Entries: 0" in result.output
+
+        with patch("src.cli.main.TrainingCache.clear") as mock_clear:
+            result = runner.invoke(app, ["cache", "--clear"])
+
+        mock_clear.assert_called_once_with()
+        assert result.exit_code == 0
+        assert "cleared" in result.output
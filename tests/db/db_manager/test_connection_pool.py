@@ -0,0 +1,82 @@
+"""Unit tests for the ConnectionPool class."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from psycopg2.pool import PoolError
+
+from src.db.db_manager.connection_pool import ConnectionPool
+
+
+def build_connection():
+    """Build a mocked open connection.
+
+    Returns:
+        MagicMock: A connection reporting that it is open.
+    """
+    connection = MagicMock()
+    connection.closed = 0
+    return connection
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Unit tests for ConnectionPool."""
+
+    def test_reuses_connections(self):
+        """Test that a released connection is handed out again."""
+        connect = MagicMock(side_effect=build_connection)
+        pool = ConnectionPool(connect, max_connections=2)
+
+        with pool.connection() as first:
+            first.cursor()
+        with pool.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        connect.assert_called_once()
+        first.commit.assert_called()
+        self.assertEqual(pool.idle, 1)
+        self.assertEqual(pool.in_use, 0)
+
+    def test_rolls_back_on_error(self):
+        """Test that a failing block rolls back and still releases the connection."""
+        pool = ConnectionPool(MagicMock(side_effect=build_connection))
+
+        with self.assertRaises(ValueError):
+            with pool.connection() as connection:
+                raise ValueError("boom")
+
+        connection.rollback.assert_called()
+        connection.commit.assert_not_called()
+        self.assertEqual(pool.in_use, 0)
+
+    def test_replaces_unhealthy_connections(self):
+        """Test that a connection failing the health check is replaced."""
+        connect = MagicMock(side_effect=build_connection)
+        pool = ConnectionPool(connect, health_check_interval=0)
+
+        broken = pool.getconn()
+        pool.putconn(broken)
+        broken.cursor.return_value.__enter__.return_value.execute.side_effect = (
+            Exception("server closed the connection")
+        )
+
+        connection = pool.getconn()
+
+        self.assertIsNot(connection, broken)
+        broken.close.assert_called_once()
+        self.assertEqual(connect.call_count, 2)
+
+    def test_raises_when_exhausted(self):
+        """Test that checking out more connections than allowed times out."""
+        pool = ConnectionPool(
+            MagicMock(side_effect=build_connection), max_connections=1, timeout=0.01
+        )
+        pool.getconn()
+
+        with self.assertRaises(PoolError):
+            pool.getconn()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,24 +1,27 @@
 """Integration test for the PostgreSQLManager class."""
 
+import csv
 import unittest
+from io import StringIO
 from unittest.mock import MagicMock, patch
 
+import pandas as pd
 import psycopg2
 
-from src.db.db_manager.postgre_sql_manager import PostgreSQLManager
+from src.db.db_manager.postgre_sql_manager import COPY_NULL, PostgreSQLManager
 
 
 class TestPostgreSQLManager(unittest.TestCase):
     """Integration test for PostgreSQLManager."""
 
-    @patch("src.db.db_manager.postgre_sql_manager.psycopg2.connect")
+    @patch("psycopg2.connect")
     def test_connect(self, mock_connect):
         """Test connecting to the PostgreSQL database."""
         db_manager = PostgreSQLManager()
         db_manager.connect()
         mock_connect.assert_called_once()
 
-    @patch("src.db.db_manager.postgre_sql_manager.psycopg2.connect")
+    @patch("psycopg2.connect")
     def test_execute_query(self, mock_connect):
         """Test executing a query."""
         mock_conn = mock_connect.return_value
@@ -31,7 +34,7 @@ class TestPostgreSQLManager(unittest.TestCase):
         mock_cursor.execute.assert_called_once_with("SELECT * FROM coin_data;", None)
         mock_conn.commit.assert_called_once()
 
-    @patch("src.db.db_manager.postgre_sql_manager.psycopg2.connect")
+    @patch("psycopg2.connect")
     def test_fetch_results(self, mock_connect):
         """Test fetching results from a query."""
         mock_conn = mock_connect.return_value
@@ -44,6 +47,92 @@ class TestPostgreSQLManager(unittest.TestCase):
 
         self.assertEqual(results, [("bitcoin", 50000)])
 
+    @patch("psycopg2.connect")
+    def test_ping(self, mock_connect):
+        """Test that ping reports whether the database answers."""
+        db_manager = PostgreSQLManager()
+        self.assertTrue(db_manager.ping())
+
+        mock_connect.side_effect = psycopg2.OperationalError("unreachable")
+        self.assertFalse(db_manager.ping())
+
+    @patch("psycopg2.connect")
+    def test_pooled_upload_reuses_connection(self, mock_connect):
+        """Test that pooled uploads share a single warm connection."""
+        mock_connect.return_value.closed = 0
+        PostgreSQLManager.close_pools()
+
+        db_manager = PostgreSQLManager(pooled=True)
+        data = pd.DataFrame({"Pclass": [1, 3], "prediction": [1, 0]})
+        db_manager.upload_dataframe_to_postgres(data, table_name="titanic")
+        db_manager.upload_dataframe_to_postgres(data, table_name="titanic")
+
+        mock_connect.assert_called_once()
+        self.assertEqual(mock_connect.return_value.commit.call_count, 2)
+        mock_connect.return_value.close.assert_not_called()
+
+        PostgreSQLManager.close_pools()
+
+    @patch("psycopg2.connect")
+    def test_upload_uses_copy(self, mock_connect):
+        """Test that uploads stream a CSV buffer with COPY cast to the table types."""
+        mock_cursor = (
+            mock_connect.return_value.cursor.return_value.__enter__.return_value
+        )
+        copied = []
+        mock_cursor.copy_expert.side_effect = lambda query, buffer: copied.append(
+            (query, buffer.read())
+        )
+
+        db_manager = PostgreSQLManager()
+        data = pd.DataFrame({"Age": [22.0, 34.5], "Name": ["Kelly", None]})
+        db_manager.upload_dataframe_to_postgres(data, table_name="titanic")
+
+        query, content = copied[0]
+        self.assertEqual(
+            query,
+            "COPY titanic (Age, Name) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        )
+        self.assertEqual(content, "22,Kelly\n34,\\N\n")
+        mock_cursor.executemany.assert_not_called()
+
+    @patch("psycopg2.connect")
+    def test_copy_keeps_empty_strings(self, mock_connect):
+        """Test that COPY stores empty strings as such and missing values as NULL."""
+        mock_cursor = (
+            mock_connect.return_value.cursor.return_value.__enter__.return_value
+        )
+        copied = []
+        mock_cursor.copy_expert.side_effect = lambda query, buffer: copied.append(
+            buffer.read()
+        )
+
+        db_manager = PostgreSQLManager()
+        data = pd.DataFrame({"Cabin": ["", None, "C85"]})
+        db_manager.upload_dataframe_to_postgres(data, table_name="titanic")
+
+        # Read the rows back as COPY does, with the NULL marker as None
+        rows = [
+            [None if field == COPY_NULL else field for field in row]
+            for row in csv.reader(StringIO(copied[0]))
+        ]
+        self.assertEqual(rows, [[""], [None], ["C85"]])
+
+    @patch("psycopg2.connect")
+    def test_upload_falls_back_to_insert(self, mock_connect):
+        """Test that a failing COPY falls back to executemany."""
+        mock_conn = mock_connect.return_value
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.copy_expert.side_effect = psycopg2.Error("COPY not allowed")
+
+        db_manager = PostgreSQLManager()
+        data = pd.DataFrame({"Pclass": [1, 3]})
+        db_manager.upload_dataframe_to_postgres(data, table_name="titanic")
+
+        mock_conn.rollback.assert_called_once()
+        mock_cursor.executemany.assert_called_once()
+        mock_conn.commit.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
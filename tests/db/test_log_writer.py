@@ -0,0 +1,59 @@
+"""Module with tests for the background log writer."""
+
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from src.db.log_writer import BackgroundLogWriter
+
+
+def test_log_writer_flushes_on_size():
+    """Test that the writer uploads once enough rows are pending."""
+    db_manager = MagicMock()
+    log_writer = BackgroundLogWriter(
+        db_manager, table_name="titanic", flush_size=4, flush_interval=60
+    )
+    log_writer.start()
+
+    for value in range(4):
+        log_writer.submit(pd.DataFrame({"prediction": [value]}))
+
+    deadline = time.monotonic() + 5
+    while not db_manager.upload_dataframe_to_postgres.called:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    uploaded = db_manager.upload_dataframe_to_postgres.call_args.args[0]
+    assert uploaded["prediction"].tolist() == [0, 1, 2, 3]
+    log_writer.stop()
+
+
+def test_log_writer_drains_on_stop():
+    """Test that stopping the writer uploads every pending row in one call."""
+    db_manager = MagicMock()
+    log_writer = BackgroundLogWriter(
+        db_manager, table_name="titanic", flush_size=100, flush_interval=60
+    )
+    log_writer.start()
+
+    log_writer.submit(pd.DataFrame({"prediction": [1, 0]}))
+    log_writer.submit(pd.DataFrame({"prediction": [1]}))
+    log_writer.stop()
+
+    assert not log_writer.is_running
+    db_manager.upload_dataframe_to_postgres.assert_called_once()
+    uploaded = db_manager.upload_dataframe_to_postgres.call_args.args[0]
+    assert len(uploaded) == 3
+
+
+def test_log_writer_drops_when_full():
+    """Test that submissions over the queue limit are dropped without blocking."""
+    log_writer = BackgroundLogWriter(
+        MagicMock(), table_name="titanic", max_queue_size=1
+    )
+
+    assert log_writer.submit(pd.DataFrame({"prediction": [1]}))
+    assert not log_writer.submit(pd.DataFrame({"prediction": [1, 1]}))
+    assert log_writer.dropped_rows == 2
+    assert log_writer.queue_depth == 1
@@ -0,0 +1,24 @@
+"""Module with fixtures shared by the tests of the ml pipelines."""
+
+import pytest
+
+from src.ml_pipelines.model_training import ModelTraining
+
+
+@pytest.fixture
+def mock_init(monkeypatch):
+    """Replace the __init__ method of ModelTraining with a mock.
+
+    The instances only get the attributes read by `train_models`, the tests set
+    the data and the models.
+
+    Args:
+        monkeypatch: pytest fixture to replace the __init__ method.
+    """
+
+    def init(self):
+        self.cache = None
+        self.scheduler = None
+        self.timings = {}
+
+    monkeypatch.setattr(ModelTraining, "__init__", init)
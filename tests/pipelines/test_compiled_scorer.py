@@ -0,0 +1,96 @@
+"""Module with tests for the compiled scorer."""
+
+import os
+
+import numpy as np
+import pytest
+from joblib import load
+
+from src.ml_pipelines.compiled_scorer import (
+    CompiledScorer,
+    compile_pipeline,
+    export_compiled_scorer,
+)
+from src.utils.data_functions import load_data, load_model
+
+MODEL_PATH = "models/best_model.pkl"
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    """Fixture loading the trained pipeline.
+
+    Returns:
+        Pipeline: The trained pipeline.
+    """
+    return load_model(MODEL_PATH)
+
+
+@pytest.fixture(scope="module")
+def features():
+    """Fixture loading the preprocessed training features.
+
+    Returns:
+        pd.DataFrame: The preprocessed features.
+    """
+    X, _ = load_data("data/train.csv")
+    return X
+
+
+def test_compiled_scorer_matches_pipeline(pipeline, features):
+    """Test that the compiled scorer reproduces the pipeline outputs.
+
+    Args:
+        pipeline: Fixture with the trained pipeline.
+        features: Fixture with the preprocessed training features.
+    """
+    scorer = compile_pipeline(pipeline)
+
+    expected_features = pipeline.named_steps["preparation"].transform(features)
+    np.testing.assert_allclose(scorer.transform(features), expected_features)
+    np.testing.assert_array_equal(scorer.predict(features), pipeline.predict(features))
+    np.testing.assert_allclose(
+        scorer.predict_proba(features), pipeline.predict_proba(features)
+    )
+
+
+def test_compiled_scorer_accepts_arrays(pipeline, features):
+    """Test that an array ordered like `input_columns` gives the same result.
+
+    Args:
+        pipeline: Fixture with the trained pipeline.
+        features: Fixture with the preprocessed training features.
+    """
+    scorer = compile_pipeline(pipeline)
+    array = features[scorer.input_columns].to_numpy(dtype=object)
+
+    np.testing.assert_array_equal(scorer.predict(array), pipeline.predict(features))
+
+
+def test_compiled_scorer_rejects_unknown_categories(pipeline, features):
+    """Test that unknown categories raise like the original encoders.
+
+    Args:
+        pipeline: Fixture with the trained pipeline.
+        features: Fixture with the preprocessed training features.
+    """
+    scorer = compile_pipeline(pipeline)
+    row = features.iloc[[0]].copy()
+    row["Sex"] = "unknown"
+
+    with pytest.raises(ValueError):
+        scorer.predict(row)
+
+
+def test_export_compiled_scorer(tmpdir):
+    """Test that the exported scorer can be loaded back.
+
+    Args:
+        tmpdir: pytest fixture to provide a temporary directory.
+    """
+    output = f"{tmpdir}/compiled.pkl"
+
+    export_compiled_scorer(MODEL_PATH, output)
+
+    assert os.path.exists(output)
+    assert isinstance(load(output), CompiledScorer)
@@ -2,6 +2,7 @@
 
 import numpy as np
 import pandas as pd
+import pytest
 
 from src.ml_pipelines.feature_selection import FeatureSelection
 
@@ -69,3 +70,41 @@ def test_feature_selection(monkeypatch):
 
     # Assert that the transformed DataFrame has only the expected columns
     assert list(transformed_df.columns) == expected_columns
+
+
+def test_feature_selection_subsamples_and_skips_refit(monkeypatch):
+    """Test that large datasets are subsampled and the diagnostic refit can be skipped.
+
+    Args:
+        monkeypatch: pytest fixture to spy on the private methods.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1000, 3))
+    y = (X[:, 0] > 0).astype(int)
+    feature_selector = FeatureSelection(
+        columns=["signal", "noise1", "noise2"],
+        verbose=True,
+        n_repeats=3,
+        n_jobs=2,
+        max_samples=300,
+        validate_selection=False,
+    )
+
+    sizes = []
+    original_train = FeatureSelection._train_feature_selection_model
+    monkeypatch.setattr(
+        FeatureSelection,
+        "_train_feature_selection_model",
+        lambda self, X, y: sizes.append(len(X)) or original_train(self, X, y),
+    )
+    monkeypatch.setattr(
+        FeatureSelection,
+        "_test_selected_features",
+        lambda *args: pytest.fail("The diagnostic refit should be skipped"),
+    )
+
+    transformed_df = feature_selector.fit_transform(X, y)
+
+    assert sizes == [300]
+    assert "signal" in transformed_df.columns
+    assert len(transformed_df) == 1000
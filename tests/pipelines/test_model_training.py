@@ -7,26 +7,24 @@ import pytest
 from joblib import load
 from sklearn.dummy import DummyClassifier
 from sklearn.impute import SimpleImputer
+from sklearn.model_selection import GridSearchCV
+from sklearn.neighbors import KNeighborsClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
 
+from src.ml_pipelines.feature_selection import FeatureSelection
 from src.ml_pipelines.model_training import *
 from src.ml_pipelines.pipeline_connection import *
+from src.ml_pipelines.training_cache import TrainingCache
+from src.utils.data_functions import load_data
 
 
-def mock_init(self):
-    """Mock the __init__ method of ModelTraining for testing purposes."""
-    pass
-
-
-def test_train_models(monkeypatch):
+def test_train_models(mock_init):
     """Test that train_models trains each model correctly and returns a dictionary of models.
 
     Args:
-        monkeypatch: pytest fixture to replace the __init__ method of ModelTraining with a mock.
+        mock_init: pytest fixture to replace the __init__ method of ModelTraining with a mock.
     """
-    monkeypatch.setattr(ModelTraining, "__init__", mock_init)
-
     model_train = ModelTraining()
 
     model_train.X = pd.DataFrame(
@@ -52,14 +50,12 @@ def test_train_models(monkeypatch):
     assert isinstance(models["model1"], DummyClassifier)
 
 
-def test_generate_scores(monkeypatch):
+def test_generate_scores(mock_init):
     """Test that generate_scores computes scores for each model and returns a dictionary.
 
     Args:
-        monkeypatch: pytest fixture to replace the __init__ method of ModelTraining with a mock.
+        mock_init: pytest fixture to replace the __init__ method of ModelTraining with a mock.
     """
-    monkeypatch.setattr(ModelTraining, "__init__", mock_init)
-
     model_train = ModelTraining()
 
     model_train.X = pd.DataFrame(
@@ -82,13 +78,13 @@ def test_generate_scores(monkeypatch):
     assert isinstance(scores["model1"], float)
 
 
-def test_best_model(monkeypatch):
+def test_best_model(mock_init, monkeypatch):
     """Test that best_model identifies the model with the highest score.
 
     Args:
-        monkeypatch: pytest fixture to replace the __init__ method of ModelTraining with a mock.
+        mock_init: pytest fixture to replace the __init__ method of ModelTraining with a mock.
+        monkeypatch: pytest fixture to replace the scores of the models.
     """
-    monkeypatch.setattr(ModelTraining, "__init__", mock_init)
     monkeypatch.setattr(
         ModelTraining,
         "generate_scores",
@@ -102,13 +98,12 @@ def test_best_model(monkeypatch):
     assert best_model == "model2"
 
 
-def test_save_model(monkeypatch):
+def test_save_model(mock_init):
     """Test that save_model saves a trained model to a file and can be loaded correctly.
 
     Args:
-        monkeypatch: pytest fixture to replace the __init__ method of ModelTraining with a mock.
+        mock_init: pytest fixture to replace the __init__ method of ModelTraining with a mock.
     """
-    monkeypatch.setattr(ModelTraining, "__init__", mock_init)
     model = DummyClassifier().fit([1, 2, 3], [1, 2, 3])
 
     model_train = ModelTraining()
@@ -124,3 +119,130 @@ def test_save_model(monkeypatch):
     assert isinstance(model_loaded, DummyClassifier)
 
     os.remove("model1.pkl")
+
+
+def test_save_models(mock_init, tmp_path):
+    """Test that save_models saves every trained model under its name.
+
+    Args:
+        mock_init: pytest fixture to replace the __init__ method of ModelTraining with a mock.
+        tmp_path: Temporary directory provided by pytest.
+    """
+    model_train = ModelTraining()
+    model_train.models = {
+        "model1": DummyClassifier().fit([1, 2, 3], [1, 2, 3]),
+        "model2": DummyClassifier().fit([1, 2, 3], [1, 1, 1]),
+    }
+
+    paths = model_train.save_models(str(tmp_path / "candidates"))
+
+    assert paths == {
+        "model1": str(tmp_path / "candidates" / "model1.pkl"),
+        "model2": str(tmp_path / "candidates" / "model2.pkl"),
+    }
+    assert all(os.path.exists(path) for path in paths.values())
+
+
+@pytest.fixture
+def preparation_training(monkeypatch) -> tuple:
+    """Configure two searched models and count the fits of their preparation.
+
+    Args:
+        monkeypatch: pytest fixture to replace the configured models and search.
+
+    Returns:
+        tuple: The training features, labels and attribute types, and the list
+            of fitted FeatureSelection steps, cleared by the tests as needed.
+    """
+    X, y = load_data("data/train.csv")
+    X, y = X.iloc[:200], y.iloc[:200]
+    atributes_types = {
+        "ordinal_attributes": ["Sex", "IsAlone"],
+        "numeric_features": ["Parch", "Pclass", "SibSp", "Fare", "Age"],
+        "categorical_features": ["Embarked", "FamilySize"],
+    }
+    monkeypatch.setattr(
+        ModelTraining,
+        "search_tecnique",
+        {"technique": GridSearchCV, "params": {"cv": 2}},
+    )
+    monkeypatch.setattr(
+        ModelTraining,
+        "models",
+        [
+            {
+                "name": "knn",
+                "model": KNeighborsClassifier(),
+                "params": {"n_neighbors": [3, 5]},
+            },
+            {
+                "name": "dummy",
+                "model": DummyClassifier(),
+                "params": {"strategy": ["most_frequent", "prior"]},
+            },
+        ],
+    )
+    fits = []
+    original_fit = FeatureSelection.fit
+    monkeypatch.setattr(
+        FeatureSelection,
+        "fit",
+        lambda self, *args: fits.append(self) or original_fit(self, *args),
+    )
+    return X, y, atributes_types, fits
+
+
+def test_train_models_fits_preparation_once(monkeypatch, preparation_training):
+    """Test that the shared preparation is fitted once and gives the same models.
+
+    Args:
+        monkeypatch: pytest fixture to toggle the shared preparation.
+        preparation_training: Training data and counted preparation fits.
+    """
+    X, y, atributes_types, fits = preparation_training
+
+    predictions = {}
+    for share_preparation in (True, False):
+        monkeypatch.setitem(
+            ModelTraining.training, "share_preparation", share_preparation
+        )
+        fits.clear()
+        models = ModelTraining(X, y, atributes_types, ["knn", "dummy"]).train_models()
+        assert len(fits) == (1 if share_preparation else 2)
+        predictions[share_preparation] = {
+            name: model.predict(X).tolist() for name, model in models.items()
+        }
+
+    assert predictions[True] == predictions[False]
+
+
+def test_train_models_reuses_cached_preparation(
+    monkeypatch, tmp_path, preparation_training
+):
+    """Test that the fitted preparation is loaded from the cache on a rerun.
+
+    Args:
+        monkeypatch: pytest fixture to disable the shared preparation.
+        tmp_path: pytest fixture with a temporary cache directory.
+        preparation_training: Training data and counted preparation fits.
+    """
+    X, y, atributes_types, fits = preparation_training
+    monkeypatch.setitem(ModelTraining.training, "share_preparation", False)
+    cache = TrainingCache(str(tmp_path))
+
+    predictions = []
+    for expected_fits in (1, 0):
+        fits.clear()
+        models = ModelTraining(
+            X, y, atributes_types, ["knn", "dummy"], cache
+        ).train_models()
+        assert len(fits) == expected_fits
+        predictions.append(
+            {name: model.predict(X).tolist() for name, model in models.items()}
+        )
+
+    assert predictions[0] == predictions[1]
+    assert cache.info()["entries"] == 1
+
+    cache.clear()
+    assert cache.info()["entries"] == 0
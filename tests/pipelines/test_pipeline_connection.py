@@ -5,9 +5,11 @@ import pytest
 from sklearn.compose import ColumnTransformer
 from sklearn.dummy import DummyClassifier
 from sklearn.impute import SimpleImputer
+from sklearn.model_selection import RandomizedSearchCV
 from sklearn.pipeline import Pipeline
 
 from src.ml_pipelines.pipeline_connection import PipelineBuilding
+from src.ml_pipelines.search_strategies import TimeBudgetHalvingSearchCV
 
 
 def mock_init(self):
@@ -180,3 +182,37 @@ def test_build_data_processing_pipeline_returns_col_transformer(monkeypatch):
     assert len(model_pipeline) == 2
     assert isinstance(model_pipeline["random_forest"], Pipeline)
     assert isinstance(model_pipeline["logistic_regression"], Pipeline)
+
+
+def test_build_create_model_pipeline_opts_into_halving_search(monkeypatch):
+    """Test that only the listed models use the halving search, without its resource.
+
+    Args:
+        monkeypatch: pytest fixture to replace the __init__ method of PipelineBuilding with a mock.
+    """
+    monkeypatch.setattr(PipelineBuilding, "__init__", mock_init)
+    pipeline_build = PipelineBuilding()
+    preparation = Pipeline([("imputer", SimpleImputer())])
+
+    searches = {
+        name: pipeline.named_steps["model"]
+        for name, pipeline in pipeline_build._build_create_model_pipeline(
+            preparation
+        ).items()
+    }
+    assert isinstance(searches["random_forest"], RandomizedSearchCV)
+    assert "n_estimators" in searches["random_forest"].param_distributions
+
+    monkeypatch.setitem(
+        PipelineBuilding.training, "halving_search_models", ["random_forest"]
+    )
+    searches = {
+        name: pipeline.named_steps["model"]
+        for name, pipeline in pipeline_build._build_create_model_pipeline(
+            preparation
+        ).items()
+    }
+    assert isinstance(searches["random_forest"], TimeBudgetHalvingSearchCV)
+    assert "n_estimators" not in searches["random_forest"].param_distributions
+    assert isinstance(searches["gradient_boosting"], RandomizedSearchCV)
+    assert "n_estimators" in searches["gradient_boosting"].param_distributions
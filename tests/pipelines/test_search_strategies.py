@@ -0,0 +1,61 @@
+"""Module with tests for the adaptive search strategies."""
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+
+from src.ml_pipelines.search_strategies import TimeBudgetHalvingSearchCV
+
+rng = np.random.default_rng(0)
+X = rng.normal(size=(120, 3))
+y = (X[:, 0] > 0).astype(int)
+
+params = {
+    "max_depth": [1, 2, 3, None],
+    "min_samples_leaf": [1, 2, 3],
+    "random_state": [42],
+}
+
+
+def _search(time_budget=None) -> TimeBudgetHalvingSearchCV:
+    """Build a halving search over the number of trees of a random forest.
+
+    Args:
+        time_budget (float, optional): Seconds after which no new round starts.
+
+    Returns:
+        TimeBudgetHalvingSearchCV: The unfitted search.
+    """
+    return TimeBudgetHalvingSearchCV(
+        RandomForestClassifier(),
+        params,
+        resource="n_estimators",
+        min_resources=2,
+        max_resources=18,
+        n_candidates=9,
+        factor=3,
+        cv=2,
+        time_budget=time_budget,
+        random_state=0,
+    )
+
+
+def test_halving_search_runs_every_round():
+    """Test that the best candidates get more trees at every round."""
+    search = _search().fit(X, y)
+
+    assert search.n_resources_ == [2, 6, 18]
+    assert search.n_candidates_ == [9, 3, 1]
+    assert not search.budget_exhausted_
+    assert search.best_estimator_.n_estimators == 18
+
+
+def test_halving_search_stops_at_time_budget():
+    """Test that no round starts once the budget is spent, keeping the first one."""
+    search = _search(time_budget=1e-9).fit(X, y)
+
+    assert search.budget_exhausted_
+    assert search.n_iterations_ == 1
+    assert search.n_resources_ == [2]
+    assert search.best_estimator_.n_estimators == 2
+    assert clone(search).time_budget == 1e-9
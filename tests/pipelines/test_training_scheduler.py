@@ -0,0 +1,69 @@
+"""Module with tests for the scheduler of the model fits."""
+
+import pandas as pd
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GridSearchCV
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+
+from src.ml_pipelines.feature_selection import FeatureSelection
+from src.ml_pipelines.model_training import ModelTraining
+from src.ml_pipelines.training_scheduler import TrainingScheduler, limit_cores
+
+X = pd.DataFrame({"num1": [1, 2, 3, 4, 5, 6, 7, 8], "num2": [1, 0, 1, 0, 1, 0, 1, 0]})
+y = pd.Series([0, 0, 0, 0, 1, 1, 1, 1])
+
+
+def test_limit_cores_gives_nested_estimators_one_core():
+    """Test that only the outermost `n_jobs` of every branch gets the share."""
+    pipeline = Pipeline(
+        [
+            ("preparation", FeatureSelection(columns=["num1"], n_jobs=-1)),
+            ("model", GridSearchCV(RandomForestClassifier(n_jobs=-1), {}, n_jobs=-1)),
+        ]
+    )
+
+    limit_cores(pipeline, 3)
+
+    assert pipeline.get_params()["preparation__n_jobs"] == 3
+    assert pipeline.get_params()["model__n_jobs"] == 3
+    assert pipeline.get_params()["model__estimator__n_jobs"] == 1
+
+
+def test_scheduler_splits_cores_between_models():
+    """Test that the models are fitted in worker processes within the budget."""
+    scheduler = TrainingScheduler(cores=4, max_workers=2)
+    tasks = {
+        "knn": (GridSearchCV(KNeighborsClassifier(), {"n_neighbors": [1, 3]}, cv=2), X),
+        "dummy": (DummyClassifier(), X),
+    }
+
+    fitted, timings = scheduler.fit(tasks, y)
+
+    assert scheduler.workers(len(tasks)) == 2
+    assert fitted["knn"].best_params_["n_neighbors"] in (1, 3)
+    assert fitted["knn"].n_jobs == 2
+    assert list(fitted["dummy"].predict(X)) == [0] * 8
+    for timing in timings.values():
+        assert timing["n_jobs"] == 2
+        assert timing["wall_seconds"] >= 0
+        assert timing["cpu_seconds"] >= 0
+
+
+def test_train_models_reports_timings(mock_init):
+    """Test that train_models replaces the models by the scheduled fits.
+
+    Args:
+        mock_init: pytest fixture to replace the __init__ method of ModelTraining with a mock.
+    """
+    model_train = ModelTraining()
+    model_train.X = X
+    model_train.y = y
+    model_train.models = {"model1": DummyClassifier(), "model2": DummyClassifier()}
+    model_train.scheduler = TrainingScheduler(cores=1)
+
+    models = model_train.train_models()
+
+    assert set(model_train.timings) == {"model1", "model2"}
+    assert list(models["model2"].predict(X)) == [0] * 8